@@ -2,14 +2,51 @@
 from __future__ import annotations
 
 import sys
+from typing import TYPE_CHECKING
 
 from pydocstringformatter._utils.exceptions import (
     ParsingError,
     PydocstringFormatterError,
+    UnstableResultError,
 )
+from pydocstringformatter._utils.lazy_attributes import make_lazy_getattr
+
+if TYPE_CHECKING:
+    from pydocstringformatter._api import (
+        DocstringChange,
+        FormatConfig,
+        FormatResult,
+        SourceFormatter,
+        check_source,
+        format_source,
+    )
+    from pydocstringformatter._async_api import (
+        FileFormatResult,
+        aformat_paths,
+        aformat_source,
+    )
 
 __version__ = "1.0.0"
 
+# The library API is imported when it's first used, so the command line
+# doesn't have to import asyncio and the modules only the API needs
+_LAZY_ATTRIBUTES = {
+    "DocstringChange": "pydocstringformatter._api",
+    "FormatConfig": "pydocstringformatter._api",
+    "FormatResult": "pydocstringformatter._api",
+    "SourceFormatter": "pydocstringformatter._api",
+    "check_source": "pydocstringformatter._api",
+    "format_source": "pydocstringformatter._api",
+    "FileFormatResult": "pydocstringformatter._async_api",
+    "aformat_paths": "pydocstringformatter._async_api",
+    "aformat_source": "pydocstringformatter._async_api",
+}
+__getattr__ = make_lazy_getattr(_LAZY_ATTRIBUTES, __name__)
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
+
 
 def run_docstring_formatter(argv: list[str] | None = None) -> None:
     """Run the formatter."""
@@ -18,4 +55,18 @@ def run_docstring_formatter(argv: list[str] | None = None) -> None:
     _Run(argv or sys.argv[1:])
 
 
-__all__ = ("run_docstring_formatter", "PydocstringFormatterError", "ParsingError")
+__all__ = (
+    "run_docstring_formatter",
+    "format_source",
+    "check_source",
+    "aformat_source",
+    "aformat_paths",
+    "SourceFormatter",
+    "FormatConfig",
+    "FormatResult",
+    "FileFormatResult",
+    "DocstringChange",
+    "PydocstringFormatterError",
+    "ParsingError",
+    "UnstableResultError",
+)
@@ -0,0 +1,210 @@
+"""Functions and classes to use pydocstringformatter as a library."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import functools
+import io
+from collections import Counter
+from pathlib import Path
+
+from pydocstringformatter import _formatting, _utils
+from pydocstringformatter._configuration.arguments_manager import ArgumentsManager
+from pydocstringformatter._pipeline import FormattingPipeline
+
+
+@dataclasses.dataclass(frozen=True)
+class FormatConfig:  # pylint: disable=too-many-instance-attributes
+    """Configuration of the formatters, the counterpart of the command line options.
+
+    Formatters are turned on or off relative to their default, for example
+    FormatConfig(enable=frozenset({"linewrap-full-docstring"})).
+    """
+
+    style: tuple[str, ...] = ("pep257",)
+    """Docstring styles that are used in the project."""
+    max_summary_lines: int = 1
+    summary_quotes_same_line: bool = False
+    max_line_length: int = 88
+    enable: frozenset[str] = frozenset()
+    """Names of the formatters to turn on."""
+    disable: frozenset[str] = frozenset()
+    """Names of the formatters to turn off."""
+    stability_check: str = "changed"
+    docstring_locator: str = "scanner"
+    docstring_memo_size: int = 10_000
+    fused_pipeline: bool = True
+
+    def __post_init__(self) -> None:
+        names = {formatter.name for formatter in _formatting.FORMATTERS}
+        if unknown := (self.enable | self.disable) - names:
+            raise _utils.PydocstringFormatterError(
+                f"Unknown formatters: {', '.join(sorted(unknown))}"
+            )
+        if both := self.enable & self.disable:
+            raise _utils.PydocstringFormatterError(
+                f"Formatters can't be enabled and disabled: {', '.join(sorted(both))}"
+            )
+
+    @classmethod
+    def from_options(cls, options: list[str], directory: str = ".") -> FormatConfig:
+        """Create a configuration from command line options.
+
+        The options are applied on top of the pyproject.toml file in the directory.
+        Invalid options raise a PydocstringFormatterError instead of exiting.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from pydocstringformatter import __version__
+
+        # The messages of the parser are kept to be raised, without redirecting
+        # the output of other threads
+        output = io.StringIO()
+        arguments_manager = ArgumentsManager(
+            __version__, _formatting.FORMATTERS, output
+        )
+        try:
+            arguments_manager.parse_options(options, directory)
+        except SystemExit as exc:
+            raise _utils.PydocstringFormatterError(output.getvalue().strip()) from exc
+
+        namespace = arguments_manager.namespace
+        enabled = {
+            formatter.name: getattr(namespace, formatter.name)
+            for formatter in _formatting.FORMATTERS
+        }
+        return cls(
+            style=tuple(namespace.style),
+            max_summary_lines=namespace.max_summary_lines,
+            summary_quotes_same_line=namespace.summary_quotes_same_line,
+            max_line_length=namespace.max_line_length,
+            enable=frozenset(name for name, is_on in enabled.items() if is_on),
+            disable=frozenset(name for name, is_on in enabled.items() if not is_on),
+            stability_check=namespace.stability_check,
+            docstring_locator=namespace.docstring_locator,
+            docstring_memo_size=namespace.docstring_memo_size,
+            fused_pipeline=namespace.fused_pipeline,
+        )
+
+    def to_namespace(self) -> argparse.Namespace:
+        """Create the namespace the formatters read their options from."""
+        namespace = argparse.Namespace(
+            style=list(self.style),
+            max_summary_lines=self.max_summary_lines,
+            summary_quotes_same_line=self.summary_quotes_same_line,
+            max_line_length=self.max_line_length,
+            stability_check=self.stability_check,
+            docstring_locator=self.docstring_locator,
+            docstring_memo_size=self.docstring_memo_size,
+            fused_pipeline=self.fused_pipeline,
+        )
+        for formatter in _formatting.FORMATTERS:
+            setattr(
+                namespace,
+                formatter.name,
+                formatter.name in self.enable
+                or (not formatter.optional and formatter.name not in self.disable),
+            )
+        return namespace
+
+
+@dataclasses.dataclass(frozen=True)
+class DocstringChange:
+    """A docstring that was changed by the formatters."""
+
+    start: tuple[int, int]
+    """Line and column of the start of the docstring, lines start at 1."""
+    end: tuple[int, int]
+    """Line and column of the end of the original docstring."""
+    original: str
+    formatted: str
+
+
+@dataclasses.dataclass(frozen=True)
+class FormatResult:
+    """The result of formatting a source."""
+
+    source: str
+    changes: tuple[DocstringChange, ...] = ()
+    """The changed docstrings, in the order they appear in the source."""
+
+    @property
+    def is_changed(self) -> bool:
+        """Whether any docstring was changed."""
+        return bool(self.changes)
+
+
+class SourceFormatter:
+    """Formats sources with a configuration.
+
+    The formatters are created once, so a SourceFormatter can be reused
+    to format any number of sources.
+    """
+
+    def __init__(self, config: FormatConfig | None = None) -> None:
+        self.config = config or FormatConfig()
+        self._pipeline = FormattingPipeline(self.config.to_namespace())
+
+    def format_source(self, source: str, filename: str = "<unknown>") -> FormatResult:
+        """Format the docstrings in a source.
+
+        The newlines of the source are kept. The filename is only used in
+        error messages.
+
+        Raises:
+            ParsingError: If the source isn't valid Python code.
+            UnstableResultError: If the formatters can't get to a stable result.
+        """
+        with io.StringIO(source, newline=None) as file:
+            text = file.read()
+            newlines = file.newlines
+
+        statistics: Counter[str] = Counter()
+        changed_docstrings = self._pipeline.format_docstrings(
+            self._pipeline.locate_docstrings(text, Path(filename), statistics),
+            Path(filename),
+            statistics,
+        )
+        if not changed_docstrings:
+            return FormatResult(source)
+
+        new_source = _utils.splice_docstrings(text, changed_docstrings)
+        if isinstance(newlines, tuple):
+            newlines = newlines[0]
+        if newlines and newlines != "\n":
+            new_source = new_source.replace("\n", newlines)
+        return FormatResult(
+            new_source,
+            tuple(
+                DocstringChange(old.start, old.end, old.string, new.string)
+                for old, new in changed_docstrings
+            ),
+        )
+
+    def check_source(self, source: str, filename: str = "<unknown>") -> bool:
+        """Check if all docstrings in a source are formatted correctly."""
+        return not self.format_source(source, filename).is_changed
+
+
+@functools.lru_cache(maxsize=16)
+def _get_source_formatter(config: FormatConfig) -> SourceFormatter:
+    return SourceFormatter(config)
+
+
+def format_source(
+    source: str, config: FormatConfig | None = None, filename: str = "<unknown>"
+) -> FormatResult:
+    """Format the docstrings in a source.
+
+    The formatters of recently used configurations are reused.
+    """
+    return _get_source_formatter(config or FormatConfig()).format_source(
+        source, filename
+    )
+
+
+def check_source(
+    source: str, config: FormatConfig | None = None, filename: str = "<unknown>"
+) -> bool:
+    """Check if all docstrings in a source are formatted correctly."""
+    return not format_source(source, config, filename).is_changed
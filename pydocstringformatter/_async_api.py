@@ -0,0 +1,107 @@
+"""Asynchronous counterparts of the library functions, for use in asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import itertools
+import os
+from collections.abc import AsyncIterator, Iterable
+from concurrent import futures
+from pathlib import Path
+
+from pydocstringformatter import _utils
+from pydocstringformatter._api import FormatConfig, FormatResult, format_source
+
+DEFAULT_MAX_IN_FLIGHT = 16
+"""Default number of files that are formatted at the same time."""
+
+
+@dataclasses.dataclass(frozen=True)
+class FileFormatResult:
+    """The result of formatting a file, or the error that prevented it."""
+
+    path: Path
+    result: FormatResult | None = None
+    error: Exception | None = None
+
+
+async def aformat_source(
+    source: str,
+    config: FormatConfig | None = None,
+    filename: str = "<unknown>",
+    *,
+    executor: futures.Executor | None = None,
+) -> FormatResult:
+    """Format the docstrings in a source without blocking the event loop.
+
+    The source is formatted on the executor, or the default executor of
+    the event loop if it is None.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, format_source, source, config, filename
+    )
+
+
+async def aformat_paths(
+    paths: Iterable[str | os.PathLike[str]],
+    config: FormatConfig | None = None,
+    *,
+    write: bool = False,
+    executor: futures.Executor | None = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> AsyncIterator[FileFormatResult]:
+    """Format the python files in files and directories without blocking the event loop.
+
+    Files are read, formatted and, with write, written on the executor. At most
+    max_in_flight files are handled at the same time and their results are
+    yielded as soon as they complete, so the order is not deterministic.
+    Errors of a file are part of its result, so they don't stop the other files.
+
+    Cancelling the iteration cancels the files that haven't been started yet.
+    """
+    if max_in_flight < 1:
+        raise _utils.PydocstringFormatterError("max_in_flight should be at least 1.")
+
+    loop = asyncio.get_running_loop()
+    config = config or FormatConfig()
+    filepaths = await loop.run_in_executor(
+        executor, _utils.find_python_files, [os.fspath(path) for path in paths], []
+    )
+
+    remaining = iter(filepaths)
+    pending: set[asyncio.Future[FileFormatResult]] = set()
+    try:
+        while True:
+            for path in itertools.islice(remaining, max_in_flight - len(pending)):
+                pending.add(
+                    loop.run_in_executor(executor, _format_path, path, config, write)
+                )
+            if not pending:
+                return
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _format_path(path: Path, config: FormatConfig, write: bool) -> FileFormatResult:
+    """Format a file, this runs on the executor."""
+    try:
+        with _utils.read_source(path) as data:
+            source, newlines, encoding = _utils.decode_source(data)
+        result = format_source(source, config, str(path))
+        if write and result.is_changed:
+            if isinstance(newlines, tuple):
+                newlines = newlines[0]
+            _utils.write_source(
+                path, _utils.encode_source(result.source, newlines, encoding)
+            )
+    except (_utils.PydocstringFormatterError, OSError, SyntaxError, ValueError) as exc:
+        return FileFormatResult(path, error=exc)
+    return FileFormatResult(path, result)
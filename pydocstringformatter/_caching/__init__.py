@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+from typing import TYPE_CHECKING, Final
+
+from pydocstringformatter._caching.base import (
+    DEFAULT_CACHE_DIR,
+    Cache,
+    get_config_fingerprint,
+)
+from pydocstringformatter._formatting import Formatter
+from pydocstringformatter._utils.exceptions import PydocstringFormatterError
+from pydocstringformatter._utils.lazy_attributes import make_lazy_getattr
+
+if TYPE_CHECKING:
+    from pydocstringformatter._caching.directory_cache import DirectoryCache
+    from pydocstringformatter._caching.http_cache import HTTPCache
+    from pydocstringformatter._caching.sqlite_cache import SQLiteCache
+
+CACHE_BACKENDS: Final = {
+    "directory": "pydocstringformatter._caching.directory_cache.DirectoryCache",
+    "sqlite": "pydocstringformatter._caching.sqlite_cache.SQLiteCache",
+    "http": "pydocstringformatter._caching.http_cache.HTTPCache",
+}
+"""The class of each backend, a backend is only imported when it's used."""
+
+
+def get_backend(name: str) -> type[Cache]:
+    """Import the class of the cache backend with the given name."""
+    module, _, class_name = CACHE_BACKENDS[name].rpartition(".")
+    backend: type[Cache] = getattr(
+        __import__(module, fromlist=[class_name]), class_name
+    )
+    return backend
+
+
+__getattr__ = make_lazy_getattr(
+    {
+        class_name: module
+        for module, _, class_name in (
+            path.rpartition(".") for path in CACHE_BACKENDS.values()
+        )
+    },
+    __name__,
+)
+
+
+def create_cache(
+    config: argparse.Namespace, formatters: list[Formatter], version: str
+) -> Cache | None:
+    """Create the cache that is configured, clearing it if requested."""
+    if not (config.cache or config.clear_cache):
+        return None
+
+    backend = get_backend(config.cache_backend)
+    if backend.name == "http":
+        if not config.cache_url:
+            raise PydocstringFormatterError(
+                "The 'http' cache backend requires the --cache-url option."
+            )
+        location = config.cache_url
+    else:
+        location = config.cache_dir
+
+    cache = backend(
+        location,
+        config.cache_max_entries,
+        get_config_fingerprint(config, formatters, version),
+    )
+    if config.clear_cache:
+        cache.clear()
+    if config.cache:
+        cache.open()
+    if not config.cache or cache.disabled:
+        cache.close()
+        return None
+    return cache
+
+
+__all__ = [
+    "CACHE_BACKENDS",
+    "DEFAULT_CACHE_DIR",
+    "Cache",
+    "DirectoryCache",
+    "HTTPCache",
+    "SQLiteCache",
+    "create_cache",
+    "get_backend",
+    "get_config_fingerprint",
+]
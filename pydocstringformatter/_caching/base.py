@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import abc
+import argparse
+import math
+import sys
+from typing import Any
+
+from pydocstringformatter._utils.source_files import SourceBytes
+
+DEFAULT_CACHE_DIR = ".pydocstringformatter_cache"
+"""Directory of the cache, relative to the directory the program is run from."""
+
+PRUNED_FRACTION = 0.9
+"""Fraction of the maximum number of entries that is kept when entries are evicted."""
+
+NON_FORMATTING_OPTIONS = frozenset(
+    {
+        "files",
+        "stdin_filename",
+        "write",
+        "fsync",
+        "quiet",
+        "statistics",
+        "exclude",
+        "discovery",
+        "changed_since",
+        "line_ranges",
+        "exit_code",
+        "jobs",
+        "output_buffer_size",
+        "docstring_locator",
+        "docstring_memo_size",
+        "stability_check",
+        "fused_pipeline",
+        "cache",
+        "clear_cache",
+        "cache_backend",
+        "cache_dir",
+        "cache_url",
+        "cache_max_entries",
+    }
+)
+"""Options that don't influence the formatting of a file.
+
+All other options are part of the cache key, so that changing them
+invalidates the cache.
+"""
+
+
+def get_config_fingerprint(
+    config: argparse.Namespace, formatters: list[Any], version: str
+) -> str:
+    """Create a hash of all the options that influence the formatting of a file."""
+    # Only runs that use the cache need these modules
+    # pylint: disable-next=import-outside-toplevel
+    import hashlib
+
+    # pylint: disable-next=import-outside-toplevel
+    import json
+
+    options = {
+        key: value
+        for key, value in sorted(vars(config).items())
+        if key not in NON_FORMATTING_OPTIONS
+    }
+    formatter_classes = [
+        f"{type(formatter).__module__}.{type(formatter).__qualname__}"
+        for formatter in formatters
+    ]
+    fingerprint = json.dumps([version, options, formatter_classes], default=str)
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class Cache(abc.ABC):
+    """Base class for a cache of files that are known to be correctly formatted.
+
+    Entries are keyed by the content of a file and a fingerprint of the
+    configuration and version that was used to check them.
+    """
+
+    name: str
+    """Name of the backend, used as value of the --cache-backend option."""
+
+    disabled = False
+    """Whether the cache is turned off, because it failed earlier in the run."""
+
+    failure_message = "Can't use the cache at {location}"
+    """Message that is printed when the cache fails and is turned off."""
+
+    def __init__(self, location: str, max_entries: int, fingerprint: str) -> None:
+        self.location = location
+        self.max_entries = max_entries
+        self.fingerprint = fingerprint
+
+    def key(self, data: SourceBytes, fingerprint: str | None = None) -> str:
+        """Return the key of the content of a file.
+
+        Files that are formatted with another configuration than the cache was
+        created with pass the fingerprint of that configuration.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        import hashlib
+
+        content_hash = hashlib.sha256((fingerprint or self.fingerprint).encode("utf-8"))
+        content_hash.update(data)
+        return content_hash.hexdigest()
+
+    @abc.abstractmethod
+    def __contains__(self, key: str) -> bool:
+        """Check if a key is in the cache and mark it as recently used."""
+
+    @abc.abstractmethod
+    def add(self, key: str) -> None:
+        """Record a key of a correctly formatted file."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+
+    def open(self) -> None:
+        """Prepare the cache before it's used.
+
+        Failures are found here, before the cache is shared with worker
+        processes, so they are reported once.
+        """
+
+    @property
+    def prune_target(self) -> int:
+        """Number of entries that are kept when entries are evicted.
+
+        It's below the maximum, so the runs after an eviction don't evict again.
+        """
+        return math.ceil(self.max_entries * PRUNED_FRACTION)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries when the cache is too large.
+
+        Only runs that added entries prune the cache.
+        """
+
+    def close(self) -> None:
+        """Close any open connections."""
+
+    def _disable(self, exc: Exception) -> None:
+        """Turn the cache off for the rest of the run after it failed."""
+        self.disabled = True
+        print(
+            f"{self.failure_message.format(location=self.location)}, "
+            f"the cache is turned off for this run: {exc}",
+            file=sys.stderr,
+        )
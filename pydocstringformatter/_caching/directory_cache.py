@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import os
+import re
+
+from pydocstringformatter._caching.base import Cache
+
+SHARDS = 256
+"""Number of subdirectories entries are distributed over."""
+
+SHARD_NAME = re.compile(r"[0-9a-f]{2}")
+
+SAMPLE_ENTRIES = 5000
+"""Number of entries that are counted to estimate the size of the cache."""
+
+SAMPLE_SHARDS = 16
+"""Number of shards that are counted before a cache can be estimated to be small."""
+
+
+class DirectoryCache(Cache):
+    """Cache that stores every entry as an empty file in a directory.
+
+    The modification time of an entry is updated whenever it is used, so
+    that the least recently used entries can be evicted. A directory that
+    can't be written to turns the cache off for the rest of the run.
+    """
+
+    name = "directory"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.location, key[:2], key)
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            os.utime(self._entry_path(key))
+        except OSError:
+            return False
+        return True
+
+    def open(self) -> None:
+        try:
+            if not os.path.isdir(self.location):
+                self._create_cache_dir()
+        except OSError as exc:
+            self._disable(exc)
+
+    def add(self, key: str) -> None:
+        if self.disabled:
+            return
+        path = self._entry_path(key)
+        try:
+            if not os.path.isdir(self.location):
+                self._create_cache_dir()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Creating an empty file is atomic, concurrent runs can safely add
+            # the same entry at the same time.
+            with open(path, "ab"):
+                pass
+        except OSError as exc:
+            self._disable(exc)
+
+    def _create_cache_dir(self) -> None:
+        """Create the cache directory and make sure git ignores it."""
+        # pylint: disable-next=import-outside-toplevel
+        import tempfile
+
+        os.makedirs(self.location, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.location, delete=False, encoding="utf-8"
+        ) as file:
+            file.write("# Automatically created by pydocstringformatter.\n*\n")
+        os.replace(file.name, os.path.join(self.location, ".gitignore"))
+
+    def clear(self) -> None:
+        # Only remove the shards, the directory might contain other files
+        if not os.path.isdir(self.location):
+            return
+        # pylint: disable-next=import-outside-toplevel
+        import shutil
+
+        try:
+            for shard in os.scandir(self.location):
+                if shard.is_dir() and SHARD_NAME.fullmatch(shard.name):
+                    shutil.rmtree(shard.path, ignore_errors=True)
+        except OSError as exc:
+            self._disable(exc)
+
+    def estimate_size(self) -> int:
+        """Estimate the number of entries from the entries of the first shards.
+
+        Keys are hashes, so the entries are spread evenly over the shards. The
+        shards are counted until the count is large enough for an accurate
+        estimate, or the cache is clearly smaller than its maximum.
+        """
+        entries = 0
+        for index in range(SHARDS):
+            try:
+                entries += len(os.listdir(os.path.join(self.location, f"{index:02x}")))
+            except FileNotFoundError:
+                pass
+            estimate = entries * SHARDS // (index + 1)
+            if entries >= SAMPLE_ENTRIES or (
+                index + 1 >= SAMPLE_SHARDS and estimate < self.max_entries // 2
+            ):
+                break
+        return estimate
+
+    def prune(self) -> None:
+        if self.disabled or not os.path.isdir(self.location):
+            return
+        paths: list[str] = []
+        try:
+            if self.estimate_size() <= self.max_entries:
+                return
+            for shard in os.scandir(self.location):
+                if shard.is_dir() and SHARD_NAME.fullmatch(shard.name):
+                    paths.extend(entry.path for entry in os.scandir(shard.path))
+        except OSError as exc:
+            self._disable(exc)
+            return
+        # Only stat the entries when some of them have to be evicted
+        if len(paths) <= self.max_entries:
+            return
+
+        entries: list[tuple[float, str]] = []
+        for path in paths:
+            try:
+                entries.append((os.stat(path).st_mtime, path))
+            except OSError:
+                # Removed by a concurrent run
+                continue
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.prune_target :]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import urllib.parse
+from typing import TYPE_CHECKING, Any
+
+from pydocstringformatter._caching.base import Cache
+
+if TYPE_CHECKING:
+    import http.client
+
+TIMEOUT = 5
+"""Timeout in seconds for requests to the cache server."""
+
+
+class HTTPCache(Cache):
+    """Cache that stores its entries on a server, so it can be shared.
+
+    The server should respond to:
+        GET <url>/<key>: 200 if the key is known, 404 otherwise.
+        PUT <url>/<key>: store the key.
+        DELETE <url>/: remove all keys.
+
+    The server is responsible for evicting entries. Any failure to reach
+    the server is treated as a cache miss, and turns the cache off for the
+    rest of the run.
+    """
+
+    name = "http"
+    failure_message = "Can't reach the cache server at {location}"
+
+    _connection: http.client.HTTPConnection | None = None
+
+    def _request(self, method: str, key: str) -> int | None:
+        """Send a request to the server and return the status code."""
+        # Only runs with this backend need http.client, which is slow to import
+        # pylint: disable-next=import-outside-toplevel
+        import http.client
+
+        if self.disabled:
+            return None
+        url = urllib.parse.urlsplit(self.location)
+        path = f"{url.path.rstrip('/')}/{key}"
+        for _ in range(2):
+            is_reused = self._connection is not None
+            if self._connection is None:
+                connection_class = (
+                    http.client.HTTPSConnection
+                    if url.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                self._connection = connection_class(url.netloc, timeout=TIMEOUT)
+            try:
+                self._connection.request(method, path, body=b"")
+                response = self._connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                self._connection.close()
+                self._connection = None
+                # The server might have closed a connection that was kept open
+                # since the last request, retry once with a new connection
+                if is_reused and not isinstance(exc, TimeoutError):
+                    continue
+                self._disable(exc)
+                return None
+            return response.status
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self._request("GET", key) == 200
+
+    def add(self, key: str) -> None:
+        self._request("PUT", key)
+
+    def clear(self) -> None:
+        self._request("DELETE", "")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Don't share the connection with worker processes."""
+        state = self.__dict__.copy()
+        state.pop("_connection", None)
+        return state
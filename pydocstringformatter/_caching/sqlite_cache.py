@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from pydocstringformatter._caching.base import Cache
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DATABASE_NAME = "cache.sqlite3"
+
+
+class SQLiteCache(Cache):
+    """Cache that stores all entries in a single SQLite database.
+
+    The database uses write-ahead logging so that multiple runs can read
+    and write to it at the same time. A database that can't be opened or
+    written to turns the cache off for the rest of the run.
+    """
+
+    name = "sqlite"
+
+    _connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection to the database, opened on first use."""
+        if self._connection is None:
+            # pylint: disable-next=import-outside-toplevel
+            import sqlite3
+
+            os.makedirs(self.location, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(self.location, DATABASE_NAME),
+                timeout=30,
+                isolation_level=None,
+            )
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries "
+                    "(key TEXT PRIMARY KEY, last_used REAL NOT NULL)"
+                )
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> int:
+        """Execute a statement and return the number of rows it changed."""
+        # pylint: disable-next=import-outside-toplevel
+        import sqlite3
+
+        if self.disabled:
+            return 0
+        try:
+            return self.connection.execute(sql, parameters).rowcount
+        except (OSError, sqlite3.Error) as exc:
+            self._disable(exc)
+            return 0
+
+    def open(self) -> None:
+        self._execute("SELECT 1")
+
+    def __contains__(self, key: str) -> bool:
+        return (
+            self._execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            > 0
+        )
+
+    def add(self, key: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?)", (key, time.time())
+        )
+
+    def clear(self) -> None:
+        self._execute("DELETE FROM entries")
+
+    def prune(self) -> None:
+        self._execute(
+            "DELETE FROM entries WHERE (SELECT COUNT(*) FROM entries) > ? AND key IN "
+            "(SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries, self.prune_target),
+        )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Don't share the connection with worker processes."""
+        state = self.__dict__.copy()
+        state.pop("_connection", None)
+        return state
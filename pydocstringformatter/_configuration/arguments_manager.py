@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import argparse
+from typing import IO, TYPE_CHECKING
 
+from pydocstringformatter import _caching
 from pydocstringformatter._configuration import (
     command_line_parsing,
     formatter_options,
@@ -9,14 +11,37 @@ from pydocstringformatter._configuration import (
 )
 from pydocstringformatter._configuration.validators import VALIDATORS
 from pydocstringformatter._formatting.base import Formatter
+from pydocstringformatter._utils.find_docstrings import DOCSTRING_LOCATORS
+from pydocstringformatter._utils.output_sink import DEFAULT_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that can write its messages to a stream of its own."""
+
+    output: IO[str] | None = None
+    """Stream to write messages to instead of stdout and stderr."""
+
+    def _print_message(
+        self, message: str, file: SupportsWrite[str] | None = None
+    ) -> None:
+        super()._print_message(message, self.output or file)
 
 
 class ArgumentsManager:
     """Handler for arugments adding and parsing."""
 
-    def __init__(self, version: str, formatters: list[Formatter]) -> None:
+    def __init__(
+        self,
+        version: str,
+        formatters: list[Formatter],
+        output: IO[str] | None = None,
+    ) -> None:
         # Initialize instance attributes for argument parsing
-        self.parser = argparse.ArgumentParser(prog="pydocstringformatter")
+        self.parser = _ArgumentParser(prog="pydocstringformatter")
+        self.parser.output = output
         self.namespace = argparse.Namespace()
 
         self.formatters = formatters
@@ -24,6 +49,9 @@ class ArgumentsManager:
 
         # First register all argument groups, then add arguments
         self.configuration_group = self.parser.add_argument_group("configuration")
+        self.cache_group = self.parser.add_argument_group(
+            "cache", "files that are known to be correctly formatted are skipped"
+        )
         self.default_formatters_group = self.parser.add_argument_group(
             "default formatters", "these formatters are turned on by default"
         )
@@ -42,7 +70,23 @@ class ArgumentsManager:
     def register_arguments(self, version: str) -> None:
         """Register all standard arguments on the parser."""
         self.parser.add_argument(
-            "files", nargs="*", type=str, help="The directory or files to format."
+            "files",
+            nargs="*",
+            type=str,
+            help="The directory or files to format. Use '-' to format stdin.",
+        )
+
+        self.parser.add_argument(
+            "--stdin-filename",
+            action="store",
+            default=None,
+            type=str,
+            help=(
+                "The name of the file that is formatted from stdin, used for "
+                "--exclude, --changed-since and messages. The formatted source "
+                "is written to stdout with --write, otherwise the diff is."
+            ),
+            metavar="filename",
         )
 
         self.parser.add_argument(
@@ -58,6 +102,12 @@ class ArgumentsManager:
             help="Do not print any logging or status messages to stdout.",
         )
 
+        self.parser.add_argument(
+            "--statistics",
+            action="store_true",
+            help="Print statistics about the formatted and skipped files to stderr.",
+        )
+
         self.parser.add_argument(
             "-v",
             "--version",
@@ -73,10 +123,100 @@ class ArgumentsManager:
             type=VALIDATORS["csv"],
             help=(
                 "A comma separated list of glob patterns of "
-                "file path names not to be formatted."
+                "file path names not to be formatted. Relative patterns are "
+                "relative to the working directory. Directories matched by a "
+                "pattern ending with /** are skipped with everything in them."
+            ),
+        )
+
+        self.configuration_group.add_argument(
+            "--discovery",
+            action="store",
+            default="filesystem",
+            choices=["filesystem", "git"],
+            help=(
+                "How to find the files in directories. With 'git' the tracked "
+                "files and the untracked files that aren't ignored by git are "
+                "formatted, without walking the ignored directories. Directories "
+                "that aren't in a git work tree are still walked."
             ),
         )
 
+        self.configuration_group.add_argument(
+            "--changed-since",
+            action="store",
+            default=None,
+            type=str,
+            help=(
+                "Only format the docstrings that changed since a git revision, "
+                "such as 'main' or 'HEAD~1'. Untracked files are formatted "
+                "completely and other files are not searched for at all."
+            ),
+            metavar="rev",
+        )
+
+        self.configuration_group.add_argument(
+            "--line-ranges",
+            action="extend",
+            default=[],
+            type=VALIDATORS["line_ranges"],
+            help=(
+                "Only format docstrings that overlap with these comma separated "
+                "START-END line ranges, for example '1-10,21-30'. Line numbers "
+                "start at 1 and ranges include their end. Can be passed multiple "
+                "times, but only when formatting a single file."
+            ),
+            metavar="START-END",
+        )
+
+        self.configuration_group.add_argument(
+            "--generated-markers",
+            action="store",
+            default=[],
+            type=VALIDATORS["csv"],
+            help=(
+                "A comma separated list of markers, such as '@generated', that "
+                "indicate a file is generated when found in its first lines. "
+                "Generated files are not formatted."
+            ),
+        )
+
+        self.configuration_group.add_argument(
+            "--fsync",
+            action="store_true",
+            default=False,
+            help=(
+                "Flush written files and their directories to disk, so they "
+                "survive a crash of the system. Directories are flushed once "
+                "per batch of files."
+            ),
+        )
+
+        self.configuration_group.add_argument(
+            "--output-buffer-size",
+            action="store",
+            default=DEFAULT_BUFFER_SIZE,
+            type=int,
+            help=(
+                "The number of bytes of output that are buffered before they are "
+                f"written. The default value is {DEFAULT_BUFFER_SIZE}, "
+                "use 0 to write all output immediately."
+            ),
+            metavar="int",
+        )
+
+        self.configuration_group.add_argument(
+            "--max-file-size",
+            action="store",
+            default=0,
+            type=int,
+            help=(
+                "Files larger than this number of bytes are not formatted. "
+                "The default value of 0 means there is no limit."
+            ),
+            metavar="int",
+        )
+
         self.configuration_group.add_argument(
             "--exit-code",
             action="store_true",
@@ -87,6 +227,68 @@ class ArgumentsManager:
             ),
         )
 
+        self.configuration_group.add_argument(
+            "-j",
+            "--jobs",
+            action="store",
+            default=1,
+            type=VALIDATORS["jobs"],
+            help=(
+                "The number of processes to use to format files. "
+                "Use 'auto' to use the number of available CPUs. "
+                "The default value is 1."
+            ),
+            metavar="int|auto",
+        )
+
+        self.configuration_group.add_argument(
+            "--docstring-memo-size",
+            action="store",
+            default=10_000,
+            type=int,
+            help=(
+                "The number of formatted docstrings to remember, so identical "
+                "docstrings are only formatted once. Use 0 to disable. "
+                "The default value is 10000."
+            ),
+            metavar="int",
+        )
+
+        self.configuration_group.add_argument(
+            "--stability-check",
+            action="store",
+            default="changed",
+            choices=["always", "changed", "never"],
+            help=(
+                "When to run the formatters a third time to check that their "
+                "result is stable. With 'changed' this is only done when the "
+                "second run still changed the docstring or when a formatter is "
+                "enabled that isn't known to be deterministic."
+            ),
+        )
+
+        self.configuration_group.add_argument(
+            "--docstring-locator",
+            action="store",
+            default="scanner",
+            choices=list(DOCSTRING_LOCATORS),
+            help=(
+                "How to find the docstrings in a file. The scanner only looks for "
+                "strings and falls back to tokenize for code it can't handle."
+            ),
+        )
+
+        self.configuration_group.add_argument(
+            "--fused-pipeline",
+            action=argparse.BooleanOptionalAction,
+            default=True,
+            help=(
+                "Apply the default formatters in a single pass over a docstring "
+                "when no other formatters are enabled. The result is the same, "
+                "turn this off to apply the formatters one after the other."
+            ),
+        )
+
         self.configuration_group.add_argument(
             "--max-summary-lines",
             action="store",
@@ -127,17 +329,72 @@ class ArgumentsManager:
             help="Docstring styles that are used in the project. Can be more than one.",
         )
 
+        self.cache_group.add_argument(
+            "--cache",
+            action=argparse.BooleanOptionalAction,
+            default=True,
+            help="Use a cache to skip files that are already correctly formatted.",
+        )
+
+        self.cache_group.add_argument(
+            "--clear-cache",
+            action="store_true",
+            help="Remove all entries from the cache before formatting.",
+        )
+
+        self.cache_group.add_argument(
+            "--cache-backend",
+            action="store",
+            default="directory",
+            choices=list(_caching.CACHE_BACKENDS),
+            help=(
+                "Where to store the cache: files in the cache directory, a SQLite "
+                "database in the cache directory or a server at the cache url."
+            ),
+        )
+
+        self.cache_group.add_argument(
+            "--cache-dir",
+            action="store",
+            default=_caching.DEFAULT_CACHE_DIR,
+            help=(
+                "The directory used by the 'directory' and 'sqlite' cache "
+                "backends. The default value is %(default)s."
+            ),
+        )
+
+        self.cache_group.add_argument(
+            "--cache-url",
+            action="store",
+            help="The url of the server used by the 'http' cache backend.",
+        )
+
+        self.cache_group.add_argument(
+            "--cache-max-entries",
+            action="store",
+            default=100_000,
+            type=int,
+            help=(
+                "The maximum number of entries in the cache, the least recently "
+                "used entries are evicted first. The default value is %(default)s."
+            ),
+            metavar="int",
+        )
+
     def parse_options(
         self,
         argv: list[str],
+        directory: str = ".",
     ) -> None:
         """Load all default option values.
 
         The order of parsing is:
         1. configuration files, 2. command line arguments, 3. set default values.
+
+        The configuration file is read from the given directory.
         """
         # pylint: disable=protected-access
-        toml_parsing.parse_toml_file(self.parser, self.namespace)
+        toml_parsing.parse_toml_file(self.parser, self.namespace, directory)
 
         command_line_parsing.parse_command_line_arguments(
             self.parser, self.namespace, argv
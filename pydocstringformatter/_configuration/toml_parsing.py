@@ -2,16 +2,18 @@ from __future__ import annotations
 
 import argparse
 import os
-import tomllib
 from typing import Any
 
 from pydocstringformatter._utils.exceptions import TomlParsingError, UnrecognizedOption
 
 
-def get_toml_file() -> dict[str, Any] | None:
+def get_toml_file(directory: str = ".") -> dict[str, Any] | None:
     """See if there is a pyproject.toml and extract the correct section if it exists."""
-    if os.path.isfile("pyproject.toml"):
-        with open("pyproject.toml", "rb") as file:
+    if os.path.isfile(toml_path := os.path.join(directory, "pyproject.toml")):
+        # pylint: disable-next=import-outside-toplevel
+        import tomllib
+
+        with open(toml_path, "rb") as file:
             try:
                 toml_dict = tomllib.load(file)
             except tomllib.TOMLDecodeError as exc:
@@ -23,6 +25,46 @@ def get_toml_file() -> dict[str, Any] | None:
     return None
 
 
+REPOSITORY_MARKERS = (".git", ".hg")
+"""Names of the directories that mark the root of a repository."""
+
+
+class ConfigFinder:
+    """Finds the configuration files that apply to directories.
+
+    The nearest pyproject.toml with a pydocstringformatter section applies. It is
+    searched for in the directory and its parents, up to the root of the repository
+    the directory is in. The result is kept for every directory that is searched,
+    so every directory is searched only once.
+    """
+
+    def __init__(self) -> None:
+        self._directories: dict[str, str | None] = {}
+
+    def find(self, directory: str) -> str | None:
+        """Find the directory of the configuration file of an absolute directory."""
+        searched: list[str] = []
+        found: str | None = None
+        while True:
+            if directory in self._directories:
+                found = self._directories[directory]
+                break
+            searched.append(directory)
+            if get_toml_file(directory) is not None:
+                found = directory
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory or any(
+                os.path.exists(os.path.join(directory, marker))
+                for marker in REPOSITORY_MARKERS
+            ):
+                break
+            directory = parent
+
+        self._directories.update(dict.fromkeys(searched, found))
+        return found
+
+
 def parse_toml_option(  # pylint: disable=too-many-branches
     parser: argparse.ArgumentParser, opt: str, value: Any
 ) -> list[str]:
@@ -78,10 +120,10 @@ def parse_toml_option(  # pylint: disable=too-many-branches
 
 
 def parse_toml_file(
-    parser: argparse.ArgumentParser, namespace: argparse.Namespace
+    parser: argparse.ArgumentParser, namespace: argparse.Namespace, directory: str = "."
 ) -> None:
     """Get and parse the relevant section form a pyproject.toml file."""
-    if toml_sect := get_toml_file():
+    if toml_sect := get_toml_file(directory):
         arguments: list[str] = []
 
         for key, value in toml_sect.items():
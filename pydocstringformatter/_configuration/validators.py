@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import argparse
+import os
 from collections.abc import Callable
 from typing import Final
 
@@ -11,7 +13,41 @@ def comma_separated_list_validator(value: str | list[str]) -> list[str]:
     return value.split(",")
 
 
-ValidatedTypes = list[str]
+def jobs_validator(value: str | int) -> int:
+    """Validate the number of jobs, 'auto' uses the number of CPUs."""
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(
+            f"'{value}' is not a positive integer or 'auto'"
+        )
+    return jobs
+
+
+def line_ranges_validator(value: str) -> list[tuple[int, int]]:
+    """Validate a comma separated list of START-END line ranges."""
+    line_ranges: list[tuple[int, int]] = []
+    for line_range in value.split(","):
+        start, _, end = line_range.partition("-")
+        try:
+            first, last = int(start), int(end)
+        except ValueError:
+            first = last = 0
+        if not 0 < first <= last:
+            raise argparse.ArgumentTypeError(
+                f"'{line_range}' is not a valid START-END line range"
+            )
+        line_ranges.append((first, last))
+    return line_ranges
+
+
+ValidatedTypes = list[str] | int | list[tuple[int, int]]
 VALIDATORS: Final[dict[str, Callable[[str], ValidatedTypes]]] = {
-    "csv": comma_separated_list_validator
+    "csv": comma_separated_list_validator,
+    "jobs": jobs_validator,
+    "line_ranges": line_ranges_validator,
 }
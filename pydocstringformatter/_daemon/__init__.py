@@ -0,0 +1,128 @@
+"""A daemon that formats sources without the startup cost of every invocation."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import tokenize
+from typing import TYPE_CHECKING
+
+from pydocstringformatter._daemon.client import DaemonClient, format_with_daemon
+from pydocstringformatter._daemon.protocol import Address, FormatRequest, FormatResult
+from pydocstringformatter._utils.exceptions import PydocstringFormatterError
+from pydocstringformatter._utils.lazy_attributes import make_lazy_getattr
+
+if TYPE_CHECKING:
+    from pydocstringformatter._daemon.formatting import ConfiguredRuns, format_request
+
+# The client only imports the formatters if it can't reach the daemon
+_LAZY_ATTRIBUTES = {
+    "ConfiguredRuns": "pydocstringformatter._daemon.formatting",
+    "format_request": "pydocstringformatter._daemon.formatting",
+}
+__getattr__ = make_lazy_getattr(_LAZY_ATTRIBUTES, __name__)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8799
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pydocstringformatterd",
+        description=(
+            "Format docstrings with a long-lived daemon, so the startup cost "
+            "is only paid once."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start the daemon.")
+    format_parser = subparsers.add_parser(
+        "format",
+        help=(
+            "Format the source on stdin and write it to stdout. The source is "
+            "formatted in this process if the daemon isn't running."
+        ),
+    )
+
+    for subparser in (serve_parser, format_parser):
+        subparser.add_argument("--host", default=DEFAULT_HOST)
+        subparser.add_argument("--port", type=int, default=DEFAULT_PORT)
+        subparser.add_argument(
+            "--socket",
+            help="Use a unix socket at this path instead of a host and port.",
+        )
+
+    format_parser.add_argument(
+        "--filename",
+        default="<stdin>",
+        help="Name of the file the source is from, used in diffs and messages.",
+    )
+    format_parser.add_argument(
+        "--directory",
+        default=".",
+        help="Directory to read the pyproject.toml file from.",
+    )
+    format_parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Write a diff of the changes instead of the formatted source.",
+    )
+    format_parser.add_argument(
+        "options",
+        nargs=argparse.REMAINDER,
+        help="Options for pydocstringformatter, after '--'.",
+    )
+    return parser
+
+
+def _format_stdin(address: Address, args: argparse.Namespace) -> int:
+    data = sys.stdin.buffer.read()
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    options = args.options[1:] if args.options[:1] == ["--"] else args.options
+    request = FormatRequest(
+        data.decode(encoding), options, args.filename, args.directory, args.diff
+    )
+    try:
+        result = format_with_daemon(address, request)
+    except PydocstringFormatterError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    if args.diff:
+        sys.stdout.write(result.diff)
+    else:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(result.source.encode(encoding))
+    return 0
+
+
+def run_daemon(argv: list[str] | None = None) -> int:
+    """Run the daemon or its client with the given arguments."""
+    args = _create_parser().parse_args(argv)
+    address: Address = args.socket or (args.host, args.port)
+
+    if args.command == "format":
+        return _format_stdin(address, args)
+
+    # pylint: disable-next=import-outside-toplevel
+    from pydocstringformatter._daemon.server import create_server
+
+    with create_server(address) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+__all__ = [
+    "ConfiguredRuns",
+    "DaemonClient",
+    "FormatRequest",
+    "FormatResult",
+    "format_request",
+    "format_with_daemon",
+    "run_daemon",
+]
@@ -0,0 +1,5 @@
+import sys
+
+from pydocstringformatter._daemon import run_daemon
+
+sys.exit(run_daemon())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import dataclasses
+import http.client
+import json
+import os
+import socket
+from typing import TYPE_CHECKING
+
+from pydocstringformatter._daemon.protocol import Address, FormatRequest, FormatResult
+from pydocstringformatter._utils.exceptions import PydocstringFormatterError
+
+if TYPE_CHECKING:
+    from pydocstringformatter._daemon.formatting import ConfiguredRuns
+
+TIMEOUT = 30
+"""Timeout in seconds for requests to the daemon."""
+
+
+class DaemonUnavailableError(Exception):
+    """Raised when the daemon can't be reached."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a unix socket."""
+
+    def __init__(self, path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class DaemonClient:
+    """Client that formats sources with a running daemon."""
+
+    def __init__(self, address: Address, timeout: float = TIMEOUT) -> None:
+        self.address = address
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if isinstance(self.address, str):
+            return _UnixHTTPConnection(self.address, self.timeout)
+        host, port = self.address
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def format(self, request: FormatRequest) -> FormatResult:
+        """Format the source of a request with the daemon."""
+        # The daemon runs in another working directory
+        request = dataclasses.replace(
+            request, directory=os.path.abspath(request.directory)
+        )
+        connection = self._connect()
+        try:
+            connection.request(
+                "POST",
+                "/",
+                body=json.dumps(dataclasses.asdict(request)).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+            )
+            response = connection.getresponse()
+            body = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            raise DaemonUnavailableError(str(exc)) from exc
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            raise PydocstringFormatterError(body["error"])
+        return FormatResult(**body)
+
+
+_LOCAL_RUNS: ConfiguredRuns | None = None
+"""Configured runs to fall back on when the daemon isn't running."""
+
+
+def format_with_daemon(address: Address, request: FormatRequest) -> FormatResult:
+    """Format a source with the daemon, or in this process if it isn't running."""
+    try:
+        return DaemonClient(address).format(request)
+    except DaemonUnavailableError:
+        pass
+
+    # Only import the formatters when the daemon can't format the source
+    # pylint: disable-next=import-outside-toplevel
+    from pydocstringformatter._daemon.formatting import ConfiguredRuns, format_request
+
+    global _LOCAL_RUNS  # pylint: disable=global-statement
+    if _LOCAL_RUNS is None:
+        _LOCAL_RUNS = ConfiguredRuns()
+    return format_request(_LOCAL_RUNS, request)
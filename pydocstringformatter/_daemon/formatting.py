@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+
+from pydocstringformatter._daemon.protocol import FormatRequest, FormatResult
+from pydocstringformatter._utils import (
+    LRUMemo,
+    PydocstringFormatterError,
+    generate_docstrings_diff,
+    splice_docstrings,
+)
+from pydocstringformatter.run import _Run
+
+MAX_CONFIGURED_RUNS = 16
+"""Number of configurations for which a configured run is kept."""
+
+
+class ConfiguredRuns:
+    """Runs that are reused for requests with the same configuration.
+
+    A configuration is identified by its directory, its options and the
+    modification time of the pyproject.toml file in its directory. Every run
+    owns its formatters, so runs can be used by multiple threads at once.
+    """
+
+    def __init__(self, max_runs: int = MAX_CONFIGURED_RUNS) -> None:
+        self._runs: LRUMemo[tuple[str, tuple[str, ...], int | None], _Run]
+        self._runs = LRUMemo(max_runs)
+
+    def get(self, directory: str, options: list[str]) -> _Run:
+        """Get a run that is configured for a directory and options."""
+        directory = os.path.abspath(directory)
+        try:
+            toml_mtime: int | None = os.stat(
+                os.path.join(directory, "pyproject.toml")
+            ).st_mtime_ns
+        except OSError:
+            toml_mtime = None
+
+        key = (directory, tuple(options), toml_mtime)
+        if run := self._runs.get(key):
+            return run
+
+        # Invalid options make argparse print a message and exit, the message
+        # is captured per run as other threads might be formatting at once
+        output = io.StringIO()
+        try:
+            run = _Run(options, directory, format_files=False, parser_output=output)
+        except SystemExit as exc:
+            raise PydocstringFormatterError(output.getvalue().strip()) from exc
+        self._runs.put(key, run)
+        return run
+
+
+def format_request(runs: ConfiguredRuns, request: FormatRequest) -> FormatResult:
+    """Format the source of a request with a configured run."""
+    run = runs.get(request.directory, request.options)
+
+    # Format with universal newlines, like files are formatted
+    with io.StringIO(request.source, newline=None) as file:
+        source = file.read()
+        newlines = file.newlines
+    if not (
+        changed_docstrings := run.get_changed_docstrings(source, Path(request.filename))
+    ):
+        return FormatResult(request.source, False)
+
+    new_source = splice_docstrings(source, changed_docstrings)
+    diff = (
+        generate_docstrings_diff(source, changed_docstrings, request.filename)
+        if request.diff
+        else ""
+    )
+    if isinstance(newlines, tuple):
+        newlines = newlines[0]
+    if newlines and newlines != "\n":
+        new_source = new_source.replace("\n", newlines)
+    return FormatResult(new_source, True, diff)
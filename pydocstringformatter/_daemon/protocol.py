@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+Address = tuple[str, int] | str
+"""A host and port, or the path of a unix socket."""
+
+
+@dataclasses.dataclass
+class FormatRequest:
+    """A request to format a source."""
+
+    source: str
+    options: list[str] = dataclasses.field(default_factory=list)
+    """Command line options to format the source with."""
+    filename: str = "<stdin>"
+    """Name of the file the source is from, used in diffs and error messages."""
+    directory: str = "."
+    """Directory to read the pyproject.toml file from."""
+    diff: bool = False
+    """Whether to return a diff of the changes."""
+
+    @classmethod
+    def from_json(cls, data: Any) -> FormatRequest:
+        """Create a request from its JSON representation and validate it."""
+        if not isinstance(data, dict):
+            raise ValueError("The request should be a JSON object.")
+        request = cls(**data)
+        if not isinstance(request.source, str) or not all(
+            isinstance(option, str) for option in request.options
+        ):
+            raise ValueError("The source and options should be strings.")
+        return request
+
+
+@dataclasses.dataclass
+class FormatResult:
+    """The result of formatting a source."""
+
+    source: str
+    is_changed: bool
+    diff: str = ""
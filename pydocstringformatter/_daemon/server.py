@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import dataclasses
+import http.server
+import json
+import os
+import socket
+import socketserver
+
+from pydocstringformatter import __version__
+from pydocstringformatter._daemon.formatting import ConfiguredRuns, format_request
+from pydocstringformatter._daemon.protocol import Address, FormatRequest
+from pydocstringformatter._utils import PydocstringFormatterError
+
+
+class DaemonRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler that formats the sources it receives.
+
+    POST /: format the source of a JSON FormatRequest and respond with a
+        JSON FormatResult, or with an object with an 'error' key.
+    GET /: respond with the version of the daemon.
+    """
+
+    server: DaemonServer
+
+    def _respond(self, status: int, body: object) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Report the version of the daemon."""
+        self._respond(200, {"version": __version__})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Format the source of a request."""
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            request = FormatRequest.from_json(json.loads(data))
+        except (TypeError, ValueError) as exc:
+            self._respond(400, {"error": f"Invalid request: {exc}"})
+            return
+
+        try:
+            result = format_request(self.server.runs, request)
+        except PydocstringFormatterError as exc:
+            self._respond(400, {"error": str(exc)})
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Keep serving other requests
+            self._respond(500, {"error": f"{type(exc).__name__}: {exc}"})
+        else:
+            self._respond(200, dataclasses.asdict(result))
+
+    def address_string(self) -> str:
+        """Unix sockets don't have a client address."""
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    def log_message(self, *args: object) -> None:
+        """Don't log requests."""
+
+
+class DaemonServer(http.server.ThreadingHTTPServer):
+    """Server that keeps configured runs around between requests."""
+
+    def __init__(self, address: Address) -> None:
+        super().__init__(address, DaemonRequestHandler)  # type: ignore[arg-type]
+        self.runs = ConfiguredRuns()
+
+
+class UnixDaemonServer(DaemonServer):
+    """DaemonServer that listens on a unix socket."""
+
+    address_family = socket.AF_UNIX
+
+    def __init__(self, path: str) -> None:
+        # A socket of a daemon that didn't shut down cleanly would block binding
+        if os.path.exists(path) and not _is_listening(path):
+            os.unlink(path)
+        super().__init__(path)
+
+    def server_bind(self) -> None:
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):  # type: ignore[arg-type]
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+
+
+def _is_listening(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def create_server(address: Address) -> DaemonServer:
+    """Create a server that listens on a host and port or a unix socket."""
+    if isinstance(address, str):
+        return UnixDaemonServer(address)
+    return DaemonServer(address)
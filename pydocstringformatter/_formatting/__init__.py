@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-__all__ = ["FORMATTERS", "Formatter"]
+__all__ = ["FORMATTERS", "Docstring", "Formatter"]
 
 
 from pydocstringformatter._formatting.base import Formatter
+from pydocstringformatter._formatting.docstring import Docstring
 from pydocstringformatter._formatting.formatters_default import (
     BeginningQuotesFormatter,
     CapitalizeFirstLetterFormatter,
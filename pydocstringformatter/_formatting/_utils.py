@@ -1,4 +1,8 @@
+from __future__ import annotations
+
 import functools
+import re
+from typing import Any
 
 
 @functools.lru_cache(maxsize=None)
@@ -8,3 +12,21 @@ def is_rst_title(summary: str) -> bool:
     if not (last_line := summary.splitlines()[-1].lstrip()):
         return False
     return last_line.count(last_line[0]) == len(last_line)
+
+
+class LazyPattern:
+    """A regular expression class attribute that is compiled when it's first used.
+
+    Most runs don't need every formatter, so their patterns aren't compiled on
+    import.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled: re.Pattern[str] | None = None
+
+    def __get__(self, instance: Any, owner: Any = None) -> re.Pattern[str]:
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        return self._compiled
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import re
+import tokenize
+from collections import OrderedDict
+from collections.abc import Iterator
+from itertools import tee
+from typing import Literal, NamedTuple, TypeVar
+
+_T = TypeVar("_T")
+
+QUOTES_REGEX = re.compile(r"""^('{3}|'|"{3}|")""")
+"""Pattern to match against opening quotes."""
+
+
+class SummaryAndDescription(NamedTuple):
+    """The summary and description of a docstring."""
+
+    prefix: str
+    """The new line and indentation before a summary that isn't on the first line."""
+    summary: str
+    description: str | None
+    closing_quotes_on_new_line: bool
+    round_trips: bool
+    """Whether joining the unchanged parts gives back the string of the docstring."""
+
+
+class NumpydocSections(NamedTuple):
+    """The numpydoc sections of a docstring."""
+
+    sections: OrderedDict[str, list[str]]
+    """The lines of each section, these should not be changed."""
+    last_line: str
+    """The last line of the docstring, before the closing quotes."""
+    round_trips: bool
+    """Whether joining the unchanged sections gives back the string of the docstring."""
+
+    def copy(self) -> OrderedDict[str, list[str]]:
+        """Return a copy of the sections that can be changed."""
+        return OrderedDict(
+            (name, lines.copy()) for name, lines in self.sections.items()
+        )
+
+
+class Docstring:
+    """A docstring token and the parts of its string that formatters work on.
+
+    The parts are parsed when a formatter first asks for them and are shared by
+    all formatters until the string changes. Formatters that set new parts only
+    create a new string if that changes the docstring.
+    """
+
+    def __init__(self, token: tokenize.TokenInfo) -> None:
+        self._token = token
+        self.changes = 0
+        """The number of times the docstring was changed."""
+
+        self._quotes: str | None = None
+        self._summary_and_description: SummaryAndDescription | None = None
+        self._numpydoc_sections: NumpydocSections | None = None
+
+    @property
+    def token(self) -> tokenize.TokenInfo:
+        """The token of the docstring."""
+        return self._token
+
+    @token.setter
+    def token(self, token: tokenize.TokenInfo) -> None:
+        if token != self._token:
+            if token.string != self._token.string:
+                self._quotes = None
+                self._invalidate_parts()
+            self._token = token
+            self.changes += 1
+
+    @property
+    def string(self) -> str:
+        """The string of the docstring, including the quotes."""
+        return self._token.string
+
+    @string.setter
+    def string(self, string: str) -> None:
+        if string != self._token.string:
+            self._quotes = None
+            self._set_parts_string(string)
+
+    @property
+    def indent(self) -> int:
+        """The indentation of the docstring."""
+        return self._token.start[1]
+
+    @property
+    def quotes(self) -> str:
+        """The opening quotes of the docstring."""
+        if self._quotes is None:
+            match = QUOTES_REGEX.match(self._token.string)
+            assert match
+            self._quotes = match.group()
+        return self._quotes
+
+    @property
+    def quotes_length(self) -> Literal[1, 3]:
+        """The number of opening quotes."""
+        quotes_length = len(self.quotes)
+        assert quotes_length in {1, 3}
+        return quotes_length  # type: ignore[return-value]
+
+    @property
+    def summary_and_description(self) -> SummaryAndDescription:
+        """The summary and description of the docstring."""
+        if self._summary_and_description is None:
+            prefix, summary, description = separate_summary_and_description(
+                self.string, self.indent, self.quotes_length
+            )
+            closing_quotes_on_new_line = (
+                self.string.splitlines()[-1] == self.indent * " " + self.quotes
+            )
+            parts = SummaryAndDescription(
+                prefix, summary, description, closing_quotes_on_new_line, False
+            )
+            self._summary_and_description = parts._replace(
+                round_trips=self._join_summary_and_description(
+                    parts, summary, description
+                )
+                == self.string
+            )
+        return self._summary_and_description
+
+    def set_summary_and_description(
+        self, summary: str, description: str | None
+    ) -> None:
+        """Change the summary and description of the docstring.
+
+        The description is only used if the docstring had a description.
+        """
+        parts = self.summary_and_description
+        if parts.round_trips and (summary, description) == parts[1:3]:
+            return
+        self._set_parts_string(
+            self._join_summary_and_description(parts, summary, description)
+        )
+
+    @property
+    def numpydoc_sections(self) -> NumpydocSections:
+        """The numpydoc sections of the docstring."""
+        if self._numpydoc_sections is None:
+            sections, last_line = split_numpydoc_sections(
+                self.string, self.quotes_length
+            )
+            parts = NumpydocSections(sections, last_line, False)
+            try:
+                string = join_numpydoc_sections(
+                    parts.copy(), last_line, self.indent, self.quotes
+                )
+            except IndexError:  # Sections without lines are only an issue if kept
+                string = None
+            self._numpydoc_sections = parts._replace(round_trips=string == self.string)
+        return self._numpydoc_sections
+
+    def set_numpydoc_sections(self, sections: OrderedDict[str, list[str]]) -> None:
+        """Change the numpydoc sections of the docstring."""
+        parts = self.numpydoc_sections
+        if parts.round_trips and list(sections.items()) == list(parts.sections.items()):
+            return
+        self._set_parts_string(
+            join_numpydoc_sections(sections, parts.last_line, self.indent, self.quotes)
+        )
+
+    def _join_summary_and_description(
+        self, parts: SummaryAndDescription, summary: str, description: str | None
+    ) -> str:
+        """Create the string of a docstring from its summary and description."""
+        docstring = f"{self.quotes}{parts.prefix}{summary}"
+        if parts.description:
+            docstring += f"\n\n{description}"
+        if parts.closing_quotes_on_new_line:
+            return f"{docstring}\n{self.indent * ' '}{self.quotes}"
+        return f"{docstring}{self.quotes}"
+
+    def _set_parts_string(self, string: str) -> None:
+        """Change the string after a change of its parts, which keeps the quotes."""
+        if string != self._token.string:
+            self._token = self._token._replace(string=string)
+            self._invalidate_parts()
+            self.changes += 1
+
+    def _invalidate_parts(self) -> None:
+        self._summary_and_description = None
+        self._numpydoc_sections = None
+
+
+def separate_summary_and_description(
+    docstring: str, indent_length: int, quotes_length: Literal[1, 3]
+) -> tuple[str, str, str | None]:
+    """Split the summary and description and handle quotes and indentation."""
+    if "\n\n" in docstring:
+        summary, description = docstring.split("\n\n", maxsplit=1)
+
+        # Remove final indentation, ending quotes and new line
+        description = description[:-quotes_length]
+        if indent_length and description.endswith(indent_length * " "):
+            description = description[:-indent_length]
+        if description.endswith("\n"):
+            description = description[:-1]
+    else:
+        summary, description = docstring, None
+
+        # Remove final indentation, ending quotes and new line
+        summary = summary[:-quotes_length]
+        if indent_length and summary.endswith(indent_length * " "):
+            summary = summary[:-indent_length]
+        if summary.endswith("\n"):
+            summary = summary[:-1]
+
+    # Remove opening quotes
+    summary = summary[quotes_length:]
+
+    # Prefix is the new-line + indentation for summaries that
+    # are not on the same line as the opening quotes
+    prefix = ""
+    if summary.startswith("\n"):
+        prefix = "\n" + indent_length * " "
+        summary = summary[1 + indent_length :]
+    return prefix, summary, description
+
+
+def _pairwise(iterator: Iterator[_T]) -> Iterator[tuple[_T, _T]]:
+    """Create an iterator over pairs of successive elements."""
+    first, second = tee(iterator)
+    next(second)
+    return zip(first, second)
+
+
+def split_numpydoc_sections(
+    docstring: str, quotes_length: Literal[1, 3]
+) -> tuple[OrderedDict[str, list[str]], str]:
+    """Split a docstring into its numpydoc sections and its last line."""
+    lines = docstring[quotes_length:-quotes_length].split("\n")
+    # Handle the spaces before the closing quotes
+    last_line = lines[-1]
+    if lines[-1].isspace():
+        lines[-1] = ""
+
+    # Split sections
+    section_hyphen_lines = [
+        index
+        for index, line in enumerate(lines)
+        if "-" in line and all(char in " \t-" for char in line)
+    ]
+    section_starts = [0] + [index - 1 for index in section_hyphen_lines] + [len(lines)]
+    sections = OrderedDict(
+        [
+            (
+                lines[curr_section_start].lstrip(),
+                lines[curr_section_start:next_section_start],
+            )
+            for curr_section_start, next_section_start in _pairwise(
+                iter(section_starts)
+            )
+        ]
+    )
+
+    if not section_hyphen_lines or section_hyphen_lines[0] > 1:
+        # The "Summary" section here includes the numpydoc
+        # summary, deprecation warning, and extended summary
+        # sections.  There's not an easy split for those the way
+        # there is for the other sections.
+        _, summary_section = sections.popitem(last=False)
+        sections["Summary"] = summary_section
+        sections.move_to_end("Summary", last=False)
+    return sections, last_line
+
+
+def join_numpydoc_sections(
+    sections: OrderedDict[str, list[str]],
+    last_line: str,
+    indent_length: int,
+    quotes: str,
+) -> str:
+    """Join numpydoc sections into a docstring, this changes their first lines."""
+    # Check that indent on first line of section didn't get weird
+    first_section = True
+    for section in sections.values():
+        if first_section:
+            section[0] = section[0].lstrip()
+            first_section = False
+        elif not section[0][0].isspace():
+            section[0] = f"{' ' * indent_length:s}{section[0]:s}"
+
+    # Rejoin sections
+    lines = [line for section in sections.values() for line in section]
+    # Ensure the last line puts the quotes in the right spot
+    if lines and lines[-1] == "":
+        if (last_line == "") or last_line.isspace():
+            # Try to preserve unindented closing quotes
+            lines[-1] = last_line
+        else:
+            # Quotes weren't on a different line before formatting
+            # but are now
+            lines[-1] = indent_length * " "
+    body = "\n".join(lines)
+    return f"{quotes:s}{body:s}{quotes:s}"
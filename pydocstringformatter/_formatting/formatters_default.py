@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import re
-import textwrap
 import tokenize
 from typing import Literal
 
@@ -17,7 +16,8 @@ class BeginningQuotesFormatter(StringFormatter):
     """Fix the position of the opening quotes."""
 
     name = "beginning-quotes"
-    potential_single_line = re.compile(
+    deterministic = True
+    potential_single_line = _utils.LazyPattern(
         r"""
         ['"]{1,3}         # 3 opening quotes
         \n\s*.+           # A line with any length of characters
@@ -44,7 +44,8 @@ class CapitalizeFirstLetterFormatter(StringFormatter):
     """Capitalize the first letter of the docstring if appropriate."""
 
     name = "capitalize-first-letter"
-    first_letter_re = re.compile(
+    deterministic = True
+    first_letter_re = _utils.LazyPattern(
         StringAndQuotesFormatter.quotes_regex.pattern + r"""\s*(\w)""", re.DOTALL
     )
 
@@ -64,6 +65,7 @@ class LineWrapperFormatter(SummaryFormatter):
     """Linewrap the docstring by the pre-defined line length."""
 
     name = "linewrap-full-docstring"
+    deterministic = True
     optional = True
 
     def treat_summary(
@@ -74,6 +76,8 @@ class LineWrapperFormatter(SummaryFormatter):
         description_exists: bool,
     ) -> str:
         """Wrap the summary of a docstring."""
+        # pylint: disable-next=import-outside-toplevel
+        import textwrap
 
         line_length = self.config.max_line_length
 
@@ -121,6 +125,7 @@ class ClosingQuotesFormatter(StringFormatter):
     """Fix the position of the closing quotes."""
 
     name = "closing-quotes"
+    deterministic = True
 
     def treat_string(self, tokeninfo: tokenize.TokenInfo, _: int) -> str:
         """Fix the position of end quotes for multi-line docstrings."""
@@ -144,6 +149,7 @@ class FinalPeriodFormatter(SummaryFormatter):
     """Add a period to the end of single line docstrings and summaries."""
 
     name = "final-period"
+    deterministic = True
     END_OF_SENTENCE_PUNCTUATION = {".", "?", "!", "‽", ":", ";"}
 
     def treat_summary(
@@ -170,6 +176,7 @@ class StripWhitespacesFormatter(StringAndQuotesFormatter):
     """Strip 1) docstring start, 2) docstring end and 3) end of line."""
 
     name = "strip-whitespaces"
+    deterministic = True
 
     def treat_string(
         self,
@@ -215,6 +222,7 @@ class QuotesTypeFormatter(StringAndQuotesFormatter):
     """Change all opening and closing quotes to be triple quotes."""
 
     name = "quotes-type"
+    deterministic = True
 
     def treat_string(
         self,
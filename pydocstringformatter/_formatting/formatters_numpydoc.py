@@ -9,6 +9,7 @@ class NumpydocSectionOrderingFormatter(NumpydocSectionFormatter):
     """Change section order to match numpydoc guidelines."""
 
     name = "numpydoc-section-order"
+    deterministic = True
 
     numpydoc_section_order = (
         "Summary",
@@ -44,6 +45,7 @@ class NumpydocNameColonTypeFormatter(NumpydocSectionFormatter):
     """Ensure proper spacing around the colon separating names from types."""
 
     name = "numpydoc-name-type-spacing"
+    deterministic = True
 
     numpydoc_sections_with_parameters = (
         "Parameters",
@@ -93,6 +95,7 @@ class NumpydocSectionSpacingFormatter(NumpydocSectionFormatter):
     """Ensure proper spacing between sections."""
 
     name = "numpydoc-section-spacing"
+    deterministic = True
 
     def treat_sections(
         self, sections: OrderedDict[str, list[str]]
@@ -109,6 +112,7 @@ class NumpydocSectionHyphenLengthFormatter(NumpydocSectionFormatter):
     """Ensure hyphens after section header lines are proper length."""
 
     name = "numpydoc-section-hyphen-length"
+    deterministic = True
 
     def treat_sections(
         self, sections: OrderedDict[str, list[str]]
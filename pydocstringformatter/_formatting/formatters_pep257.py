@@ -14,10 +14,11 @@ class SplitSummaryAndDocstringFormatter(SummaryFormatter):
     """
 
     name = "split-summary-body"
+    deterministic = True
 
     style = ["pep257"]
 
-    end_of_sentence_period = re.compile(
+    end_of_sentence_period = _utils.LazyPattern(
         r"""
         (?<!e.g|i.e|etc)                        # Not preceded by 'e.g', 'i.e', 'etc'
         \.                                  # A dot
@@ -0,0 +1,159 @@
+"""A single pass over a docstring that formats it like the default formatters."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from typing import Final, Literal
+
+from pydocstringformatter._formatting.base import (
+    Formatter,
+    StringAndQuotesFormatter,
+    SummaryAndDescriptionFormatter,
+)
+from pydocstringformatter._formatting.formatters_default import (
+    BeginningQuotesFormatter,
+    CapitalizeFirstLetterFormatter,
+    ClosingQuotesFormatter,
+    FinalPeriodFormatter,
+    QuotesTypeFormatter,
+    StripWhitespacesFormatter,
+)
+from pydocstringformatter._formatting.formatters_pep257 import (
+    SplitSummaryAndDocstringFormatter,
+)
+
+DEFAULT_FORMATTERS: Final = (
+    StripWhitespacesFormatter,
+    SplitSummaryAndDocstringFormatter,
+    BeginningQuotesFormatter,
+    ClosingQuotesFormatter,
+    CapitalizeFirstLetterFormatter,
+    FinalPeriodFormatter,
+    QuotesTypeFormatter,
+)
+"""The formatters that are enabled by default, in the order they are applied."""
+
+_QUOTES: Final = StringAndQuotesFormatter.quotes_regex
+_NEWLINE_AND_INDENT: Final = re.compile(r"\n *")
+
+_TreatSummary = Callable[[str, int, Literal[1, 3], bool], str]
+
+
+class FusedDefaultFormatters:
+    """Applies the default formatters to the string of a docstring in one pass.
+
+    The result is the same as that of applying the formatters one after the
+    other, but the string isn't wrapped in a new token for every formatter
+    and the work that formatters share is done once.
+    """
+
+    def __init__(self, formatters: list[Formatter]) -> None:
+        assert can_fuse(formatters)
+        beginning_quotes = formatters[2]
+        self.summary_quotes_same_line: bool = (
+            beginning_quotes.config.summary_quotes_same_line
+        )
+        split_summary, final_period = formatters[1], formatters[5]
+        assert isinstance(split_summary, SplitSummaryAndDocstringFormatter)
+        assert isinstance(final_period, FinalPeriodFormatter)
+        self._split_summary: _TreatSummary = split_summary.treat_summary
+        self._final_period: _TreatSummary = final_period.treat_summary
+
+    def format(self, string: str, indent: int) -> str:
+        """Return the formatted string of a docstring with this indentation."""
+        # None of the formatters before QuotesTypeFormatter change the opening
+        # quotes, so they only have to be found once.
+        match = _QUOTES.match(string)
+        assert match
+        quotes = match.group()
+
+        string = _strip_whitespaces(string, indent, quotes)
+        string = _treat_summary(string, indent, quotes, self._split_summary)
+        string = self._fix_beginning_quotes(string)
+        string = _fix_closing_quotes(string, indent)
+        string = _capitalize_first_letter(string)
+        string = _treat_summary(string, indent, quotes, self._final_period)
+        return f'"""{string[len(quotes) : -len(quotes)]}"""'
+
+    def _fix_beginning_quotes(self, string: str) -> str:
+        """Like BeginningQuotesFormatter."""
+        if string[3] == "\n" and (
+            string.count("\n") == 1
+            or self.summary_quotes_same_line
+            or BeginningQuotesFormatter.potential_single_line.match(string)
+        ):
+            return _NEWLINE_AND_INDENT.sub("", string, count=1)
+        return string
+
+
+def can_fuse(formatters: list[Formatter]) -> bool:
+    """Check if the formatters are exactly the default formatters."""
+    return tuple(type(formatter) for formatter in formatters) == DEFAULT_FORMATTERS
+
+
+def _strip_whitespaces(string: str, indent: int, quotes: str) -> str:
+    """Like StripWhitespacesFormatter."""
+    lines = string[len(quotes) : -len(quotes)].split("\n")
+    new_lines = [lines[0].strip()]
+    last_index = len(lines) - 1
+
+    for index in range(1, len(lines)):
+        line = lines[index]
+        if line == "" and lines[index - 1] == "":
+            continue
+        if index == last_index:
+            new_lines.append(indent * " " if line.count(" ") == len(line) else line)
+        else:
+            new_lines.append(line.rstrip())
+
+    if len(new_lines) > 3 and new_lines[-2] == "":
+        new_lines.pop(-2)
+    return quotes + "\n".join(new_lines) + quotes
+
+
+def _treat_summary(
+    string: str, indent: int, quotes: str, treat_summary: _TreatSummary
+) -> str:
+    """Like SummaryAndDescriptionFormatter.treat_string of a SummaryFormatter."""
+    quotes_length: Literal[1, 3] = len(quotes)  # type: ignore[assignment]
+    prefix, summary, description = (
+        SummaryAndDescriptionFormatter.separate_summary_and_description(
+            string, indent, quotes_length
+        )
+    )
+    docstring = (
+        f"{quotes}{prefix}"
+        f"{treat_summary(summary, indent, quotes_length, bool(description))}"
+    )
+    if description:
+        docstring += f"\n\n{description}"
+
+    if string.splitlines()[-1] == indent * " " + quotes:
+        return f"{docstring}\n{indent * ' '}{quotes}"
+    return f"{docstring}{quotes}"
+
+
+def _fix_closing_quotes(string: str, indent: int) -> str:
+    """Like ClosingQuotesFormatter."""
+    if "\n" not in string:
+        return string
+    good_end = f"{indent * ' '}{string[0] * 3}"
+    if not string.endswith("\n" + good_end):
+        return string[:-3] + "\n" + good_end
+    split_string = string.split("\n")
+    if len(split_string) == 2 and split_string[-1] == good_end:
+        return "\n".join(split_string[:-1]) + string[0] * 3
+    return string
+
+
+def _capitalize_first_letter(string: str) -> str:
+    """Like CapitalizeFirstLetterFormatter."""
+    if match := CapitalizeFirstLetterFormatter.first_letter_re.match(string):
+        first_letter = match.end() - 1
+        return (
+            string[:first_letter]
+            + string[first_letter].upper()
+            + string[first_letter + 1 :]
+        )
+    return string
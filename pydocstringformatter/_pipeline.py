@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tokenize
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from pydocstringformatter import _formatting, _utils
+from pydocstringformatter._formatting.fused import FusedDefaultFormatters, can_fuse
+from pydocstringformatter._utils.exceptions import UnstableResultError
+
+FUSED_FORMATTERS = "default formatters"
+"""What reports a change that was made by the fused default formatters."""
+
+
+class FrozenNamespace(argparse.Namespace):
+    """Namespace that can't be changed after it is created."""
+
+    # Options that the pipeline itself uses, the formatters use others as well
+    style: list[str]
+    stability_check: str
+    docstring_locator: str
+    docstring_memo_size: int
+    fused_pipeline: bool
+
+    def __init__(self, **kwargs: Any) -> None:  # pylint: disable=super-init-not-called
+        self.__dict__.update(kwargs)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"Can't set '{name}', the configuration is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Can't delete '{name}', the configuration is immutable")
+
+
+class FormattingPipeline:
+    """The enabled formatters of a configuration and how they are applied.
+
+    The pipeline owns copies of the formatters that are configured with a
+    frozen copy of its configuration. It can be reused to format any number
+    of sources without parsing the options again, and pipelines with
+    different configurations can be used by multiple threads at the same time.
+    """
+
+    def __init__(
+        self,
+        config: argparse.Namespace,
+        formatters: Iterable[_formatting.Formatter] | None = None,
+    ) -> None:
+        self.config = FrozenNamespace(**vars(config))
+        self.formatters: dict[str, _formatting.Formatter] = {}
+        """The enabled formatters, in the order they are applied."""
+        for formatter in _formatting.FORMATTERS if formatters is None else formatters:
+            if (
+                "default" in formatter.style
+                or any(i in formatter.style for i in self.config.style)
+            ) and getattr(self.config, formatter.name):
+                # A shallow copy like copy.copy, without the import of copy
+                own_formatter = object.__new__(type(formatter))
+                own_formatter.__dict__.update(vars(formatter))
+                own_formatter.set_config_namespace(self.config)
+                self.formatters[formatter.name] = own_formatter
+
+        self.fused: FusedDefaultFormatters | None = None
+        """Formats docstrings in one pass if only the default formatters are enabled."""
+        enabled = list(self.formatters.values())
+        if self.config.fused_pipeline and can_fuse(enabled):
+            self.fused = FusedDefaultFormatters(enabled)
+
+        self._docstring_memo: _utils.LRUMemo[tuple[str, int], tuple[str, set[str]]]
+        self._docstring_memo = _utils.LRUMemo(self.config.docstring_memo_size)
+
+    def locate_docstrings(
+        self, source: str, filename: Path, statistics: Counter[str]
+    ) -> list[tokenize.TokenInfo]:
+        """Find the docstrings in a source with the configured locator."""
+        try:
+            try:
+                return _utils.DOCSTRING_LOCATORS[self.config.docstring_locator](
+                    source
+                )
+            except _utils.UnsupportedSourceError:
+                statistics["docstring locator fallbacks"] += 1
+                return _utils.DOCSTRING_LOCATORS["tokenize"](source)
+        except tokenize.TokenError as exc:
+            raise _utils.ParsingError(
+                f"Can't parse {os.path.relpath(filename)}. Is it valid Python code?"
+            ) from exc
+
+    def format_docstrings(
+        self,
+        docstrings: list[tokenize.TokenInfo],
+        filename: Path,
+        statistics: Counter[str],
+    ) -> list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]]:
+        """Format docstring tokens and return the pairs of changed tokens.
+
+        The formatters only depend on the string and indentation of a docstring,
+        so the result for identical docstrings is looked up in a memo.
+        """
+        changed_docstrings: list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]] = []
+        for docstring in docstrings:
+            key = (docstring.string, docstring.start[1])
+            if memo := self._docstring_memo.get(key):
+                statistics["docstring memo hits"] += 1
+                new_string, _ = memo
+            else:
+                statistics["docstring memo misses"] += 1
+                new_docstring, changers = self.format_docstring(docstring, filename)
+                new_string = new_docstring.string
+                self._docstring_memo.put(key, (new_string, changers))
+
+            if new_string != docstring.string:
+                changed_docstrings.append(
+                    (docstring, docstring._replace(string=new_string))
+                )
+        return changed_docstrings
+
+    def format_docstring(
+        self, token: tokenize.TokenInfo, filename: Path
+    ) -> tuple[tokenize.TokenInfo, set[str]]:
+        """Format a docstring token and check that the result is stable.
+
+        token: Docstring token to format.
+        filename: Name of the file the token is from.
+
+        Returns:
+            A tuple containing [1] the formatted token and [2] a set
+            of formatters that changed the token.
+
+        Raises:
+            UnstableResultError::
+                If the formatters are not able to get to a stable result.
+                It reports what formatters are still modifying the token.
+        """
+        new_token, changers, last_changers = self.apply_formatters(token)
+        if not self._needs_stability_check(last_changers):
+            return new_token, changers
+
+        # Run formatters again (3rd time) to check if the result is stable
+        _, unstable_changers = self._apply_formatters_once(new_token)
+
+        if unstable_changers:
+            if self.fused:
+                # Report the formatters that are responsible, not the fused pass
+                _, unstable_changers = self._apply_formatters_in_turn(new_token)
+            conflicting_formatters = {
+                k: v for k, v in self.formatters.items() if k in unstable_changers
+            }
+            template = _utils.create_gh_issue_template(
+                new_token, conflicting_formatters, str(filename)
+            )
+
+            raise UnstableResultError(template)
+
+        return new_token, changers
+
+    def apply_formatters(
+        self, token: tokenize.TokenInfo
+    ) -> tuple[tokenize.TokenInfo, set[str], set[str]]:
+        """Apply the formatters twice to a token.
+
+        Returns:
+            A tuple containing [1] the formatted token, [2] a set of formatters
+            that changed the token and [3] a set of formatters that changed the
+            token in the last pass.
+        """
+        token, changers = self._apply_formatters_once(token)
+        if not changers:
+            return token, changers, set()
+        token, last_changers = self._apply_formatters_once(token)
+        return token, changers | last_changers, last_changers
+
+    def _needs_stability_check(self, last_changers: set[str]) -> bool:
+        """Check if the formatters should be run again to check the result is stable.
+
+        Deterministic formatters can't change a token that the last pass didn't
+        change, so the check is only needed if the last pass changed it.
+        """
+        if self.config.stability_check == "never":
+            return False
+        if self.config.stability_check == "always" or not all(
+            formatter.deterministic for formatter in self.formatters.values()
+        ):
+            return True
+        return bool(last_changers)
+
+    def _apply_formatters_once(
+        self, token: tokenize.TokenInfo
+    ) -> tuple[tokenize.TokenInfo, set[str]]:
+        """Applies formatters to a token and keeps track of what changes it.
+
+        token: Token to apply formatters to
+
+        Returns:
+            A tuple containing [1] the formatted token and [2] a set
+            of formatters that changed the token.
+        """
+        if self.fused:
+            indent = token.start[1]
+            if (string := self.fused.format(token.string, indent)) != token.string:
+                return token._replace(string=string), {FUSED_FORMATTERS}
+            return token, set()
+        return self._apply_formatters_in_turn(token)
+
+    def _apply_formatters_in_turn(
+        self, token: tokenize.TokenInfo
+    ) -> tuple[tokenize.TokenInfo, set[str]]:
+        """Applies the formatters one after the other to a token.
+
+        The formatters share the docstring, so its parts are only parsed again
+        after a formatter changed it.
+        """
+        docstring = _formatting.Docstring(token)
+        changers: set[str] = set()
+        for formatter_name, formatter in self.formatters.items():
+            changes = docstring.changes
+            formatter.treat_docstring(docstring)
+            if docstring.changes != changes:
+                changers.add(formatter_name)
+
+        return docstring.token, changers
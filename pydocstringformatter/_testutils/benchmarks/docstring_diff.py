@@ -0,0 +1,103 @@
+"""Benchmark the diff of the changed docstrings against the diff of whole files.
+
+The sources are joined into large files, as those are the ones for which
+comparing all lines is slow.
+
+Usage: python -m pydocstringformatter._testutils.benchmarks.docstring_diff
+[--repeat N] [--lines N] [PATH ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+import tokenize
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from pydocstringformatter._api import FormatConfig
+from pydocstringformatter._pipeline import FormattingPipeline
+from pydocstringformatter._testutils.benchmarks.docstring_locators import (
+    DEFAULT_PATHS,
+    read_sources,
+)
+from pydocstringformatter._utils import (
+    generate_diff,
+    generate_docstrings_diff,
+    splice_docstrings,
+)
+
+Docstrings = list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]]
+
+
+def join_sources(sources: list[str], lines: int) -> list[str]:
+    """Join the sources into files of at least the given number of lines."""
+    files: list[str] = []
+    current: list[str] = []
+    length = 0
+    for source in sources:
+        current.append(source)
+        length += source.count("\n")
+        if length >= lines:
+            files.append("\n".join(current))
+            current, length = [], 0
+    if current:
+        files.append("\n".join(current))
+    return files
+
+
+def run_benchmark() -> None:
+    """Time the diffs of the same formatted files."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lines", type=int, default=20000)
+    args = parser.parse_args()
+
+    pipeline = FormattingPipeline(FormatConfig().to_namespace())
+    files: list[tuple[str, Docstrings]] = []
+    for source in join_sources(read_sources(args.paths), args.lines):
+        statistics: Counter[str] = Counter()
+        try:
+            docstrings = pipeline.format_docstrings(
+                pipeline.locate_docstrings(source, Path("file.py"), statistics),
+                Path("file.py"),
+                statistics,
+            )
+        except IndexError:  # Empty docstrings, which the formatters can't handle
+            continue
+        if docstrings:
+            files.append((source, docstrings))
+    print(f"{len(files)} files, {sum(len(f[1]) for f in files)} changed docstrings")
+
+    diffs: dict[str, Callable[[str, Docstrings], str]] = {
+        "difflib": lambda source, docstrings: generate_diff(
+            source, splice_docstrings(source, docstrings), "file.py"
+        ),
+        "docstrings": lambda source, docstrings: generate_docstrings_diff(
+            source, docstrings, "file.py"
+        ),
+    }
+    for source, docstrings in files:
+        assert diffs["difflib"](source, docstrings) == diffs["docstrings"](
+            source, docstrings
+        )
+
+    timings: dict[str, float] = {}
+    for name, diff in diffs.items():
+        best = math.inf
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for source, docstrings in files:
+                diff(source, docstrings)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"{name:>10}: {best * 1000:8.1f} ms")
+
+    print(f"docstrings is {timings['difflib'] / timings['docstrings']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    run_benchmark()
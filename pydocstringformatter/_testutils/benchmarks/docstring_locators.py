@@ -0,0 +1,72 @@
+"""Benchmark the engines that find the docstrings in a source.
+
+Usage: python -m pydocstringformatter._testutils.benchmarks.docstring_locators
+[--repeat N] [PATH ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+import tokenize
+from pathlib import Path
+
+from pydocstringformatter._utils import (
+    DOCSTRING_LOCATORS,
+    UnsupportedSourceError,
+    find_python_files,
+)
+
+DEFAULT_PATHS = [str(Path(__file__).parent.parent.parent)]
+"""By default the sources of the program itself are used."""
+
+
+def read_sources(paths: list[str]) -> list[str]:
+    """Read all Python files that can be tokenized."""
+    sources: list[str] = []
+    for filename in find_python_files(paths, []):
+        try:
+            with tokenize.open(filename) as file:
+                source = file.read()
+            DOCSTRING_LOCATORS["tokenize"](source)
+        except (SyntaxError, UnicodeDecodeError, tokenize.TokenError):
+            continue
+        sources.append(source)
+    return sources
+
+
+def run_benchmark() -> None:
+    """Time each docstring locator over the same sources."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sources = read_sources(args.paths)
+    size = sum(len(source) for source in sources)
+    print(f"{len(sources)} files, {size / 1_000_000:.1f} million characters")
+
+    timings: dict[str, float] = {}
+    for name, locator in DOCSTRING_LOCATORS.items():
+        fallbacks = 0
+        best = math.inf
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for source in sources:
+                try:
+                    locator(source)
+                except UnsupportedSourceError:
+                    fallbacks += 1
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(
+            f"{name:>10}: {best * 1000:8.1f} ms "
+            f"({fallbacks // args.repeat} unsupported files)"
+        )
+
+    print(f"scanner is {timings['tokenize'] / timings['scanner']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    run_benchmark()
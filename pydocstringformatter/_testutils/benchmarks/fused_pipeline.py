@@ -0,0 +1,63 @@
+"""Benchmark the fused default formatters against applying them in turn.
+
+Usage: python -m pydocstringformatter._testutils.benchmarks.fused_pipeline
+[--repeat N] [PATH ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+import tokenize
+
+from pydocstringformatter._api import FormatConfig
+from pydocstringformatter._pipeline import FormattingPipeline
+from pydocstringformatter._testutils.benchmarks.docstring_locators import (
+    DEFAULT_PATHS,
+    read_sources,
+)
+from pydocstringformatter._utils import DOCSTRING_LOCATORS
+
+
+def run_benchmark() -> None:
+    """Time one pass of the default formatters over the same docstrings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pipelines = {
+        "in turn": FormattingPipeline(
+            FormatConfig(fused_pipeline=False).to_namespace()
+        ),
+        "fused": FormattingPipeline(FormatConfig().to_namespace()),
+    }
+    docstrings: list[tokenize.TokenInfo] = []
+    for source in read_sources(args.paths):
+        for docstring in DOCSTRING_LOCATORS["tokenize"](source):
+            try:
+                # pylint: disable-next=protected-access
+                pipelines["in turn"]._apply_formatters_once(docstring)
+            except IndexError:  # Empty docstrings, which the formatters can't handle
+                continue
+            docstrings.append(docstring)
+    print(f"{len(docstrings)} docstrings")
+
+    timings: dict[str, float] = {}
+    for name, pipeline in pipelines.items():
+        best = math.inf
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for docstring in docstrings:
+                # pylint: disable-next=protected-access
+                pipeline._apply_formatters_once(docstring)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"{name:>10}: {best * 1000:8.1f} ms")
+
+    print(f"fused is {timings['in turn'] / timings['fused']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,130 @@
+"""Benchmark the time it takes to start and format a single correct file.
+
+The import time of pydocstringformatter.run is taken from python -X importtime
+and the run time is the wall time of a run, minus the time it takes to start
+the interpreter. Like in an installed package the modules are imported from
+cached bytecode, which is written to a temporary directory.
+
+Both are reported relative to the time it takes to start the interpreter, which
+is measured on the same machine, so the limits don't depend on its speed. There
+are no limits by default, test_lazy_imports is what keeps the startup fast.
+Exits with 1 if a time is above its limit.
+
+Usage: python -m pydocstringformatter._testutils.benchmarks.startup
+[--repeat N] [--max-import-factor FACTOR] [--max-run-factor FACTOR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+LAZY_MODULES = (
+    "ast",
+    "asyncio",
+    "concurrent.futures",
+    "copy",
+    "dataclasses",
+    "difflib",
+    "hashlib",
+    "http.client",
+    "importlib",
+    "json",
+    "sqlite3",
+    "subprocess",
+    "tempfile",
+    "textwrap",
+    "tomllib",
+    "pydocstringformatter._api",
+    "pydocstringformatter._async_api",
+    "pydocstringformatter._caching.directory_cache",
+    "pydocstringformatter._caching.http_cache",
+    "pydocstringformatter._caching.sqlite_cache",
+    "pydocstringformatter._utils.changed_lines",
+    "pydocstringformatter._utils.file_diference",
+    "pydocstringformatter._utils.issue_template",
+)
+"""Modules that are only imported when they are used, not when the program starts."""
+
+
+def get_import_time(env: dict[str, str]) -> float:
+    """Get the import time of pydocstringformatter.run in seconds."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import pydocstringformatter.run"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == "pydocstringformatter.run":
+            return int(cumulative) / 1_000_000
+    raise RuntimeError("Can't find pydocstringformatter.run in the import times")
+
+
+def get_wall_time(args: list[str], env: dict[str, str]) -> float:
+    """Get the wall time of running the interpreter with arguments in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], capture_output=True, check=True, env=env)
+    return time.perf_counter() - start
+
+
+def time_startup(repeat: int) -> tuple[float, float, float]:
+    """Get the import, run and interpreter startup times in seconds."""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "file.py")
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write('"""A correct docstring."""\n')
+        run = ["-m", "pydocstringformatter", filename, "--no-cache"]
+        env = {
+            name: value
+            for name, value in os.environ.items()
+            if name != "PYTHONDONTWRITEBYTECODE"
+        }
+        env["PYTHONPYCACHEPREFIX"] = os.path.join(directory, "pycache")
+        # Write the bytecode before anything is timed
+        get_wall_time(run, env)
+
+        import_time = run_time = interpreter_time = math.inf
+        for _ in range(repeat):
+            import_time = min(import_time, get_import_time(env))
+            run_time = min(run_time, get_wall_time(run, env))
+            interpreter_time = min(interpreter_time, get_wall_time(["-c", "pass"], env))
+    return import_time, run_time - interpreter_time, interpreter_time
+
+
+def run_benchmark() -> None:
+    """Time the import and a run that formats a single correct file."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-import-factor", type=float, default=math.inf)
+    parser.add_argument("--max-run-factor", type=float, default=math.inf)
+    args = parser.parse_args()
+    import_time, run_time, interpreter_time = time_startup(args.repeat)
+
+    print(f"interpreter: {interpreter_time * 1000:8.1f} ms")
+    failed = False
+    for name, timing, limit in (
+        ("import", import_time, args.max_import_factor),
+        ("run", run_time, args.max_run_factor),
+    ):
+        factor = timing / interpreter_time
+        limit_text = f" (limit {limit:.2f})" if limit < math.inf else ""
+        print(
+            f"{name:>11}: {timing * 1000:8.1f} ms, "
+            f"{factor:.2f} times the interpreter{limit_text}"
+        )
+        failed = failed or factor > limit
+    if failed:
+        print("Startup is slower than the limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmark()
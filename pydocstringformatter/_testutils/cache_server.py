@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import contextlib
+import http.server
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+
+
+class CacheRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler that implements the protocol of the 'http' cache backend."""
+
+    server: CacheServer
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Check if a key is known."""
+        with self.server.lock:
+            if self.path in self.server.entries:
+                self.server.entries.move_to_end(self.path)
+                self._respond(200)
+            else:
+                self._respond(404)
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Store a key and evict the least recently used keys."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.entries[self.path] = None
+            self.server.entries.move_to_end(self.path)
+            while len(self.server.entries) > self.server.max_entries:
+                self.server.entries.popitem(last=False)
+        self._respond(204)
+
+    def do_DELETE(self) -> None:  # pylint: disable=invalid-name
+        """Remove all keys."""
+        with self.server.lock:
+            self.server.entries.clear()
+        self._respond(204)
+
+    def log_message(self, *args: object) -> None:
+        """Don't log requests."""
+
+
+class CacheServer(http.server.ThreadingHTTPServer):
+    """A stand-in for a server that shares a cache between machines."""
+
+    def __init__(self, address: tuple[str, int], max_entries: int) -> None:
+        super().__init__(address, CacheRequestHandler)
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, None] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The url to pass to the --cache-url option."""
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/cache"
+
+
+@contextlib.contextmanager
+def serve_cache(max_entries: int = 100_000) -> Iterator[CacheServer]:
+    """Run a cache server on a free local port in a background thread."""
+    server = CacheServer(("127.0.0.1", 0), max_entries)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
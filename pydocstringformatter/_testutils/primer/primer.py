@@ -49,7 +49,7 @@ def run_step_one() -> None:
     """
     for package in PACKAGES.values():
         subprocess.run(
-            [sys.executable, "-m", "pydocstringformatter", "-w"]
+            [sys.executable, "-m", "pydocstringformatter", "-w", "--no-cache"]
             + package.paths_to_lint
             + package.arguments,
             cwd=Path(__file__).parent.parent.parent,
@@ -71,7 +71,7 @@ def run_step_two() -> None:
 
     for name, package in PACKAGES.items():
         process = subprocess.run(
-            [sys.executable, "-m", "pydocstringformatter"]
+            [sys.executable, "-m", "pydocstringformatter", "--no-cache"]
             + package.paths_to_lint
             + package.arguments,
             cwd=Path(__file__).parent.parent.parent,
@@ -1,25 +1,115 @@
+from typing import TYPE_CHECKING
+
+from pydocstringformatter._utils.docstring_scanner import UnsupportedSourceError
 from pydocstringformatter._utils.exceptions import (
+    GitError,
     ParsingError,
     PydocstringFormatterError,
     TomlParsingError,
     UnstableResultError,
 )
-from pydocstringformatter._utils.file_diference import compare_formatters, generate_diff
-from pydocstringformatter._utils.find_docstrings import is_docstring
-from pydocstringformatter._utils.find_python_file import find_python_files
-from pydocstringformatter._utils.issue_template import create_gh_issue_template
-from pydocstringformatter._utils.output import print_to_console, sys_exit
+from pydocstringformatter._utils.find_docstrings import (
+    DOCSTRING_LOCATORS,
+    find_docstrings,
+    is_docstring,
+)
+from pydocstringformatter._utils.find_python_file import (
+    ExcludeMatcher,
+    find_python_files,
+    is_excluded,
+    iter_python_files,
+    select_python_files,
+)
+from pydocstringformatter._utils.lazy_attributes import make_lazy_getattr
+from pydocstringformatter._utils.lru_memo import LRUMemo
+from pydocstringformatter._utils.output import (
+    encode_string,
+    format_statistics,
+    print_to_console,
+    sys_exit,
+)
+from pydocstringformatter._utils.output_sink import (
+    OrderedOutput,
+    OutputChunk,
+    OutputSink,
+)
+from pydocstringformatter._utils.prefilter import get_skip_reason
+from pydocstringformatter._utils.source_files import (
+    Newlines,
+    SourceBytes,
+    decode_source,
+    encode_source,
+    read_source,
+    sync_directories,
+    write_source,
+)
+from pydocstringformatter._utils.splice_docstrings import splice_docstrings
+
+if TYPE_CHECKING:
+    from pydocstringformatter._utils.changed_lines import (
+        LineRanges,
+        get_changed_lines,
+        select_changed_docstrings,
+    )
+    from pydocstringformatter._utils.file_diference import (
+        compare_formatters,
+        generate_diff,
+        generate_docstrings_diff,
+    )
+    from pydocstringformatter._utils.issue_template import create_gh_issue_template
+
+# The helpers for diffs, git and unstable results are imported when they are
+# first used, as many runs don't need them
+_LAZY_ATTRIBUTES = {
+    "LineRanges": "pydocstringformatter._utils.changed_lines",
+    "get_changed_lines": "pydocstringformatter._utils.changed_lines",
+    "select_changed_docstrings": "pydocstringformatter._utils.changed_lines",
+    "compare_formatters": "pydocstringformatter._utils.file_diference",
+    "generate_diff": "pydocstringformatter._utils.file_diference",
+    "generate_docstrings_diff": "pydocstringformatter._utils.file_diference",
+    "create_gh_issue_template": "pydocstringformatter._utils.issue_template",
+}
+__getattr__ = make_lazy_getattr(_LAZY_ATTRIBUTES, __name__)
+
 
 __all__ = [
+    "DOCSTRING_LOCATORS",
+    "ExcludeMatcher",
+    "find_docstrings",
     "find_python_files",
     "compare_formatters",
+    "decode_source",
+    "encode_source",
+    "encode_string",
     "generate_diff",
+    "generate_docstrings_diff",
+    "get_changed_lines",
+    "get_skip_reason",
     "is_docstring",
+    "is_excluded",
+    "iter_python_files",
+    "LineRanges",
+    "GitError",
+    "LRUMemo",
+    "make_lazy_getattr",
+    "Newlines",
+    "OrderedOutput",
+    "OutputChunk",
+    "OutputSink",
     "ParsingError",
     "PydocstringFormatterError",
     "TomlParsingError",
     "UnstableResultError",
+    "UnsupportedSourceError",
     "create_gh_issue_template",
+    "format_statistics",
     "print_to_console",
+    "read_source",
+    "select_changed_docstrings",
+    "select_python_files",
+    "SourceBytes",
+    "splice_docstrings",
+    "sync_directories",
     "sys_exit",
+    "write_source",
 ]
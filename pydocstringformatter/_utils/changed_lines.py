@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import bisect
+import codecs
+import os
+import re
+import tokenize
+from pathlib import Path
+
+from pydocstringformatter._utils.exceptions import GitError
+
+LineRanges = list[tuple[int, int]]
+"""Sorted ranges of changed lines as (first, last) line numbers."""
+
+_HUNK_HEADER = re.compile(r"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def run_git(args: list[str], cwd: str | Path | None = None) -> str:
+    """Run a git command and return its output."""
+    # pylint: disable-next=import-outside-toplevel
+    import subprocess
+
+    try:
+        process = subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, check=True
+        )
+    except FileNotFoundError as exc:
+        raise GitError("Can't find git. Is it installed?") from exc
+    except subprocess.CalledProcessError as exc:
+        error = exc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(f"Running 'git {' '.join(args)}' failed: {error}") from exc
+    return process.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def _unquote_path(path: str) -> str:
+    """Undo the C-style quoting git uses for paths with special characters."""
+    if not path.startswith('"'):
+        return path
+    unquoted: bytes = codecs.escape_decode(path[1:-1].encode("utf-8"))[0]
+    return unquoted.decode("utf-8", errors="surrogateescape")
+
+
+def _parse_diff(diff: str, root: Path) -> dict[Path, LineRanges | None]:
+    """Get the changed lines of each file in a diff without context lines."""
+    changed_lines: dict[Path, LineRanges | None] = {}
+    ranges: LineRanges = []
+    remaining_lines = 0
+
+    for line in diff.splitlines():
+        if remaining_lines and line.startswith(("-", "+")):
+            # Removed or added lines can look like headers, so skip them
+            remaining_lines -= 1
+        elif line.startswith("+++ "):
+            # Git ends paths with spaces with a tab, other special characters
+            # are quoted, so a tab at the end is never part of the path
+            path = _unquote_path(line[4:].removesuffix("\t")).removeprefix("b/")
+            ranges = []
+            changed_lines[root / path] = ranges
+        elif match := _HUNK_HEADER.match(line):
+            old_count, start, count = match.groups()
+            old_count = int(old_count or 1)
+            count = int(count or 1)
+            remaining_lines = old_count + count
+            if count:
+                ranges.append((int(start), int(start) + count - 1))
+            else:
+                # Lines were removed between these lines
+                ranges.append((int(start), int(start) + 1))
+
+    return changed_lines
+
+
+def get_changed_lines(revision: str) -> dict[Path, LineRanges | None]:
+    """Find the lines that changed in the working tree since a git revision.
+
+    Returns:
+        A dict with the resolved path of every changed file and its changed
+        lines. Untracked files have None as all of their lines are new.
+    """
+    root = Path(run_git(["rev-parse", "--show-toplevel"]).rstrip("\n"))
+    diff = run_git(
+        [
+            "diff",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            "--diff-filter=d",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            revision,
+            "--",
+        ],
+        cwd=root,
+    )
+    changed_lines = _parse_diff(diff, root)
+
+    untracked = run_git(["ls-files", "--others", "--exclude-standard", "-z"], cwd=root)
+    for filename in untracked.split("\0"):
+        if filename:
+            changed_lines[root / filename] = None
+
+    return {
+        Path(os.path.realpath(path)): lines for path, lines in changed_lines.items()
+    }
+
+
+def select_changed_docstrings(
+    docstrings: list[tokenize.TokenInfo], line_ranges: LineRanges
+) -> list[tokenize.TokenInfo]:
+    """Select the docstrings that overlap with any of the line ranges."""
+    merged_ranges: LineRanges = []
+    for start, end in sorted(line_ranges):
+        if merged_ranges and start <= merged_ranges[-1][1] + 1:
+            merged_ranges[-1] = (merged_ranges[-1][0], max(end, merged_ranges[-1][1]))
+        else:
+            merged_ranges.append((start, end))
+    starts = [start for start, _ in merged_ranges]
+
+    selected: list[tokenize.TokenInfo] = []
+    for docstring in docstrings:
+        # The ranges don't overlap, so only the last range that starts
+        # before the end of the docstring can overlap with it
+        index = bisect.bisect_right(starts, docstring.end[0]) - 1
+        if index >= 0 and merged_ranges[index][1] >= docstring.start[0]:
+            selected.append(docstring)
+    return selected
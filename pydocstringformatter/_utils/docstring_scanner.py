@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import re
+import sys
+import token
+import tokenize
+from typing import Final
+
+_EVENTS: Final = re.compile(r"""[#'"\\\n()\[\]{}]""")
+"""Characters that can change the state of the scanner."""
+
+_FSTRING_EVENTS: Final = re.compile(r"""[\\{}'"\n]""")
+_FIELD_EVENTS: Final = re.compile(r"""[\\{}()\[\]'"#:!\n]""")
+_FORMAT_SPEC_EVENTS: Final = re.compile(r"""[\\{}'"\n]""")
+
+_STRING_ENDS: Final = {
+    "'": re.compile(r"[^'\\\n]*(?:\\.[^'\\\n]*)*'", re.DOTALL),
+    '"': re.compile(r'[^"\\\n]*(?:\\.[^"\\\n]*)*"', re.DOTALL),
+    "'''": re.compile(r"[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''", re.DOTALL),
+    '"""': re.compile(r'[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*"""', re.DOTALL),
+}
+"""Patterns that match the rest of a string after its opening quotes."""
+
+_TOKENIZE_FSTRINGS: Final = sys.version_info >= (3, 12)
+"""Since PEP 701 f-strings can contain nested strings with the same quotes."""
+
+_STRING_PREFIXES: Final = frozenset(
+    {"", "r", "u", "b", "f", "t", "br", "rb", "fr", "rf", "tr", "rt"}
+)
+
+# Kinds of the token before the current position, named after the tokens
+# that tokenize would have generated.
+_START = "start"
+_NEWLINE = "newline"
+_NL = "nl"
+_INDENT = "indent"
+_DEDENT = "dedent"
+_OTHER = "other"
+
+
+class UnsupportedSourceError(Exception):
+    """Raised when the scanner can't reliably find the docstrings of a source."""
+
+
+def _is_identifier_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class DocstringScanner:
+    """Find docstrings without tokenizing the full source.
+
+    The scanner only tracks strings, comments, brackets, line continuations
+    and indentation. That is enough to find the same docstrings as
+    tokenize and is_docstring would, at their exact positions.
+
+    Whenever the scanner encounters code it doesn't fully understand it
+    raises UnsupportedSourceError, so that tokenize can be used instead.
+    """
+
+    def __init__(self, source: str) -> None:
+        if "\r" in source or "\0" in source:
+            raise UnsupportedSourceError("Source without universal newlines")
+        self.source = source
+
+        self._depth = 0
+        """Depth of the brackets we are in."""
+        self._indents = [0]
+        self._previous = _START
+        """Kind of the previous token."""
+        self._line_has_content = False
+        """Whether the current logical line has any tokens."""
+
+        self._row = 1
+        self._row_offset = 0
+        """Offset in the source up to which rows have been counted."""
+
+    def scan(self) -> list[tokenize.TokenInfo]:
+        """Return the docstrings of the source as tokens."""
+        source = self.source
+        docstrings: list[tokenize.TokenInfo] = []
+        pos = 0
+
+        while match := _EVENTS.search(source, pos):
+            index = match.start()
+            if (char := source[index]) in "'\"":
+                pos = self._handle_string(pos, index, docstrings)
+            else:
+                self._handle_code(pos, index)
+                pos = self._handle_event(char, index)
+
+        if self._depth:
+            raise UnsupportedSourceError("End of file in multi-line statement")
+        return docstrings
+
+    def _handle_string(
+        self, pos: int, quote_pos: int, docstrings: list[tokenize.TokenInfo]
+    ) -> int:
+        """Handle the string with its opening quotes here and return its end."""
+        string_start = self._get_string_start(quote_pos)
+        self._handle_code(pos, string_start)
+        previous = self._begin_token(string_start)
+        end = self._skip_string(string_start, quote_pos)
+        if string_start == quote_pos and self._is_docstring_position(
+            previous, string_start
+        ):
+            docstrings.append(self._create_token(string_start, end))
+        return end
+
+    def _handle_event(self, char: str, index: int) -> int:
+        """Handle a newline, comment, backslash or bracket and return its end."""
+        source = self.source
+        if char == "\n":
+            if self._line_has_content and not self._depth:
+                self._previous = _NEWLINE
+                self._line_has_content = False
+            else:
+                self._previous = _NL
+            return index + 1
+
+        if char == "#":
+            if (end := source.find("\n", index)) == -1:
+                return len(source)
+            return end
+
+        if char == "\\":
+            if not source.startswith("\n", index + 1) or not (
+                self._line_has_content or self._depth
+            ):
+                raise UnsupportedSourceError("Unexpected backslash")
+            return index + 2
+
+        self._begin_token(index)
+        self._depth += 1 if char in "([{" else -1
+        if self._depth < 0:
+            raise UnsupportedSourceError("Unmatched closing bracket")
+        return index + 1
+
+    def _handle_code(self, start: int, end: int) -> None:
+        """Register the code between two events, if there is any."""
+        code = self.source[start:end]
+        if stripped := code.lstrip(" \t\f"):
+            self._begin_token(end - len(stripped))
+
+    def _begin_token(self, pos: int) -> str:
+        """Register the start of a token and return the kind of the token before it.
+
+        The first token of a logical line can be preceded by an INDENT or
+        DEDENT token, depending on its indentation.
+        """
+        previous = self._previous
+        if not (self._line_has_content or self._depth):
+            line_start = self.source.rfind("\n", 0, pos) + 1
+            indentation = self.source[line_start:pos]
+            if "\f" in indentation or "\t" in indentation and " " in indentation:
+                raise UnsupportedSourceError("Mixed indentation")
+
+            column = len(indentation.expandtabs(8))
+            if column > self._indents[-1]:
+                self._indents.append(column)
+                previous = _INDENT
+            elif column < self._indents[-1]:
+                while column < self._indents[-1]:
+                    self._indents.pop()
+                if column != self._indents[-1]:
+                    raise UnsupportedSourceError("Inconsistent dedent")
+                previous = _DEDENT
+
+        self._line_has_content = True
+        self._previous = _OTHER
+        return previous
+
+    def _is_docstring_position(self, previous: str, pos: int) -> bool:
+        """Check if a string without prefix at this position is a docstring.
+
+        This mirrors is_docstring for the token that tokenize would create.
+        """
+        if previous in {_START, _NEWLINE, _INDENT}:
+            return True
+        return previous == _NL and (pos == 0 or self.source[pos - 1] == "\n")
+
+    def _get_string_start(self, quote_pos: int) -> int:
+        """Return the start of the string that has its opening quotes here."""
+        start = quote_pos
+        while start and _is_identifier_char(self.source[start - 1]):
+            start -= 1
+        if self.source[start:quote_pos].lower() in _STRING_PREFIXES:
+            return start
+        # The characters before the quotes are a name, not a prefix
+        return quote_pos
+
+    def _get_quotes(self, quote_pos: int) -> str:
+        quote = self.source[quote_pos]
+        if self.source.startswith(quote * 3, quote_pos):
+            return quote * 3
+        return quote
+
+    def _skip_string(self, string_start: int, quote_pos: int) -> int:
+        """Return the end of the string that starts at the given position."""
+        quotes = self._get_quotes(quote_pos)
+        prefix = self.source[string_start:quote_pos].lower()
+        if _TOKENIZE_FSTRINGS and ("f" in prefix or "t" in prefix):
+            return self._skip_fstring(quote_pos + len(quotes), quotes)
+
+        if not (
+            match := _STRING_ENDS[quotes].match(self.source, quote_pos + len(quotes))
+        ):
+            raise UnsupportedSourceError("Unterminated string")
+        return match.end()
+
+    def _skip_nested_string(self, quote_pos: int) -> int:
+        """Skip a string inside a replacement field of an f-string."""
+        return self._skip_string(self._get_string_start(quote_pos), quote_pos)
+
+    def _skip_fstring(self, pos: int, quotes: str) -> int:
+        """Return the end of an f-string, starting after its opening quotes."""
+        source = self.source
+        while match := _FSTRING_EVENTS.search(source, pos):
+            index = match.start()
+            char = source[index]
+            if char == "\\":
+                if source[index + 1] in "{}N":
+                    raise UnsupportedSourceError("Escaped brace in f-string")
+                pos = index + 2
+            elif char == "\n":
+                if len(quotes) == 1:
+                    raise UnsupportedSourceError("Unterminated f-string")
+                pos = index + 1
+            elif char in "'\"":
+                if source.startswith(quotes, index):
+                    return index + len(quotes)
+                pos = index + 1
+            elif source.startswith(char * 2, index):
+                # Escaped brace
+                pos = index + 2
+            elif char == "{":
+                pos = self._skip_replacement_field(index + 1, quotes)
+            else:
+                raise UnsupportedSourceError("Single closing brace in f-string")
+        raise UnsupportedSourceError("Unterminated f-string")
+
+    def _skip_replacement_field(self, pos: int, quotes: str) -> int:
+        """Return the end of a replacement field, starting after its brace."""
+        source = self.source
+        depth = 0
+        while match := _FIELD_EVENTS.search(source, pos):
+            index = match.start()
+            char = source[index]
+            pos = index + 1
+            if char in "([{":
+                depth += 1
+            elif char in ")]}" and depth:
+                depth -= 1
+            elif char == "}":
+                return pos
+            elif char in "'\"":
+                pos = self._skip_nested_string(index)
+            elif char == "!" and source.startswith("!=", index):
+                pos = index + 2
+            elif char == ":" and not depth:
+                return self._skip_format_spec(pos, quotes)
+            elif char not in "!:":
+                raise UnsupportedSourceError("Complex replacement field in f-string")
+        raise UnsupportedSourceError("Unterminated f-string")
+
+    def _skip_format_spec(self, pos: int, quotes: str) -> int:
+        """Return the end of a replacement field, starting in its format spec."""
+        source = self.source
+        while match := _FORMAT_SPEC_EVENTS.search(source, pos):
+            index = match.start()
+            char = source[index]
+            pos = index + 1
+            if char == "}":
+                return pos
+            if char == "{" and not source.startswith("{{", index):
+                pos = self._skip_replacement_field(pos, quotes)
+            elif char not in "'\"" or source.startswith(quotes, index):
+                raise UnsupportedSourceError("Complex format spec in f-string")
+        raise UnsupportedSourceError("Unterminated f-string")
+
+    def _get_position(self, offset: int) -> tuple[int, int]:
+        """Convert an offset to a (row, column) position like tokenize uses."""
+        self._row += self.source.count("\n", self._row_offset, offset)
+        self._row_offset = offset
+        return self._row, offset - (self.source.rfind("\n", 0, offset) + 1)
+
+    def _create_token(self, start: int, end: int) -> tokenize.TokenInfo:
+        """Create the token tokenize would have created for a string."""
+        line_start = self.source.rfind("\n", 0, start) + 1
+        if (line_end := self.source.find("\n", end)) == -1:
+            line_end = len(self.source)
+        else:
+            line_end += 1
+        return tokenize.TokenInfo(
+            token.STRING,
+            self.source[start:end],
+            self._get_position(start),
+            self._get_position(end),
+            self.source[line_start:line_end],
+        )
+
+
+def scan_docstrings(source: str) -> list[tokenize.TokenInfo]:
+    """Find the docstrings of a source with the DocstringScanner."""
+    return DocstringScanner(source).scan()
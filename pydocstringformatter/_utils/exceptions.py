@@ -16,3 +16,7 @@ class TomlParsingError(PydocstringFormatterError):
 
 class UnstableResultError(PydocstringFormatterError):
     """Raised when the result of the formatting is unstable."""
+
+
+class GitError(PydocstringFormatterError):
+    """Raised when the information we need can't be retrieved from git."""
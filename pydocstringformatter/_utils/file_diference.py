@@ -1,11 +1,41 @@
-import difflib
+from __future__ import annotations
+
 import tokenize
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
 
 from pydocstringformatter._formatting import Formatter
+from pydocstringformatter._utils.splice_docstrings import splice_docstrings
+
+CONTEXT_LINES = 3
+"""Number of unchanged lines around the changes in a diff."""
+
+
+class _Opcode(NamedTuple):
+    """An opcode like those of difflib.SequenceMatcher and the lines it inserts."""
+
+    tag: str
+    i1: int
+    i2: int
+    j1: int
+    j2: int
+    new_lines: list[str]
+
+
+class _Span(NamedTuple):
+    """Lines of a source that are replaced by new lines."""
+
+    start: int
+    end: int
+    new_lines: list[str]
 
 
 def generate_diff(old: str, new: str, filename: str) -> str:
     """Generate a printable diff for two strings of sourcecode."""
+    # pylint: disable-next=import-outside-toplevel
+    import difflib
+
     return (
         "\n".join(
             difflib.unified_diff(
@@ -20,6 +50,364 @@ def generate_diff(old: str, new: str, filename: str) -> str:
     )
 
 
+def generate_docstrings_diff(
+    source: str,
+    docstrings: list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]],
+    filename: str,
+) -> str:
+    """Generate the diff of replacing docstrings in the source they are from.
+
+    source: The source code the tokens were created from.
+    docstrings: Pairs of original and formatted docstring tokens, in the order
+        they appear in the source.
+
+    The diff is the one generate_diff creates for the source with the docstrings
+    spliced in, but only the lines around the docstrings are compared.
+    """
+    old_lines = source.split("\n")
+    spans = list(_get_spans(old_lines, docstrings))
+    popular = _get_popular_lines(old_lines, spans)
+
+    opcodes: list[_Opcode] = []
+    offset = copied_until = 0
+    for window in _get_windows(old_lines, spans, popular):
+        new_lines = _get_window_lines(old_lines, window)
+        window_opcodes = list(
+            _diff_lines(
+                old_lines[window.start : window.end],
+                new_lines,
+                window.start,
+                window.start + offset,
+                popular,
+            )
+        )
+        # Without a match for the lines around its spans, difflib could have
+        # matched the lines of a window with lines outside of it
+        if not _matches_context(window, window_opcodes):
+            return generate_diff(
+                source, splice_docstrings(source, docstrings), filename
+            )
+
+        opcodes.append(
+            _Opcode(
+                "equal",
+                copied_until,
+                window.start,
+                copied_until + offset,
+                window.start + offset,
+                [],
+            )
+        )
+        opcodes.extend(window_opcodes)
+        offset += len(new_lines) - (window.end - window.start)
+        copied_until = window.end
+    end = len(old_lines)
+    opcodes.append(
+        _Opcode("equal", copied_until, end, copied_until + offset, end + offset, [])
+    )
+
+    return "\n".join(_unified_diff(old_lines, _merge_opcodes(opcodes), filename)) + "\n"
+
+
+def _get_spans(
+    old_lines: list[str],
+    docstrings: list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]],
+) -> Iterator[_Span]:
+    """Yield the lines of the docstrings and the lines that replace them.
+
+    Docstrings that share a line are replaced together.
+    """
+    index = 0
+    while index < len(docstrings):
+        start, end = docstrings[index][0].start[0] - 1, docstrings[index][0].end[0]
+        group = [docstrings[index]]
+        index += 1
+        while index < len(docstrings) and docstrings[index][0].start[0] <= end:
+            end = docstrings[index][0].end[0]
+            group.append(docstrings[index])
+            index += 1
+
+        # Splice the docstrings into their lines as if those are the source
+        shifted = [
+            (
+                old._replace(
+                    start=(old.start[0] - start, old.start[1]),
+                    end=(old.end[0] - start, old.end[1]),
+                ),
+                new,
+            )
+            for old, new in group
+        ]
+        new_source = splice_docstrings("\n".join(old_lines[start:end]), shifted)
+        yield _Span(start, end, new_source.split("\n"))
+
+
+def _get_popular_lines(old_lines: list[str], spans: list[_Span]) -> set[str]:
+    """Get the lines that difflib considers too common to start a match with.
+
+    These are the lines that occur in more than 1% of a new source of at least
+    200 lines, see the autojunk parameter of difflib.SequenceMatcher.
+    """
+    length = len(old_lines) + sum(
+        len(new_lines) - (end - start) for start, end, new_lines in spans
+    )
+    if length < 200:
+        return set()
+
+    counts = Counter(old_lines)
+    for start, end, new_lines in spans:
+        counts.subtract(old_lines[start:end])
+        counts.update(new_lines)
+    return {line for line, count in counts.items() if count > length // 100 + 1}
+
+
+def _longest_run(lines: Iterable[str], popular: set[str]) -> int:
+    """Get the length of the longest run of lines that aren't popular."""
+    longest = run = 0
+    for line in lines:
+        run = 0 if line in popular else run + 1
+        longest = max(longest, run)
+    return longest
+
+
+class _Window(NamedTuple):
+    """Spans that are compared together and the unchanged lines around them."""
+
+    start: int
+    end: int
+    spans: list[_Span]
+    threshold: int
+    """The length of the longest match difflib could find in the spans."""
+
+
+def _make_window(
+    old_lines: list[str], span: _Span, bounds: tuple[int, int], popular: set[str]
+) -> _Window:
+    """Create the window of a single span."""
+    old_span = old_lines[span.start : span.end]
+    window = _Window(
+        span.start,
+        span.end,
+        [span],
+        max(_longest_run(old_span, popular), _longest_run(span.new_lines, popular)),
+    )
+    prefix = 0
+    for old, new in zip(old_span, span.new_lines):
+        if old != new:
+            break
+        prefix += 1
+    suffix = 0
+    for old, new in zip(reversed(old_span), reversed(span.new_lines)):
+        if old != new:
+            break
+        suffix += 1
+
+    # Which lines difflib matches with the lines before or after the span
+    # depends on which of those it finds first, so compare them all together
+    if prefix + suffix > min(len(old_span), len(span.new_lines)):
+        return window._replace(start=bounds[0], end=bounds[1])
+    return _extend_window(old_lines, window, bounds, popular)
+
+
+def _extend_window(
+    old_lines: list[str], window: _Window, bounds: tuple[int, int], popular: set[str]
+) -> _Window:
+    """Extend a window with the unchanged lines around it.
+
+    The window is extended until it contains more consecutive lines that aren't
+    popular than difflib could match in the spans, as those lines will be matched
+    with each other before any of the lines in the spans.
+    """
+    start, run = window.start, 0
+    while start > bounds[0] and run <= window.threshold:
+        start -= 1
+        run = 0 if old_lines[start] in popular else run + 1
+    end, run = window.end, 0
+    while end < bounds[1] and run <= window.threshold:
+        run = 0 if old_lines[end] in popular else run + 1
+        end += 1
+    return window._replace(start=start, end=end)
+
+
+def _get_windows(
+    old_lines: list[str], spans: list[_Span], popular: set[str]
+) -> list[_Window]:
+    """Get the lines that should be compared to find the same changes as difflib.
+
+    Windows that touch are merged, as difflib could match lines across them.
+    """
+    windows: list[_Window] = []
+    for index, span in enumerate(spans):
+        bounds = (
+            spans[index - 1].end if index else 0,
+            spans[index + 1].start if index + 1 < len(spans) else len(old_lines),
+        )
+        window = _make_window(old_lines, span, bounds, popular)
+        while windows and windows[-1].end >= window.start:
+            previous = windows.pop()
+            merged = _Window(
+                min(previous.start, window.start),
+                window.end,
+                previous.spans + window.spans,
+                max(previous.threshold, window.threshold),
+            )
+            bounds = (
+                windows[-1].spans[-1].end if windows else 0,
+                bounds[1],
+            )
+            window = _extend_window(old_lines, merged, bounds, popular)
+        windows.append(window)
+    return windows
+
+
+def _get_window_lines(old_lines: list[str], window: _Window) -> list[str]:
+    """Get the new lines of a window."""
+    new_lines: list[str] = []
+    copied_until = window.start
+    for start, end, span_lines in window.spans:
+        new_lines += old_lines[copied_until:start]
+        new_lines += span_lines
+        copied_until = end
+    new_lines += old_lines[copied_until : window.end]
+    return new_lines
+
+
+def _matches_context(window: _Window, opcodes: list[_Opcode]) -> bool:
+    """Check whether the lines around the spans of a window are matched."""
+    before = window.spans[0].start - window.start
+    after = window.end - window.spans[-1].end
+    first, last = opcodes[0], opcodes[-1]
+    return (
+        not before or (first.tag == "equal" and first.i2 - first.i1 >= before)
+    ) and (not after or (last.tag == "equal" and last.i2 - last.i1 >= after))
+
+
+def _diff_lines(
+    old_lines: list[str],
+    new_lines: list[str],
+    i: int,
+    j: int,
+    popular: set[str],
+) -> Iterator[_Opcode]:
+    """Yield the opcodes of the lines of a window at line i of the old source."""
+    # pylint: disable-next=import-outside-toplevel
+    import difflib
+
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    # Popular lines can only be matched next to other matches
+    b2j: dict[str, list[int]] = matcher.b2j  # type: ignore[attr-defined]
+    for line in popular:
+        b2j.pop(line, None)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        yield _Opcode(
+            tag,
+            i + i1,
+            i + i2,
+            j + j1,
+            j + j2,
+            [] if tag == "equal" else new_lines[j1:j2],
+        )
+
+
+def _merge_opcodes(opcodes: Iterable[_Opcode]) -> list[_Opcode]:
+    """Merge successive opcodes with the same kind of change and drop empty ones."""
+    merged: list[_Opcode] = []
+    for opcode in opcodes:
+        if opcode.i1 == opcode.i2 and opcode.j1 == opcode.j2:
+            continue
+        if not merged or (merged[-1].tag == "equal") != (opcode.tag == "equal"):
+            merged.append(opcode)
+            continue
+
+        last = merged[-1]
+        tag = "equal"
+        if last.tag != "equal":
+            tag = "replace"
+            if last.i1 == opcode.i2:
+                tag = "insert"
+            elif last.j1 == opcode.j2:
+                tag = "delete"
+        merged[-1] = _Opcode(
+            tag,
+            last.i1,
+            opcode.i2,
+            last.j1,
+            opcode.j2,
+            last.new_lines + opcode.new_lines,
+        )
+    return merged
+
+
+def _group_opcodes(opcodes: list[_Opcode]) -> Iterator[list[_Opcode]]:
+    """Group the changes with their context, like get_grouped_opcodes of difflib."""
+    context = CONTEXT_LINES
+    if opcodes[0].tag == "equal":
+        first = opcodes[0]
+        opcodes[0] = first._replace(
+            i1=max(first.i1, first.i2 - context), j1=max(first.j1, first.j2 - context)
+        )
+    if opcodes[-1].tag == "equal":
+        last = opcodes[-1]
+        opcodes[-1] = last._replace(
+            i2=min(last.i2, last.i1 + context), j2=min(last.j2, last.j1 + context)
+        )
+
+    group: list[_Opcode] = []
+    for opcode in opcodes:
+        # Start a new group whenever there is a large range without changes
+        if opcode.tag == "equal" and opcode.i2 - opcode.i1 > 2 * context:
+            group.append(
+                opcode._replace(
+                    i2=min(opcode.i2, opcode.i1 + context),
+                    j2=min(opcode.j2, opcode.j1 + context),
+                )
+            )
+            yield group
+            group = []
+            opcode = opcode._replace(
+                i1=max(opcode.i1, opcode.i2 - context),
+                j1=max(opcode.j1, opcode.j2 - context),
+            )
+        group.append(opcode)
+    if group and not (len(group) == 1 and group[0].tag == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a range of lines like difflib.unified_diff."""
+    if stop - start == 1:
+        return f"{start + 1}"
+    if start == stop:
+        return f"{start},0"
+    return f"{start + 1},{stop - start}"
+
+
+def _unified_diff(
+    old_lines: list[str], opcodes: list[_Opcode], filename: str
+) -> Iterator[str]:
+    """Yield the lines of a unified diff like difflib.unified_diff."""
+    if not any(opcode.tag != "equal" for opcode in opcodes):
+        return
+
+    yield f"--- {filename}"
+    yield f"+++ {filename}"
+    for group in _group_opcodes(opcodes):
+        first, last = group[0], group[-1]
+        yield (
+            f"@@ -{_format_range(first.i1, last.i2)} "
+            f"+{_format_range(first.j1, last.j2)} @@"
+        )
+        for opcode in group:
+            if opcode.tag == "equal":
+                for line in old_lines[opcode.i1 : opcode.i2]:
+                    yield f" {line}"
+                continue
+            for line in old_lines[opcode.i1 : opcode.i2]:
+                yield f"-{line}"
+            for line in opcode.new_lines:
+                yield f"+{line}"
+
+
 def compare_formatters(
     token: tokenize.TokenInfo,
     formatter_1: Formatter,
@@ -1,5 +1,11 @@
+from __future__ import annotations
+
+import io
 import token
 import tokenize
+from collections.abc import Callable
+
+from pydocstringformatter._utils.docstring_scanner import scan_docstrings
 
 PREVIOUS_TOKEN_MARKERS = (token.INDENT, token.ENDMARKER, token.NEWLINE)
 
@@ -19,3 +25,28 @@ def is_docstring(
     ):
         return True
     return False
+
+
+def find_docstrings(tokens: list[tokenize.TokenInfo]) -> list[tokenize.TokenInfo]:
+    """Find all tokens that represent a docstring."""
+    return [
+        tokeninfo
+        for index, tokeninfo in enumerate(tokens)
+        if is_docstring(tokeninfo, tokens[index - 1])
+    ]
+
+
+def locate_docstrings_with_tokenize(source: str) -> list[tokenize.TokenInfo]:
+    """Find all docstrings in a source by tokenizing it completely."""
+    return find_docstrings(list(tokenize.generate_tokens(io.StringIO(source).readline)))
+
+
+DOCSTRING_LOCATORS: dict[str, Callable[[str], list[tokenize.TokenInfo]]] = {
+    "scanner": scan_docstrings,
+    "tokenize": locate_docstrings_with_tokenize,
+}
+"""Engines that find the docstrings in a source.
+
+Engines other than tokenize can raise UnsupportedSourceError for sources
+they can't handle, in which case tokenize should be used instead.
+"""
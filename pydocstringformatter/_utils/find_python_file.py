@@ -1,40 +1,276 @@
 from __future__ import annotations
 
+import functools
 import glob
+import heapq
 import os
+import re
+from collections.abc import Iterator
 from pathlib import Path
 
+from pydocstringformatter._utils.exceptions import GitError
+
+# A path component that isn't hidden, like the components ** matches
+_RECURSIVE_COMPONENT = r"[^/.][^/]*"
+
 
 def is_python_file(filename: str) -> bool:
     """Check if file is a Python file."""
     return filename.endswith(".py")
 
 
+class ExcludeMatcher:
+    """Matches paths with exclude glob patterns, without expanding the patterns.
+
+    The patterns match like they do with glob.glob(pattern, recursive=True), but
+    relative patterns and paths are both made absolute with the current working
+    directory first. Directories matched by a pattern ending with /** are
+    excluded with everything in them.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        patterns = [_normalize_path(pattern) for pattern in patterns if pattern]
+        self._files = _compile_patterns(patterns)
+        self._directories = _compile_patterns(
+            [pattern[:-3] for pattern in patterns if pattern.endswith("/**")]
+        )
+
+    def __bool__(self) -> bool:
+        return self._files is not None
+
+    def matches(self, filename: str | os.PathLike[str]) -> bool:
+        """Check if a file is matched by one of the patterns."""
+        return bool(self._files and self._files.fullmatch(_normalize_path(filename)))
+
+    def prunes(self, directory: str | os.PathLike[str]) -> bool:
+        """Check if a directory is excluded with everything in it."""
+        return bool(
+            self._directories
+            and self._directories.fullmatch(_normalize_path(directory))
+        )
+
+    def is_pruned(self, directory: str | os.PathLike[str]) -> bool:
+        """Check if a directory or one of its parents is excluded."""
+        if not self._directories:
+            return False
+        path = Path(os.path.abspath(directory))
+        return any(self.prunes(parent) for parent in (path, *path.parents))
+
+    def excludes(self, filename: str | os.PathLike[str]) -> bool:
+        """Check if a file is matched or is in an excluded directory."""
+        return self.matches(filename) or self.is_pruned(
+            os.path.dirname(os.path.abspath(filename))
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _get_exclude_matcher(patterns: tuple[str, ...], _cwd: str) -> ExcludeMatcher:
+    """Compile the exclude patterns once for each working directory.
+
+    Relative patterns depend on the working directory, so it's part of the key.
+    """
+    return ExcludeMatcher(list(patterns))
+
+
+def get_exclude_matcher(exclude: list[str]) -> ExcludeMatcher:
+    """Get the matcher of the exclude glob patterns."""
+    return _get_exclude_matcher(tuple(exclude), os.getcwd())
+
+
+def _normalize_path(path: str | os.PathLike[str]) -> str:
+    """Make a path absolute and use forward slashes, like patterns are matched."""
+    path = os.path.normcase(os.path.abspath(path))
+    return path.replace(os.sep, "/") if os.sep != "/" else path
+
+
+def _compile_patterns(patterns: list[str]) -> re.Pattern[str] | None:
+    """Compile normalized glob patterns into a single regular expression."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_translate(pattern)})" for pattern in patterns))
+
+
+def _translate(pattern: str) -> str:
+    """Translate a normalized glob pattern into a regular expression."""
+    components = pattern.split("/")
+    regex = ""
+    for index, component in enumerate(components):
+        last = index == len(components) - 1
+        if component == "**":
+            regex += (
+                f"{_RECURSIVE_COMPONENT}(?:/{_RECURSIVE_COMPONENT})*"
+                if last
+                else f"(?:{_RECURSIVE_COMPONENT}/)*"
+            )
+            continue
+        regex += _translate_component(component) + ("" if last else "/")
+    return regex
+
+
+def _translate_component(component: str) -> str:
+    """Translate a glob pattern of a single path component.
+
+    Like glob, wildcards don't match hidden names unless the pattern starts with
+    a dot.
+    """
+    if not glob.has_magic(component):
+        return re.escape(component)
+
+    regex = "" if component.startswith(".") else r"(?!\.)"
+    index = 0
+    while index < len(component):
+        char = component[index]
+        index += 1
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[":
+            end = index
+            if end < len(component) and component[end] == "!":
+                end += 1
+            if end < len(component) and component[end] == "]":
+                end += 1
+            if (end := component.find("]", end)) == -1:
+                regex += r"\["
+                continue
+            # Escape what regular expressions would see as set operations
+            chars = re.sub(r"([&~|\\])", r"\\\1", component[index:end])
+            index = end + 1
+            if chars.startswith("!"):
+                chars = "^/" + chars[1:]
+            elif chars[0] in "^[":
+                chars = "\\" + chars
+            regex += f"[{chars}]"
+        else:
+            regex += re.escape(char)
+    return regex
+
+
 def find_python_files(
-    filenames: list[str], exclude: list[str], recursive: bool = True
+    filenames: list[str], exclude: list[str], recursive: bool = True, git: bool = False
 ) -> list[Path]:
     """Find all python files for a list of potential file and directory names."""
-    pathnames: list[Path] = []
+    return list(iter_python_files(filenames, exclude, recursive, git))
+
 
-    to_exclude: set[str] = set()
-    for exclude_glob in exclude:
-        to_exclude.update(set(glob.iglob(exclude_glob, recursive=recursive)))
+def iter_python_files(
+    filenames: list[str], exclude: list[str], recursive: bool = True, git: bool = False
+) -> Iterator[Path]:
+    """Yield the python files of find_python_files while the directories are walked.
 
+    The files are yielded in sorted order. Excluded directories aren't walked into.
+    With git the files of directories in a git work tree are listed by git instead
+    of walking them, so files ignored by git aren't found.
+    """
+    matcher = get_exclude_matcher(exclude)
+    sorted_paths: list[Iterator[Path]] = []
     for name in filenames:
         if os.path.isdir(name):
-            if recursive:
-                for root, _, children in os.walk(name):
-                    pathnames += [
-                        Path(os.path.abspath(root)) / child
-                        for child in children
-                        if is_python_file(child)
-                        and str(Path(root) / child) not in to_exclude
-                    ]
-            else:
-                pathnames += [
-                    file for file in Path(name).iterdir() if is_python_file(str(file))
-                ]
+            sorted_paths.append(_iter_directory(name, matcher, recursive, git))
         elif is_python_file(name):
-            pathnames.append(Path(name))
+            sorted_paths.append(iter([Path(name)]))
+    return heapq.merge(*sorted_paths)
+
+
+def _iter_directory(
+    directory: str, matcher: ExcludeMatcher, recursive: bool, git: bool
+) -> Iterator[Path]:
+    """Yield the python files in a directory in sorted order."""
+    if not recursive:
+        return iter(
+            sorted(
+                file for file in Path(directory).iterdir() if is_python_file(str(file))
+            )
+        )
+    if matcher.is_pruned(directory):
+        return iter(())
+    path = Path(os.path.abspath(directory))
+    if git and (filenames := _list_git_files(path)) is not None:
+        files: list[Path] = []
+        for filename in filenames:
+            file = path / filename
+            if not is_python_file(filename):
+                # Submodules and nested repositories are listed as a single
+                # entry, their files are listed by their own repository
+                if os.path.isdir(file) and not os.path.islink(file):
+                    files.extend(_iter_directory(str(file), matcher, recursive, git))
+                continue
+            # Deleted files are still listed until the deletion is staged
+            if not matcher.excludes(file) and os.path.isfile(file):
+                files.append(file)
+        return iter(sorted(files))
+    return _walk_python_files(path, matcher)
+
+
+def _list_git_files(directory: Path) -> list[str] | None:
+    """List the tracked and the untracked but not ignored files in a directory.
+
+    Returns None if the directory isn't in a git work tree.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from pydocstringformatter._utils.changed_lines import run_git
+
+    try:
+        output = run_git(
+            ["ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=directory,
+        )
+    except GitError:
+        return None
+    # Unmerged files are listed once for each stage
+    return list(dict.fromkeys(filter(None, output.split("\0"))))
+
+
+def _walk_python_files(directory: Path, matcher: ExcludeMatcher) -> Iterator[Path]:
+    """Walk a directory like os.walk, but yield the python files in sorted order.
+
+    The entries of each directory are sorted like paths are, so the files in a
+    subdirectory are yielded in between the files that sort around it.
+    """
+    try:
+        with os.scandir(directory) as scanner:
+            entries = sorted(scanner, key=lambda entry: os.path.normcase(entry.name))
+    except OSError:
+        return
+
+    for entry in entries:
+        path = directory / entry.name
+        try:
+            is_directory = entry.is_dir()
+        except OSError:
+            is_directory = False
+        if not is_directory:
+            if is_python_file(entry.name) and not matcher.matches(path):
+                yield path
+            continue
+        # Like os.walk symlinks to directories aren't followed
+        if not entry.is_symlink() and not matcher.prunes(path):
+            yield from _walk_python_files(path, matcher)
+
+
+def select_python_files(
+    paths: list[Path], filenames: list[str], exclude: list[str]
+) -> list[Path]:
+    """Select the python files that are one of or in one of the files or directories.
+
+    Unlike find_python_files this doesn't need to walk the directories.
+    """
+    roots = [os.path.realpath(name) for name in filenames]
+    return sorted(
+        path
+        for path in paths
+        if is_python_file(path.name)
+        and os.path.isfile(path)
+        and not is_excluded(path, exclude)
+        and any(path.is_relative_to(root) for root in roots)
+    )
+
+
+def is_excluded(filename: str | os.PathLike[str], exclude: list[str]) -> bool:
+    """Check if a file is excluded by one of the exclude glob patterns.
 
-    return sorted(pathnames)
+    Files are also excluded if the path with symlinks resolved is.
+    """
+    matcher = get_exclude_matcher(exclude)
+    return matcher.excludes(filename) or matcher.excludes(os.path.realpath(filename))
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Mapping
+from typing import Any
+
+
+def make_lazy_getattr(
+    attributes: Mapping[str, str], module_name: str
+) -> Callable[[str], Any]:
+    """Create the __getattr__ of a module that imports attributes on first use.
+
+    The attributes map the names of the attributes to the modules they are
+    imported from. An attribute is stored in the module once it's imported,
+    so it's only imported once.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if (module := attributes.get(name)) is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(__import__(module, fromlist=[name]), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    return __getattr__
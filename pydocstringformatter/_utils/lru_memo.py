@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import contextlib
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class LRUMemo(Generic[_K, _V]):
+    """Mapping that evicts the least recently used entries beyond a maximum size.
+
+    A maximum size of 0 disables the memo. The memo can be shared between
+    threads: a key that is evicted by another thread is simply missed.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[_K, _V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        """Return the value of a key and mark it as recently used."""
+        if (value := self._entries.get(key)) is not None:
+            with contextlib.suppress(KeyError):
+                self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: _K, value: _V) -> None:
+        """Store the value of a key and evict the least recently used keys."""
+        if not self.max_size:
+            return
+        self._entries[key] = value
+        with contextlib.suppress(KeyError):
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -1,4 +1,7 @@
+from __future__ import annotations
+
 import sys
+from collections import Counter
 
 
 def encode_string(string: str) -> bytes:
@@ -26,3 +29,28 @@ def sys_exit(value: int, option: bool) -> None:
     """Sys.exit if the boolean passed says to do so."""
     if option:
         sys.exit(value)
+
+
+TIME_STATISTICS = {"prefilter time", "check time"}
+"""Statistics that are measured in nanoseconds."""
+
+
+def format_statistics(statistics: Counter[str]) -> str:
+    """Format the statistics of a run to be printed."""
+    lines = ["Statistics:"]
+    for name, value in sorted(statistics.items()):
+        if name in TIME_STATISTICS:
+            lines.append(f"    {name}: {value / 1e6:.1f} ms")
+        else:
+            lines.append(f"    {name}: {value}")
+
+    # Estimate the time it would have taken to check the skipped files
+    if statistics["skipped bytes"] and statistics["checked bytes"]:
+        estimate = (
+            statistics["skipped bytes"]
+            * statistics["check time"]
+            / statistics["checked bytes"]
+        )
+        lines.append(f"    estimated time saved by skipping: {estimate / 1e6:.1f} ms")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import sys
+from types import TracebackType
+from typing import IO, Literal
+
+Stream = Literal["stdout", "stderr"]
+"""The name of the stream in sys that output is written to."""
+
+OutputChunk = tuple[Stream, str | bytes]
+"""Output for a stream, strings are encoded with the encoding of the stream."""
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+"""Number of bytes of output that are buffered before they are written."""
+
+DEFAULT_MEMORY_BUDGET = 1 << 26
+"""Number of bytes of output waiting for its turn that are kept in memory."""
+
+
+class OutputSink:
+    """Buffered output to stdout and stderr.
+
+    Output is written when more than buffer_size bytes are buffered or when
+    output for the other stream is written, so both streams are interleaved in
+    the order output was written to them. The streams are looked up in sys
+    when they are written to, so they can be redirected.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.buffer_size = buffer_size
+        self._stream: Stream = "stdout"
+        self._buffer = bytearray()
+
+    @staticmethod
+    def encode(stream: Stream, data: str | bytes) -> bytes:
+        """Encode a string like the text layer of a stream would."""
+        if isinstance(data, bytes):
+            return data
+        text_stream = getattr(sys, stream)
+        return data.encode(
+            getattr(text_stream, "encoding", None) or "utf-8",
+            getattr(text_stream, "errors", None) or "strict",
+        )
+
+    def write(self, stream: Stream, data: str | bytes) -> None:
+        """Write output to a stream."""
+        data = self.encode(stream, data)
+        if stream != self._stream:
+            self.flush()
+            self._stream = stream
+        if len(self._buffer) + len(data) <= self.buffer_size:
+            self._buffer += data
+            return
+
+        # Large output doesn't need to be copied into the buffer first
+        self.flush()
+        self._write(data)
+
+    def write_chunks(self, chunks: list[OutputChunk]) -> None:
+        """Write chunks of output in order."""
+        for stream, data in chunks:
+            self.write(stream, data)
+
+    def flush(self) -> None:
+        """Write the buffered output."""
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer.clear()
+
+    def _write(self, data: bytes | bytearray) -> None:
+        text_stream = getattr(sys, self._stream)
+        # Text that was written to the stream itself goes first
+        text_stream.flush()
+        if (buffer := getattr(text_stream, "buffer", None)) is None:
+            # Streams without a binary layer, like io.StringIO, are written as text
+            text_stream.write(
+                data.decode(
+                    getattr(text_stream, "encoding", None) or "utf-8",
+                    getattr(text_stream, "errors", None) or "replace",
+                )
+            )
+            text_stream.flush()
+            return
+        buffer.write(data)
+        buffer.flush()
+
+
+class OrderedOutput:
+    """Output of units of work that is written in the order of the units.
+
+    The output of a unit can be added before the output of the units before it
+    is, it is then kept until it is its turn. That output is kept in memory up to
+    memory_budget bytes, after that it is spilled to a temporary file.
+    """
+
+    def __init__(
+        self, sink: OutputSink, memory_budget: int = DEFAULT_MEMORY_BUDGET
+    ) -> None:
+        self.sink = sink
+        self.memory_budget = memory_budget
+        self.next_index = 0
+        """The index of the unit of which the output is written next."""
+        self._waiting: dict[int, list[tuple[Stream, bytes | tuple[int, int]]]] = {}
+        """Output per unit, as bytes or as the offset and length in the spill file."""
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+        self._spill: IO[bytes] | None = None
+
+    def __enter__(self) -> OrderedOutput:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add(self, index: int, chunks: list[OutputChunk]) -> None:
+        """Add the output of the unit with the given index."""
+        if index != self.next_index:
+            self._waiting[index] = self._store(chunks)
+            return
+
+        self.sink.write_chunks(chunks)
+        self.next_index += 1
+        while (waiting := self._waiting.pop(self.next_index, None)) is not None:
+            self._write_waiting(waiting)
+            self.next_index += 1
+
+    def discard(self, start: int) -> None:
+        """Discard the output of the units from the given index on."""
+        for index in [index for index in self._waiting if index >= start]:
+            for _, data in self._waiting.pop(index):
+                if isinstance(data, bytes):
+                    self._memory_bytes -= len(data)
+                else:
+                    self._spilled_bytes -= data[1]
+
+    def close(self) -> None:
+        """Write the buffered output and remove the spill file."""
+        self.sink.flush()
+        self._waiting.clear()
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    def _store(
+        self, chunks: list[OutputChunk]
+    ) -> list[tuple[Stream, bytes | tuple[int, int]]]:
+        """Keep output in memory or spill it if that exceeds the memory budget."""
+        encoded = [(stream, self.sink.encode(stream, data)) for stream, data in chunks]
+        size = sum(len(data) for _, data in encoded)
+        if self._memory_bytes + size <= self.memory_budget:
+            self._memory_bytes += size
+            return list(encoded)
+
+        if self._spill is None:
+            # pylint: disable-next=import-outside-toplevel
+            import tempfile
+
+            # pylint: disable-next=consider-using-with
+            self._spill = tempfile.TemporaryFile(prefix="pydocstringformatter-")
+        self._spill.seek(0, 2)
+        stored: list[tuple[Stream, bytes | tuple[int, int]]] = []
+        for stream, data in encoded:
+            stored.append((stream, (self._spill.tell(), len(data))))
+            self._spill.write(data)
+        self._spilled_bytes += size
+        return stored
+
+    def _write_waiting(
+        self, waiting: list[tuple[Stream, bytes | tuple[int, int]]]
+    ) -> None:
+        for stream, data in waiting:
+            if isinstance(data, bytes):
+                self._memory_bytes -= len(data)
+                self.sink.write(stream, data)
+                continue
+
+            assert self._spill is not None
+            offset, length = data
+            self._spill.seek(offset)
+            self.sink.write(stream, self._spill.read(length))
+            self._spilled_bytes -= length
+
+        # Reuse the spill file once all output in it has been written
+        if self._spill and not self._spilled_bytes:
+            self._spill.seek(0)
+            self._spill.truncate()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pydocstringformatter._utils.source_files import SourceBytes
+
+HEADER_LINES = 10
+"""Number of lines at the start of a file that are searched for generated markers."""
+
+
+def get_skip_reason(
+    data: SourceBytes, generated_markers: list[bytes], max_file_size: int
+) -> str | None:
+    """Check if a file can't need any changes without tokenizing it.
+
+    Returns:
+        The reason the file can be skipped, or None if it needs to be formatted.
+    """
+    if max_file_size and len(data) > max_file_size:
+        return "too large"
+
+    if generated_markers:
+        header_end = -1
+        for _ in range(HEADER_LINES):
+            if (header_end := data.find(b"\n", header_end + 1)) == -1:
+                break
+        header = data[:header_end] if header_end != -1 else data
+        if any(marker in header for marker in generated_markers):
+            return "generated"
+
+    # Without any quotes there can't be any docstrings
+    if b'"' not in data and b"'" not in data and _is_valid_python(data):
+        return "no strings"
+
+    return None
+
+
+def _is_valid_python(data: SourceBytes) -> bool:
+    """Check if a file can be parsed, so invalid files are still reported."""
+    # Only files without quotes are checked, so not every run needs ast
+    # pylint: disable-next=import-outside-toplevel
+    import ast
+
+    try:
+        # Slicing copies a mapped file to bytes, which compile requires
+        compile(data[:], "<file>", "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return False
+    return True
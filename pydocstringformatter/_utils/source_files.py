@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import codecs
+import contextlib
+import errno
+import io
+import mmap
+import os
+import stat
+import tokenize
+from collections.abc import Iterable, Iterator
+
+SourceBytes = bytes | mmap.mmap
+"""The content of a file, which is mapped in memory for large files."""
+
+Newlines = str | tuple[str, ...] | None
+"""The newlines of a source, like the newlines attribute of io.TextIOWrapper."""
+
+MMAP_THRESHOLD = 1 << 20
+"""Files of at least this number of bytes are mapped in memory instead of read."""
+
+# The newlines that io.TextIOWrapper reports for each combination of seen
+# newlines, with a bit for '\n', '\r' and '\r\n' respectively.
+_NEWLINES: tuple[Newlines, ...] = (
+    None,
+    "\n",
+    "\r",
+    ("\r", "\n"),
+    "\r\n",
+    ("\n", "\r\n"),
+    ("\r", "\r\n"),
+    ("\r", "\n", "\r\n"),
+)
+
+
+@contextlib.contextmanager
+def read_source(filename: str | os.PathLike[str]) -> Iterator[SourceBytes]:
+    """Read the content of a file once, large files are mapped in memory.
+
+    The content can't be used after the context exits, so a file should only
+    be written to after that.
+    """
+    with open(filename, "rb") as file:
+        if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+            yield file.read()
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def decode_source(data: SourceBytes) -> tuple[str, Newlines, str]:
+    """Decode the content of a file in the same way as tokenize.open.
+
+    Files without a byte order mark or a coding cookie are decoded as UTF-8
+    without detecting their encoding.
+
+    Returns:
+        A tuple containing [1] the decoded source with universal newlines,
+        [2] the type(s) of newlines used in the file and [3] its encoding.
+    """
+    # The encoding can only be declared on the first two lines
+    second_line_end = data.find(b"\n", data.find(b"\n") + 1)
+    header = data[: second_line_end + 1] if second_line_end != -1 else data[:]
+    if header.startswith(codecs.BOM_UTF8) or b"coding" in header:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(header).readline)
+    else:
+        encoding = "utf-8"
+
+    try:
+        source = str(data, encoding)
+    except UnicodeDecodeError:
+        # Raise the same error as tokenize.open for invalid first lines
+        tokenize.detect_encoding(io.BytesIO(header).readline)
+        raise
+
+    # In UTF-8 the newline characters can only be encoded as themselves, so
+    # most files can be checked for them without scanning the decoded source
+    if encoding.startswith("utf-8") and b"\r" not in data:
+        return source, "\n" if b"\n" in data else None, encoding
+
+    crlf = source.count("\r\n")
+    cr = source.count("\r") - crlf
+    lf = source.count("\n") - crlf
+    if cr or crlf:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    return source, _NEWLINES[bool(lf) | bool(cr) << 1 | bool(crlf) << 2], encoding
+
+
+def encode_source(source: str, newline: str | None, encoding: str) -> bytes:
+    """Encode a source with universal newlines with the newline of its file."""
+    if newline and newline != "\n":
+        source = source.replace("\n", newline)
+    return source.encode(encoding)
+
+
+def write_source(
+    filename: str | os.PathLike[str], data: bytes, fsync: bool = False
+) -> str:
+    """Replace the content of a file atomically.
+
+    The data is written to a temporary file in the same directory, which then
+    replaces the file, so the file is never left half written. The permissions
+    and, if allowed, the owner of the file are kept. Files that can't be
+    written to raise a PermissionError, like writing them in place would. With
+    fsync the data is flushed to disk before it replaces the file, the directory
+    should then be flushed with sync_directories.
+
+    If no file can be created in the directory the file is written in place.
+
+    Returns:
+        The path of the file that was replaced, symlinks are resolved.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    import tempfile
+
+    path = os.path.realpath(filename)
+    file_stat = os.stat(path)
+    # Replacing the file only needs permission to write to its directory
+    if not os.access(path, os.W_OK):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), str(filename))
+    try:
+        descriptor, temporary = tempfile.mkstemp(
+            prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(path)
+        )
+    except PermissionError:
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.chmod(temporary, stat.S_IMODE(file_stat.st_mode))
+        if hasattr(os, "chown"):
+            with contextlib.suppress(PermissionError):
+                os.chown(temporary, file_stat.st_uid, file_stat.st_gid)
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temporary)
+        raise
+    return path
+
+
+def sync_directories(directories: Iterable[str]) -> None:
+    """Flush the entries of directories to disk, so replaced files survive a crash.
+
+    Directories can't be flushed on Windows, where this does nothing.
+    """
+    if os.name == "nt":
+        return
+    for directory in directories:
+        descriptor = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import tokenize
+
+
+def splice_docstrings(
+    source: str,
+    docstrings: list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]],
+) -> str:
+    """Replace docstrings in the source they were tokenized from.
+
+    source: The source code the tokens were created from.
+    docstrings: Pairs of original and formatted docstring tokens, in the order
+        they appear in the source.
+
+    Everything outside the original docstrings is copied without changes.
+    """
+    pieces: list[str] = []
+    copied_until = 0
+
+    # Offset of the start of the line we are at in the source
+    line, line_start = 1, 0
+
+    def get_offset(position: tuple[int, int]) -> int:
+        """Convert a (row, column) position of a token to an offset in the source."""
+        nonlocal line, line_start
+        row, column = position
+        while line < row:
+            line_start = source.index("\n", line_start) + 1
+            line += 1
+        return line_start + column
+
+    for old_token, new_token in docstrings:
+        start = get_offset(old_token.start)
+        pieces.append(source[copied_until:start])
+        pieces.append(new_token.string)
+        copied_until = get_offset(old_token.end)
+
+    pieces.append(source[copied_until:])
+    return "".join(pieces)
@@ -1,51 +1,173 @@
-# pylint: disable=too-few-public-methods, protected-access
+# pylint: disable=too-few-public-methods, too-many-instance-attributes, protected-access
 """Run class."""
 
 from __future__ import annotations
 
+import argparse
+import itertools
 import os
 import sys
+import time
 import tokenize
+from collections import Counter
+from collections.abc import Iterable
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
 
-from pydocstringformatter import __version__, _formatting, _utils
+from pydocstringformatter import __version__, _caching, _formatting, _utils
 from pydocstringformatter._configuration.arguments_manager import ArgumentsManager
-from pydocstringformatter._utils.exceptions import UnstableResultError
+from pydocstringformatter._configuration.toml_parsing import ConfigFinder
+from pydocstringformatter._pipeline import FormattingPipeline
+
+if TYPE_CHECKING:
+    from concurrent import futures
+
+MAX_CHUNK_SIZE = 64
+"""Number of files that a process of a parallel run formats at once at most."""
+
+MAX_CHUNKS_AHEAD = 4
+"""Number of chunks per process that can be formatted before they are reported."""
+
+
+class _FileResult:
+    """The outcome of formatting a single file."""
+
+    def __init__(
+        self,
+        is_changed: bool,
+        statistics: Counter[str] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self.is_changed = is_changed
+        self.diff = ""
+        """Diff to print to stdout."""
+        self.message = ""
+        """Status message to print to the console."""
+        self.warning = ""
+        """Warning to print to stderr."""
+        self.statistics = statistics or Counter()
+        self.error = error
+        """Exception raised while formatting the file in a worker process."""
+
+
+class _FileConfig(NamedTuple):
+    """The options of a configuration that change how its files are formatted."""
+
+    pipeline: FormattingPipeline
+    generated_markers: list[bytes]
+    max_file_size: int
+    fingerprint: str | None
+    """Fingerprint of the options that is part of the keys in the cache.
+
+    None for the configuration of the run, which the cache was created with,
+    and when there is no cache.
+    """
 
 
 class _Run:
     """Main class that represent a run of the program."""
 
-    def __init__(self, argv: list[str] | None) -> None:
+    def __init__(
+        self,
+        argv: list[str] | None,
+        directory: str = ".",
+        format_files: bool = True,
+        parser_output: IO[str] | None = None,
+    ) -> None:
         # Load ArgumentsManager and set its namespace as instance's config attribute
-        self._arguments_manager = ArgumentsManager(__version__, _formatting.FORMATTERS)
+        # The messages of the parser are written to parser_output if it is given
+        self._arguments_manager = ArgumentsManager(
+            __version__, _formatting.FORMATTERS, parser_output
+        )
         self.config = self._arguments_manager.namespace
 
         # Display help message if nothing is passed
-        if not (argv := argv or sys.argv[1:]):
+        if format_files and not (argv := argv or sys.argv[1:]):
             self._arguments_manager.print_help()
             return
 
-        # Parse options and register on formatters
-        self._arguments_manager.parse_options(argv)
-        for formatter in _formatting.FORMATTERS:
-            formatter.set_config_namespace(self.config)
+        # Parse options, the pipeline configures its own copies of the formatters
+        self._argv = argv or []
+        self._arguments_manager.parse_options(self._argv, directory)
 
+        base_config = self._create_file_config(self.config, with_fingerprint=False)
+        self._pipeline = base_config.pipeline
         self.enabled_formatters = self.get_enabled_formatters()
+        self.statistics: Counter[str] = Counter()
+        self._config_finder = ConfigFinder() if format_files else None
+        """Finds the configuration file of each file, or None to only use the run's."""
+        self._file_configs: dict[str | None, _FileConfig] = {
+            None: base_config,
+            os.path.abspath(directory): base_config,
+        }
+        """Configurations by the directory of their configuration file.
+
+        Files without a configuration file use the configuration of the run.
+        """
+        self._changed_lines: dict[Path, _utils.LineRanges | None] | None = None
+        """Changed lines per file, or None to format all lines of all files."""
+        self._cache: _caching.Cache | None = None
+        self._output = _utils.OutputSink(self.config.output_buffer_size)
+        self._unsynced_directories: set[str] = set()
+        """Directories with replaced files that should be flushed with --fsync."""
+
+        # A run that doesn't format files is used to format sources instead
+        if not format_files:
+            return
+
+        # Formatting stdin shouldn't touch the filesystem, so it doesn't use the cache
+        if "-" not in self.config.files:
+            self._cache = _caching.create_cache(
+                self.config, list(self.enabled_formatters.values()), __version__
+            )
         self.check_files(self.config.files)
 
     # pylint: disable-next=inconsistent-return-statements
     def check_files(self, files: list[str]) -> None:
         """Find all files and perform the formatting."""
-        filepaths = _utils.find_python_files(files, self.config.exclude)
-
-        is_changed = self.format_files(filepaths)
+        if "-" in files:
+            if len(files) > 1:
+                raise _utils.PydocstringFormatterError(
+                    "Formatting stdin can't be combined with formatting other files."
+                )
+            is_changed = self.format_stdin()
+            self._print_statistics()
+            return _utils.sys_exit(32 if is_changed else 0, self.config.exit_code)
+
+        filepaths: Iterable[Path]
+        if self.config.changed_since:
+            self._changed_lines = _utils.get_changed_lines(self.config.changed_since)
+            filepaths = _utils.select_python_files(
+                list(self._changed_lines), files, self.config.exclude
+            )
+        else:
+            # Files are formatted while the directories are still being walked
+            filepaths = _utils.iter_python_files(
+                files, self.config.exclude, git=self.config.discovery == "git"
+            )
+
+        if self.config.line_ranges and len(filepaths := list(filepaths)) > 1:
+            raise _utils.PydocstringFormatterError(
+                "The --line-ranges option can only be used to format a single file."
+            )
+
+        try:
+            is_changed = self.format_files(filepaths)
+        finally:
+            self._output.flush()
+            if self._cache:
+                if self.statistics["cache additions"]:
+                    self._cache.prune()
+                self._cache.close()
+
+        self._print_statistics()
 
         if is_changed:  # pylint: disable=consider-using-assignment-expr
             return _utils.sys_exit(32, self.config.exit_code)
 
-        files_string = f"{len(filepaths)} "
-        files_string += "files" if len(filepaths) != 1 else "file"
+        # Each file that was found is counted, including those that were skipped
+        files_string = f"{self.statistics['files']} "
+        files_string += "files" if self.statistics["files"] != 1 else "file"
         _utils.print_to_console(
             f"Nothing to do! All docstrings in {files_string} are correct 🎉\n",
             self.config.quiet,
@@ -53,65 +175,297 @@ class _Run:
 
         _utils.sys_exit(0, self.config.exit_code)
 
+    def _print_statistics(self) -> None:
+        if self.config.statistics:
+            print(_utils.format_statistics(self.statistics), end="", file=sys.stderr)
+
     def format_file(self, filename: Path) -> bool:
         """Format a file."""
-        with tokenize.open(filename) as file:
-            try:
-                tokens = list(tokenize.generate_tokens(file.readline))
-            except tokenize.TokenError as exc:
-                raise _utils.ParsingError(
-                    f"Can't parse {os.path.relpath(filename)}. Is it valid Python code?"
-                ) from exc
-            # Record type of newlines so we can make sure to use
-            # the same later on.
-            newlines = file.newlines
-
-        formatted_tokens, is_changed = self.format_file_tokens(tokens, filename)
-
-        if is_changed:
-            try:
-                filename_str = os.path.relpath(filename)
-            except ValueError:
-                # On Windows relpath raises ValueError's when the mounts differ
-                filename_str = str(filename)
+        result = self._format_file(filename)
+        self._report_file_result(result)
+        return result.is_changed
+
+    def format_stdin(self) -> bool:
+        """Format the source on stdin.
+
+        With --write the formatted source is written to stdout, otherwise the
+        diff is. No files are searched for, read or written.
+        """
+        data = sys.stdin.buffer.read()
+        filename = Path(os.path.realpath(self.config.stdin_filename or "-"))
+        if self._skips_stdin(data, filename):
+            if self.config.write:
+                sys.stdout.buffer.write(data)
+            return False
 
+        source, newlines, encoding = _utils.decode_source(data)
+        if not (changed_docstrings := self.get_changed_docstrings(source, filename)):
             if self.config.write:
-                if isinstance(newlines, tuple):
-                    newlines = newlines[0]
-                    print(
-                        "Found multiple newline variants in "
-                        f"{os.path.abspath(filename_str)}. "
-                        "Using variant that occurred first.",
-                        file=sys.stderr,
-                    )
-                with open(filename, "w", encoding="utf-8", newline=newlines) as file:
-                    file.write(tokenize.untokenize(formatted_tokens))
-                    _utils.print_to_console(
-                        f"Formatted {filename_str} 📖\n", self.config.quiet
-                    )
-            else:
-                sys.stdout.write(
-                    _utils.generate_diff(
-                        tokenize.untokenize(tokens),
-                        tokenize.untokenize(formatted_tokens),
-                        filename_str,
-                    )
+                sys.stdout.buffer.write(data)
+            return False
+
+        if not self.config.write:
+            sys.stdout.write(
+                _utils.generate_docstrings_diff(
+                    source, changed_docstrings, self._relative_filename(filename)
+                )
+            )
+            return True
+
+        if isinstance(newlines, tuple):
+            newlines = newlines[0]
+            print(
+                "Found multiple newline variants on stdin. "
+                "Using variant that occurred first.",
+                file=sys.stderr,
+            )
+        new_source = _utils.splice_docstrings(source, changed_docstrings)
+        sys.stdout.buffer.write(_utils.encode_source(new_source, newlines, encoding))
+        return True
+
+    def _skips_stdin(self, data: bytes, filename: Path) -> bool:
+        """Check if the source on stdin should be passed through unchanged."""
+        file_config = self._get_file_config(filename)
+        if _utils.get_skip_reason(
+            data, file_config.generated_markers, file_config.max_file_size
+        ):
+            return True
+        if not self.config.stdin_filename:
+            return False
+        if _utils.is_excluded(self.config.stdin_filename, self.config.exclude):
+            return True
+        if self.config.changed_since:
+            self._changed_lines = _utils.get_changed_lines(self.config.changed_since)
+            return filename not in self._changed_lines
+        return False
+
+    def _format_file(self, filename: Path) -> _FileResult:
+        """Format a file and return its output instead of printing it."""
+        with _utils.read_source(filename) as data:
+            result, formatted = self._format_data(data, filename)
+            if formatted is None:
+                return result
+
+            filename_str = self._relative_filename(filename)
+            new_source, newlines, encoding = formatted
+            if isinstance(newlines, tuple):
+                newlines = newlines[0]
+                result.warning = (
+                    "Found multiple newline variants in "
+                    f"{os.path.abspath(filename_str)}. "
+                    "Using variant that occurred first."
                 )
+            new_data = _utils.encode_source(new_source, newlines, encoding)
+            # Don't touch files of which the content wouldn't change
+            if len(new_data) == len(data) and new_data == data[:]:
+                result.is_changed = False
+                return result
+
+        path = _utils.write_source(filename, new_data, self.config.fsync)
+        if self.config.fsync:
+            self._unsynced_directories.add(os.path.dirname(path))
+        result.message = f"Formatted {filename_str} 📖\n"
+        return result
+
+    def _sync_directories(self) -> None:
+        """Flush the directories of the files written since the last flush."""
+        _utils.sync_directories(sorted(self._unsynced_directories))
+        self._unsynced_directories.clear()
+
+    def _format_data(
+        self, data: _utils.SourceBytes, filename: Path
+    ) -> tuple[_FileResult, tuple[str, _utils.Newlines, str] | None]:
+        """Format the content of a file.
+
+        The content is only used while it is formatted, so large files that
+        are mapped in memory can be written to afterwards.
 
-        return is_changed
+        Returns:
+            A tuple containing [1] the result of the file and [2] the formatted
+            source, its newlines and its encoding if it should be written.
+        """
+        statistics: Counter[str] = Counter(files=1)
+        file_config = self._get_file_config(filename)
+        start_time = time.perf_counter_ns()
+        skip_reason = _utils.get_skip_reason(
+            data, file_config.generated_markers, file_config.max_file_size
+        )
+        statistics["prefilter time"] = time.perf_counter_ns() - start_time
+        if skip_reason:
+            statistics[f"skipped ({skip_reason})"] = 1
+            statistics["skipped bytes"] = len(data)
+            return _FileResult(False, statistics=statistics), None
+
+        if (
+            self._cache
+            and (cache_key := self._cache.key(data, file_config.fingerprint))
+            in self._cache
+        ):
+            statistics["cache hits"] = 1
+            return _FileResult(False, statistics=statistics), None
+
+        start_time = time.perf_counter_ns()
+        source, newlines, encoding = _utils.decode_source(data)
+        changed_docstrings = file_config.pipeline.format_docstrings(
+            self._locate_docstrings(source, filename, statistics, file_config.pipeline),
+            filename,
+            statistics,
+        )
+        statistics["check time"] = time.perf_counter_ns() - start_time
+        statistics["checked bytes"] = len(data)
+        result = _FileResult(bool(changed_docstrings), statistics=statistics)
+
+        if not changed_docstrings:
+            # Only files of which all lines were checked are known to be correct
+            if self._cache and self._formats_all_lines(filename):
+                self._cache.add(cache_key)
+                statistics["cache additions"] = 1
+            return result, None
+
+        if self.config.write:
+            # Only replace the changed docstrings, so everything else in the
+            # file is preserved exactly.
+            new_source = _utils.splice_docstrings(source, changed_docstrings)
+            return result, (new_source, newlines, encoding)
+
+        result.diff = _utils.generate_docstrings_diff(
+            source, changed_docstrings, self._relative_filename(filename)
+        )
+        return result, None
 
-    def get_enabled_formatters(self) -> dict[str, _formatting.Formatter]:
-        """Returns a dict of the enabled formatters."""
+    def format_source(self, source: str, filename: Path) -> str:
+        """Format the docstrings in a source with universal newlines.
+
+        source: Source to format.
+        filename: Name of the file the source is from, used in error messages.
+
+        Returns:
+            The formatted source.
+        """
+        return _utils.splice_docstrings(
+            source, self.get_changed_docstrings(source, filename)
+        )
+
+    def get_changed_docstrings(
+        self, source: str, filename: Path
+    ) -> list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]]:
+        """Format the docstrings in a source with universal newlines.
+
+        Returns:
+            The original and formatted tokens of the docstrings that changed.
+        """
+        statistics: Counter[str] = Counter()
+        pipeline = self._get_file_config(filename).pipeline
+        changed_docstrings = pipeline.format_docstrings(
+            self._locate_docstrings(source, filename, statistics, pipeline),
+            filename,
+            statistics,
+        )
+        self.statistics.update(statistics)
+        return changed_docstrings
+
+    def _select_docstrings(
+        self, docstrings: list[tokenize.TokenInfo], filename: Path
+    ) -> list[tokenize.TokenInfo]:
+        """Select the docstrings in the changed lines and line ranges of a file."""
+        changed_lines = self._changed_lines or {}
+        if (lines := changed_lines.get(filename)) is not None:
+            docstrings = _utils.select_changed_docstrings(docstrings, lines)
+        if self.config.line_ranges:
+            docstrings = _utils.select_changed_docstrings(
+                docstrings, self.config.line_ranges
+            )
+        return docstrings
+
+    def _formats_all_lines(self, filename: Path) -> bool:
+        """Check if all docstrings in a file are formatted."""
+        return not self.config.line_ranges and (
+            self._changed_lines is None or self._changed_lines[filename] is None
+        )
+
+    @staticmethod
+    def _relative_filename(filename: Path) -> str:
+        """Return the name of a file relative to the working directory."""
+        try:
+            return os.path.relpath(filename)
+        except ValueError:
+            # On Windows relpath raises ValueError's when the mounts differ
+            return str(filename)
+
+    def _locate_docstrings(
+        self,
+        source: str,
+        filename: Path,
+        statistics: Counter[str],
+        pipeline: FormattingPipeline,
+    ) -> list[tokenize.TokenInfo]:
+        """Find the docstrings to format in a source."""
+        return self._select_docstrings(
+            pipeline.locate_docstrings(source, filename, statistics), filename
+        )
 
-        enabled = {}
-        for formatter in _formatting.FORMATTERS:
-            if (
-                "default" in formatter.style
-                or any(i in formatter.style for i in self.config.style)
-            ) and getattr(self.config, formatter.name):
-                enabled[formatter.name] = formatter
+    def _get_file_config(self, filename: Path) -> _FileConfig:
+        """Get the configuration of the nearest configuration file of a file.
 
-        return enabled
+        The configuration file is parsed with the command line options once for
+        all files it applies to. Options that aren't about how files are
+        formatted, such as --write and --exclude, are those of the run.
+        """
+        directory = None
+        if self._config_finder:
+            filename_directory = os.path.dirname(os.path.abspath(filename))
+            directory = self._config_finder.find(filename_directory)
+        if (file_config := self._file_configs.get(directory)) is not None:
+            return file_config
+
+        # Without a configuration file the options of the run are known already
+        assert directory is not None
+        arguments_manager = ArgumentsManager(__version__, _formatting.FORMATTERS)
+        arguments_manager.parse_options(self._argv, directory)
+        file_config = self._create_file_config(
+            arguments_manager.namespace, with_fingerprint=self._cache is not None
+        )
+        self._file_configs[directory] = file_config
+        return file_config
+
+    @staticmethod
+    def _create_file_config(
+        config: argparse.Namespace, with_fingerprint: bool
+    ) -> _FileConfig:
+        """Create the pipeline and get the options that files are formatted with."""
+        pipeline = FormattingPipeline(config)
+        return _FileConfig(
+            pipeline,
+            [marker.encode("utf-8") for marker in config.generated_markers if marker],
+            config.max_file_size,
+            (
+                _caching.get_config_fingerprint(
+                    config, list(pipeline.formatters.values()), __version__
+                )
+                if with_fingerprint
+                else None
+            ),
+        )
+
+    def _report_file_result(self, result: _FileResult) -> None:
+        """Print the output of a formatted file and record its statistics."""
+        self.statistics.update(result.statistics)
+        self._output.write_chunks(self._get_output(result))
+
+    def _get_output(self, result: _FileResult) -> list[_utils.OutputChunk]:
+        """Get the output of a formatted file."""
+        output: list[_utils.OutputChunk] = []
+        if result.warning:
+            output.append(("stderr", result.warning + "\n"))
+        if result.diff:
+            output.append(("stdout", result.diff))
+        if result.message and not self.config.quiet:
+            output.append(("stdout", _utils.encode_string(result.message)))
+        return output
+
+    def get_enabled_formatters(self) -> dict[str, _formatting.Formatter]:
+        """Returns a dict of the enabled formatters."""
+        return dict(self._pipeline.formatters)
 
     def format_file_tokens(
         self, tokens: list[tokenize.TokenInfo], filename: Path
@@ -132,34 +486,39 @@ class _Run:
         """
         formatted_tokens: list[tokenize.TokenInfo] = []
         is_changed = False
+        docstrings = set(
+            self._select_docstrings(_utils.find_docstrings(tokens), filename)
+        )
 
-        for index, tokeninfo in enumerate(tokens):
+        for tokeninfo in tokens:
             new_tokeninfo = tokeninfo
 
-            if _utils.is_docstring(new_tokeninfo, tokens[index - 1]):
-                new_tokeninfo, changers = self.apply_formatters(new_tokeninfo)
+            if tokeninfo in docstrings:
+                new_tokeninfo, changers = self.format_docstring(new_tokeninfo, filename)
                 is_changed = is_changed or bool(changers)
 
-                # Run formatters again (3rd time) to check if the result is stable
-                _, changers = self._apply_formatters_once(
-                    new_tokeninfo,
-                )
+            formatted_tokens.append(new_tokeninfo)
 
-                if changers:
-                    conflicting_formatters = {
-                        k: v
-                        for k, v in self.enabled_formatters.items()
-                        if k in changers
-                    }
-                    template = _utils.create_gh_issue_template(
-                        new_tokeninfo, conflicting_formatters, str(filename)
-                    )
+        return formatted_tokens, is_changed
 
-                    raise UnstableResultError(template)
+    def format_docstring(
+        self, token: tokenize.TokenInfo, filename: Path
+    ) -> tuple[tokenize.TokenInfo, set[str]]:
+        """Format a docstring token and check that the result is stable.
 
-            formatted_tokens.append(new_tokeninfo)
+        token: Docstring token to format.
+        filename: Name of the file the token is from.
 
-        return formatted_tokens, is_changed
+        Returns:
+            A tuple containing [1] the formatted token and [2] a set
+            of formatters that changed the token.
+
+        Raises:
+            UnstableResultError::
+                If the formatters are not able to get to a stable result.
+                It reports what formatters are still modifying the token.
+        """
+        return self._pipeline.format_docstring(token, filename)
 
     def apply_formatters(
         self, token: tokenize.TokenInfo
@@ -173,32 +532,148 @@ class _Run:
             [1] the formatted token and
             [2] a set of formatters that changed the token.
         """
-        token, changers = self._apply_formatters_once(token)
-        if changers:
-            token, changers2 = self._apply_formatters_once(token)
-            changers.update(changers2)
+        token, changers, _ = self._pipeline.apply_formatters(token)
         return token, changers
 
-    def _apply_formatters_once(
-        self, token: tokenize.TokenInfo
-    ) -> tuple[tokenize.TokenInfo, set[str]]:
-        """Applies formatters to a token and keeps track of what changes it.
+    def format_files(self, filepaths: Iterable[Path]) -> bool:
+        """Format the files in order, they can be found while they are formatted."""
+        filepaths = iter(filepaths)
+        first_files = list(itertools.islice(filepaths, 2))
+        if self.config.jobs > 1 and len(first_files) > 1:
+            return self._format_files_parallel(
+                itertools.chain(first_files, filepaths), self.config.jobs
+            )
+
+        try:
+            is_changed = [
+                self.format_file(file)
+                for file in itertools.chain(first_files, filepaths)
+            ]
+        finally:
+            self._sync_directories()
+        return any(is_changed)
 
-        token: Token to apply formatters to
+    def _format_files_parallel(self, filepaths: Iterable[Path], jobs: int) -> bool:
+        """Format files with a pool of processes.
 
-        Returns:
-            A tuple containing [1] the formatted token and [2] a set
-            of formatters that changed the token.
+        Files are sent to the processes in chunks as soon as they are found.
+        Chunks are only sent if fewer than MAX_CHUNKS_AHEAD chunks per process
+        are ahead of the first chunk that isn't reported yet. Results are
+        reported in the order of filepaths, so the output is the same as the
+        output of a serial run.
         """
-        changers: set[str] = set()
-        for formatter_name, formatter in self.enabled_formatters.items():
-            if (new_token := formatter.treat_token(token)) != token:
-                changers.add(formatter_name)
-                token = new_token
+        # Only parallel runs need the slow to import concurrent.futures
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent import futures
 
-        return token, changers
+        filepaths = iter(filepaths)
+        is_changed = False
+        executor = futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(self,)
+        )
+        try:
+            pending: dict[futures.Future[list[_FileResult]], int] = {}
+            failed: dict[int, BaseException] = {}
+            submitted = submitted_files = 0
+            with _utils.OrderedOutput(self._output) as output:
+                while True:
+                    # Start with small chunks, so the first results come quickly
+                    chunksize = submitted_files // (jobs * MAX_CHUNKS_AHEAD)
+                    while submitted - output.next_index < jobs * MAX_CHUNKS_AHEAD and (
+                        chunk := list(
+                            itertools.islice(
+                                filepaths, min(MAX_CHUNK_SIZE, max(1, chunksize))
+                            )
+                        )
+                    ):
+                        future = executor.submit(_format_files_in_worker, chunk)
+                        pending[future] = submitted
+                        submitted += 1
+                        submitted_files += len(chunk)
+                    if not pending:
+                        return is_changed
+
+                    for future in futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED
+                    ).done:
+                        is_changed = (
+                            self._report_chunk(
+                                output, failed, pending.pop(future), future
+                            )
+                            or is_changed
+                        )
+
+                    # Raise the first exception once the output before it is written
+                    if failed and min(failed) < output.next_index:
+                        raise failed[min(failed)]
+        finally:
+            # Stop formatting files if one of them raised an exception
+            executor.shutdown(cancel_futures=True)
+
+    def _report_chunk(
+        self,
+        output: _utils.OrderedOutput,
+        failed: dict[int, BaseException],
+        index: int,
+        future: futures.Future[list[_FileResult]],
+    ) -> bool:
+        """Report the results of a chunk of files and return whether any changed.
+
+        The exception of a chunk that failed is added to failed. Like in a serial
+        run, nothing after the first file that failed is reported.
+        """
+        if failed and index > min(failed):
+            return False
+        results = [] if future.exception() else future.result()
+        if error := future.exception() or results[-1].error:
+            failed[index] = error
+            output.discard(index + 1)
+        output.add(
+            index,
+            [chunk for result in results for chunk in self._get_output(result)],
+        )
+        for result in results:
+            self.statistics.update(result.statistics)
+        return any(result.is_changed for result in results)
 
-    def format_files(self, filepaths: list[Path]) -> bool:
-        """Format a list of files."""
-        is_changed = [self.format_file(file) for file in filepaths]
-        return any(is_changed)
+    def __getstate__(self) -> dict[str, Any]:
+        """Remove the unpicklable argument parser when sending a run to a worker.
+
+        Workers return their output instead of writing it, so they don't get the
+        output sink either.
+        """
+        state = self.__dict__.copy()
+        del state["_arguments_manager"]
+        del state["_output"]
+        return state
+
+
+_WORKER_RUN: _Run | None = None
+"""The run used by a worker process of a parallel run."""
+
+
+def _init_worker(run: _Run) -> None:
+    """Store the run that a worker process uses to format files."""
+    global _WORKER_RUN  # pylint: disable=global-statement
+    _WORKER_RUN = run
+
+
+def _format_files_in_worker(filenames: list[Path]) -> list[_FileResult]:
+    """Format files in a worker process.
+
+    If a file raises an exception the files after it aren't formatted, and the
+    exception is returned as the last result, after the results of the files
+    before it.
+    """
+    assert _WORKER_RUN is not None
+    results: list[_FileResult] = []
+    try:
+        for filename in filenames:
+            try:
+                results.append(_WORKER_RUN._format_file(filename))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                results.append(_FileResult(is_changed=False, error=exc))
+                break
+    finally:
+        _WORKER_RUN._sync_directories()
+    return results
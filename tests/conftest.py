@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from pydocstringformatter import _caching
 from pydocstringformatter._testutils import UPDATE_OUTPUT_OPTION
 
 
@@ -23,3 +24,16 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         "files to be as the tests are currently producing them.",
         default=False,
     )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Store the cache in a temporary directory instead of the working directory.
+
+    The directory is next to the one of tmp_path, so it doesn't show up in it.
+    """
+    directory = tmp_path_factory.mktemp("cache") / "cache"
+    monkeypatch.setattr(_caching, "DEFAULT_CACHE_DIR", str(directory))
+    return directory
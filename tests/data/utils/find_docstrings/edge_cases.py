@@ -0,0 +1,69 @@
+# Some comments
+'''Module docstring'''
+import os  # '''Not a docstring'''
+
+VALUE = """Not a docstring"""
+"""Attribute docstring"""
+
+VALUE = (
+"""Docstring because it is at the start of a line"""
+    """Not a docstring"""
+)
+"""Attribute docstring"""
+
+VALUE = [1, 2,
+    3]
+"""Attribute docstring"""
+
+VALUE = 1 + \
+    2
+"""Attribute docstring"""
+
+NAMES = {"key": "value", 'other': '''value'''}; """Not a docstring"""
+BYTES = b"""Not a docstring"""
+RAW = r'''Not a docstring'''
+FORMAT = f"{os.sep!r:>{10}} {NAMES['key']} {{literal}} {(lambda: 1)()}"
+FORMAT = f"""{
+    VALUE
+}"""
+ESCAPES = "\"Not a docstring\"" '\'' """\"\"\""""
+
+
+class Class:
+    """Class docstring"""
+
+    attribute = 1
+    """Attribute docstring"""
+
+    def method(self):  # A comment
+        # Another comment
+        """Method docstring"""
+
+        if self:
+            pass
+        """Not a docstring because it follows a dedent"""
+        return None
+
+        """Not a docstring because it follows a blank line"""
+
+    def other(self): """Not a docstring on the same line as the definition"""
+
+
+    """Not a docstring because it follows a dedent"""
+
+def func():
+    call(
+        """Not a docstring"""
+    )
+
+    if True: '''Not a docstring after a compound statement'''
+
+    # A comment
+    x = """Not a docstring
+    """
+
+
+"""Not a docstring because it follows a dedent"""
+
+
+"""Docstring because it follows blank lines"""
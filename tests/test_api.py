@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pydocstringformatter import (
+    DocstringChange,
+    FormatConfig,
+    ParsingError,
+    PydocstringFormatterError,
+    SourceFormatter,
+    check_source,
+    format_source,
+)
+from pydocstringformatter._configuration.arguments_manager import ArgumentsManager
+from pydocstringformatter._formatting import FORMATTERS
+
+SOURCE = '"""a docstring"""\n\n\ndef func():\n    """another docstring"""\n'
+FORMATTED = '"""A docstring."""\n\n\ndef func():\n    """Another docstring."""\n'
+
+
+def test_format_source() -> None:
+    """Test that a source is formatted and the changed docstrings are reported."""
+    result = format_source(SOURCE)
+    assert result.source == FORMATTED
+    assert result.is_changed
+    assert result.changes == (
+        DocstringChange((1, 0), (1, 17), '"""a docstring"""', '"""A docstring."""'),
+        DocstringChange(
+            (5, 4), (5, 27), '"""another docstring"""', '"""Another docstring."""'
+        ),
+    )
+
+    result = format_source(FORMATTED)
+    assert result.source == FORMATTED
+    assert not result.is_changed
+    assert not result.changes
+
+
+def test_format_source_newlines() -> None:
+    """Test that the newlines of a source are kept."""
+    result = format_source(SOURCE.replace("\n", "\r\n"))
+    assert result.source == FORMATTED.replace("\n", "\r\n")
+    assert result.changes[1].start == (5, 4)
+
+
+def test_check_source() -> None:
+    """Test that sources are checked without formatting them."""
+    assert not check_source(SOURCE)
+    assert check_source(FORMATTED)
+    assert check_source(
+        FORMATTED.replace(".", ""), FormatConfig(disable=frozenset({"final-period"}))
+    )
+
+
+def test_invalid_source() -> None:
+    """Test that invalid sources raise a ParsingError."""
+    with pytest.raises(ParsingError, match="test.py"):
+        format_source('"""a docstring"""\n(', filename="test.py")
+
+
+class TestFormatConfig:
+    """Tests for configuring the formatters."""
+
+    @staticmethod
+    def test_options() -> None:
+        """Test that the options of the configuration are used."""
+        config = FormatConfig(
+            summary_quotes_same_line=True, disable=frozenset({"final-period"})
+        )
+        source = '"""\na summary\n\nA description.\n"""\n'
+        assert SourceFormatter(config).format_source(source).source == (
+            '"""A summary\n\nA description.\n"""\n'
+        )
+
+        namespace = FormatConfig(
+            enable=frozenset({"linewrap-full-docstring"}),
+            disable=frozenset({"final-period"}),
+        ).to_namespace()
+        assert getattr(namespace, "linewrap-full-docstring")
+        assert not getattr(namespace, "final-period")
+        assert getattr(namespace, "quotes-type")
+
+    @staticmethod
+    def test_unknown_formatters() -> None:
+        """Test that formatters that don't exist are rejected."""
+        with pytest.raises(PydocstringFormatterError, match="Unknown formatters"):
+            FormatConfig(enable=frozenset({"final-periods"}))
+        with pytest.raises(PydocstringFormatterError, match="enabled and disabled"):
+            FormatConfig(
+                enable=frozenset({"final-period"}),
+                disable=frozenset({"final-period"}),
+            )
+
+    @staticmethod
+    def test_from_options(tmp_path: Path) -> None:
+        """Test that a configuration can be created from options and a toml file."""
+        (tmp_path / "pyproject.toml").write_text(
+            "[tool.pydocstringformatter]\nmax-line-length = 72\n"
+        )
+        config = FormatConfig.from_options(
+            ["--no-final-period", "--style=numpydoc"], str(tmp_path)
+        )
+        assert config.max_line_length == 72
+        assert config.style == ("numpydoc",)
+        assert "final-period" in config.disable
+        assert format_source(SOURCE, config).source == FORMATTED.replace(".", "")
+
+        with pytest.raises(PydocstringFormatterError, match="invalid choice"):
+            FormatConfig.from_options(["--style=google"], str(tmp_path))
+
+    @staticmethod
+    def test_from_options_output(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the streams of sys, which other threads use, aren't redirected."""
+        streams = []
+        parse_options = ArgumentsManager.parse_options
+
+        def record_streams(self: ArgumentsManager, *args: Any) -> None:
+            streams.append((sys.stdout, sys.stderr))
+            parse_options(self, *args)
+
+        monkeypatch.setattr(ArgumentsManager, "parse_options", record_streams)
+        with pytest.raises(PydocstringFormatterError, match="usage"):
+            FormatConfig.from_options(["--help"], str(tmp_path))
+        with pytest.raises(PydocstringFormatterError, match="invalid choice"):
+            FormatConfig.from_options(["--style=google"], str(tmp_path))
+
+        assert streams == [(sys.stdout, sys.stderr)] * 2
+
+
+def test_global_formatters_are_not_changed() -> None:
+    """Test that formatting a source doesn't configure the global formatters."""
+    namespace = argparse.Namespace()
+    for formatter in FORMATTERS:
+        formatter.set_config_namespace(namespace)
+
+    SourceFormatter(FormatConfig(max_line_length=10)).format_source(SOURCE)
+    assert all(formatter.config is namespace for formatter in FORMATTERS)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from pydocstringformatter import (
+    FileFormatResult,
+    FormatConfig,
+    ParsingError,
+    PydocstringFormatterError,
+    aformat_paths,
+    aformat_source,
+)
+from pydocstringformatter._async_api import _format_path
+
+SOURCE = '"""a docstring"""\n'
+FORMATTED = '"""A docstring."""\n'
+
+
+async def collect(results: AsyncIterator[FileFormatResult]) -> list[FileFormatResult]:
+    """Collect the results of aformat_paths."""
+    return [result async for result in results]
+
+
+def test_aformat_source() -> None:
+    """Test that a source is formatted asynchronously."""
+    result = asyncio.run(aformat_source(SOURCE))
+    assert result.source == FORMATTED
+
+    config = FormatConfig(disable=frozenset({"final-period"}))
+    result = asyncio.run(aformat_source(SOURCE, config))
+    assert result.source == FORMATTED.replace(".", "")
+
+
+def test_aformat_paths(tmp_path: Path) -> None:
+    """Test that files are formatted and errors are reported per file."""
+    for index in range(5):
+        (tmp_path / f"file_{index}.py").write_text(SOURCE)
+    (tmp_path / "invalid.py").write_text('"""a docstring"""\n(')
+
+    results = asyncio.run(collect(aformat_paths([tmp_path])))
+    assert sorted(result.path.name for result in results) == [
+        "file_0.py",
+        "file_1.py",
+        "file_2.py",
+        "file_3.py",
+        "file_4.py",
+        "invalid.py",
+    ]
+    for result in results:
+        if result.path.name == "invalid.py":
+            assert isinstance(result.error, ParsingError)
+        else:
+            assert result.result and result.result.source == FORMATTED
+    assert (tmp_path / "file_0.py").read_text() == SOURCE
+
+    asyncio.run(collect(aformat_paths([tmp_path], write=True)))
+    assert (tmp_path / "file_0.py").read_text() == FORMATTED
+
+
+def test_results_are_streamed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a slow file doesn't hold back the results of other files."""
+    for index in range(4):
+        (tmp_path / f"file_{index}.py").write_text(SOURCE)
+    slow_file_started = threading.Event()
+    others_done = threading.Event()
+
+    def format_path(path: Path, config: FormatConfig, write: bool) -> FileFormatResult:
+        if path.name == "file_0.py":
+            slow_file_started.set()
+            others_done.wait(timeout=10)
+        return _format_path(path, config, write)
+
+    monkeypatch.setattr("pydocstringformatter._async_api._format_path", format_path)
+
+    async def check_order() -> list[str]:
+        names: list[str] = []
+        async for result in aformat_paths([tmp_path], max_in_flight=4):
+            names.append(result.path.name)
+            if len(names) == 3:
+                others_done.set()
+        return names
+
+    assert asyncio.run(check_order())[-1] == "file_0.py"
+    assert slow_file_started.is_set()
+
+
+def test_max_in_flight(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that no more than max_in_flight files are formatted at the same time."""
+    for index in range(10):
+        (tmp_path / f"file_{index}.py").write_text(SOURCE)
+    lock = threading.Lock()
+    in_flight = [0]
+    max_seen = [0]
+
+    def format_path(path: Path, config: FormatConfig, write: bool) -> FileFormatResult:
+        with lock:
+            in_flight[0] += 1
+            max_seen[0] = max(max_seen[0], in_flight[0])
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return _format_path(path, config, write)
+
+    monkeypatch.setattr("pydocstringformatter._async_api._format_path", format_path)
+    assert len(asyncio.run(collect(aformat_paths([tmp_path], max_in_flight=3)))) == 10
+    assert max_seen[0] == 3
+
+    with pytest.raises(PydocstringFormatterError):
+        asyncio.run(collect(aformat_paths([tmp_path], max_in_flight=0)))
+
+
+def test_cancellation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that files that weren't started are cancelled with the iteration."""
+    for index in range(10):
+        (tmp_path / f"file_{index}.py").write_text(SOURCE)
+    started: list[Path] = []
+
+    def format_path(path: Path, config: FormatConfig, write: bool) -> FileFormatResult:
+        started.append(path)
+        return _format_path(path, config, write)
+
+    monkeypatch.setattr("pydocstringformatter._async_api._format_path", format_path)
+
+    async def format_first_file() -> None:
+        iterator = aformat_paths([tmp_path], write=True, max_in_flight=2)
+        async for _ in iterator:
+            break
+        await iterator.aclose()  # type: ignore[attr-defined]
+
+    asyncio.run(format_first_file())
+    assert len(started) <= 2
+    assert sum(path.read_text() == FORMATTED for path in tmp_path.iterdir()) <= 2
@@ -0,0 +1,268 @@
+# pylint: disable = redefined-outer-name
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import pydocstringformatter
+from pydocstringformatter._caching import Cache, DirectoryCache, SQLiteCache
+from pydocstringformatter._testutils.cache_server import serve_cache
+from pydocstringformatter.run import _Run
+
+CORRECT_DOCSTRING = '"""A multi-line.\n\ndocstring.\n"""'
+
+
+@pytest.fixture
+def correct_files(tmp_path: Path) -> Path:
+    """A directory with correctly formatted files."""
+    directory = tmp_path / "package"
+    directory.mkdir()
+    for index in range(3):
+        (directory / f"file_{index}.py").write_text(
+            f"{CORRECT_DOCSTRING}\nVAR = {index}\n"
+        )
+    return directory
+
+
+def assert_no_tokenization(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make sure that files are not tokenized anymore."""
+
+    def raise_error(*_: object) -> None:
+        raise AssertionError("File was tokenized.")  # pragma: no cover
+
+    monkeypatch.setattr(_Run, "_locate_docstrings", raise_error)
+
+
+@pytest.mark.parametrize("backend", ["directory", "sqlite"])
+def test_cache_skips_correct_files(
+    backend: str,
+    correct_files: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that correct files are skipped on the second run."""
+    args = [str(correct_files), "--cache-backend", backend]
+    pydocstringformatter.run_docstring_formatter(args)
+
+    assert_no_tokenization(monkeypatch)
+    pydocstringformatter.run_docstring_formatter(args)
+
+    output = capsys.readouterr()
+    assert output.out.endswith(
+        "Nothing to do! All docstrings in 3 files are correct 🎉\n"
+    )
+
+
+def test_cache_is_invalidated(
+    correct_files: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that changes to the file or the configuration invalidate the cache."""
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+
+    # Changed content
+    file = correct_files / "file_0.py"
+    file.write_text('"""A multi-line\ndocstring"""')
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+    assert "+++" in capsys.readouterr().out
+
+    # Changed configuration
+    file.write_text('"""A docstring"""')
+    pydocstringformatter.run_docstring_formatter(
+        [str(correct_files), "--no-final-period"]
+    )
+    assert "+++" not in capsys.readouterr().out
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+    assert "+++" in capsys.readouterr().out
+
+
+def test_cache_is_not_used_for_changed_files(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that files that need changes are not cached."""
+    file = tmp_path / "test.py"
+    file.write_text('"""A multi-line\ndocstring"""')
+
+    for _ in range(2):
+        pydocstringformatter.run_docstring_formatter([str(file)])
+        assert "+++" in capsys.readouterr().out
+
+
+def test_no_cache(correct_files: Path, cache_dir: Path) -> None:
+    """Test that nothing is stored with the --no-cache option."""
+    pydocstringformatter.run_docstring_formatter([str(correct_files), "--no-cache"])
+    assert not cache_dir.exists()
+
+
+def test_clear_cache(correct_files: Path, cache_dir: Path) -> None:
+    """Test that the --clear-cache option removes all entries."""
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+    assert len(list(cache_dir.glob("*/*"))) == 3
+    assert (cache_dir / ".gitignore").read_text().endswith("*\n")
+
+    pydocstringformatter.run_docstring_formatter(
+        [str(correct_files), "--clear-cache", "--no-cache"]
+    )
+    assert not list(cache_dir.glob("*/*"))
+    assert (cache_dir / ".gitignore").exists()
+
+
+@pytest.mark.parametrize("backend", ["directory", "sqlite"])
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_unusable_cache(
+    backend: str,
+    jobs: str,
+    correct_files: Path,
+    cache_dir: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that a cache that can't be created turns the cache off."""
+    cache_dir.write_text("Not a directory")
+    pydocstringformatter.run_docstring_formatter(
+        [str(correct_files), "--cache-backend", backend, "--jobs", jobs]
+    )
+
+    output = capsys.readouterr()
+    assert output.out.endswith(
+        "Nothing to do! All docstrings in 3 files are correct 🎉\n"
+    )
+    assert output.err.count(f"Can't use the cache at {cache_dir}") == 1
+    assert cache_dir.read_text() == "Not a directory"
+
+
+@pytest.mark.parametrize("backend", [DirectoryCache, SQLiteCache])
+def test_lru_eviction(
+    backend: type[DirectoryCache | SQLiteCache], tmp_path: Path
+) -> None:
+    """Test that the least recently used entries are evicted."""
+    cache = backend(str(tmp_path), 1, "fingerprint")
+    keys = [f"00{index}" for index in range(300)]
+    for key in keys:
+        cache.add(key)
+    assert keys[0] in cache
+
+    cache.prune()
+
+    assert keys[0] in cache
+    assert all(key not in cache for key in keys[1:])
+
+
+@pytest.mark.parametrize("backend", [DirectoryCache, SQLiteCache])
+def test_eviction_below_maximum(
+    backend: type[DirectoryCache | SQLiteCache], tmp_path: Path
+) -> None:
+    """Test that entries are evicted to below the maximum, so later runs don't."""
+    cache = backend(str(tmp_path), 10, "fingerprint")
+    for index in range(10):
+        cache.add(f"{index:02x}{index}")
+    cache.prune()
+    assert all(f"{index:02x}{index}" in cache for index in range(10))
+
+    cache.add("0a10")
+    cache.prune()
+    assert sum(f"{index:02x}{index}" in cache for index in range(11)) == 9
+
+
+def test_prune_after_additions(
+    correct_files: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the cache is only pruned by runs that added entries to it."""
+    pruned: list[Cache] = []
+
+    def prune(cache: Cache) -> None:
+        pruned.append(cache)
+
+    monkeypatch.setattr(DirectoryCache, "prune", prune)
+
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+    assert len(pruned) == 1
+    pydocstringformatter.run_docstring_formatter([str(correct_files)])
+    assert len(pruned) == 1
+
+
+def testestimate_size(tmp_path: Path) -> None:
+    """Test that the size of a large directory cache is estimated from a sample."""
+    cache = DirectoryCache(str(tmp_path), 100_000, "fingerprint")
+    for index in (*range(4), 255):
+        (tmp_path / f"{index:02x}").mkdir()
+        for entry in range(10):
+            (tmp_path / f"{index:02x}" / f"{index:02x}{entry}").touch()
+
+    # A cache that is clearly smaller than its maximum is estimated from the
+    # first shards, which are fuller than the rest here
+    assert cache.estimate_size() == 40 * 256 // 16
+
+    # Otherwise all shards are counted
+    cache.max_entries = 10
+    assert cache.estimate_size() == 50
+
+
+def test_lru_eviction_across_shards(tmp_path: Path) -> None:
+    """Test that the directory backend counts the entries of all its shards."""
+    cache = DirectoryCache(str(tmp_path), 5, "fingerprint")
+    keys = [f"{index:02x}{index}" for index in range(1, 41)]
+    for key in keys:
+        cache.add(key)
+    assert not (tmp_path / "00").exists()
+
+    cache.prune()
+
+    assert len(list(tmp_path.glob("*/*"))) == 5
+
+
+def test_http_cache(
+    correct_files: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+    cache_dir: Path,
+) -> None:
+    """Test that the http backend can share a cache between runs."""
+    with serve_cache(max_entries=2) as server:
+        args = [
+            str(correct_files),
+            "--cache-backend",
+            "http",
+            "--cache-url",
+            server.url,
+        ]
+        pydocstringformatter.run_docstring_formatter(args)
+        assert len(server.entries) == 2
+
+        pydocstringformatter.run_docstring_formatter(args + ["--clear-cache"])
+        assert len(server.entries) == 2
+
+        server.max_entries = 10
+        pydocstringformatter.run_docstring_formatter(args)
+        assert len(server.entries) == 3
+
+        assert_no_tokenization(monkeypatch)
+        pydocstringformatter.run_docstring_formatter(args + ["--jobs", "2"])
+
+    assert not cache_dir.exists()
+    assert capsys.readouterr().out.endswith(
+        "Nothing to do! All docstrings in 3 files are correct 🎉\n"
+    )
+
+
+def test_http_cache_without_server(
+    capsys: pytest.CaptureFixture[str], correct_files: Path
+) -> None:
+    """Test that an unreachable server is treated as an empty cache."""
+    with serve_cache() as server:
+        url = server.url
+
+    pydocstringformatter.run_docstring_formatter(
+        [str(correct_files), "--cache-backend", "http", "--cache-url", url]
+    )
+
+    # The server is only tried once
+    output = capsys.readouterr()
+    assert output.err.count(f"Can't reach the cache server at {url}") == 1
+
+
+def test_http_cache_without_url(correct_files: Path) -> None:
+    """Test that the http backend requires an url."""
+    with pytest.raises(pydocstringformatter.PydocstringFormatterError):
+        pydocstringformatter.run_docstring_formatter(
+            [str(correct_files), "--cache-backend", "http"]
+        )
@@ -0,0 +1,178 @@
+# pylint: disable = redefined-outer-name
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import pydocstringformatter
+from pydocstringformatter._utils import GitError, find_python_files, get_changed_lines
+
+SOURCE = '''"""A docstring"""
+
+
+def func():
+    """A docstring"""
+
+
+def other_func():
+    """A docstring"""
+'''
+
+
+def git(*args: str) -> None:
+    """Run a git command in the current directory."""
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repository(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A git repository with a committed file and the repository as cwd."""
+    directory = tmp_path / "repository"
+    (directory / "package").mkdir(parents=True)
+    (directory / "package" / "committed.py").write_text(SOURCE)
+    (directory / "other.py").write_text(SOURCE)
+
+    monkeypatch.chdir(directory)
+    git("init", "--quiet")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@test", "commit", "-m", "Init")
+    return directory
+
+
+def test_changed_lines(repository: Path) -> None:
+    """Test that changed lines and untracked files are found."""
+    (repository / "package" / "committed.py").write_text(
+        SOURCE.replace('def other_func():\n    """A', 'def other_func():\n    """The')
+    )
+    (repository / "package" / "untracked.py").write_text(SOURCE)
+    (repository / "other.py").write_text(SOURCE.replace("def func():\n", ""))
+
+    assert get_changed_lines("HEAD") == {
+        Path(os.path.realpath(repository / "package" / "committed.py")): [(9, 9)],
+        Path(os.path.realpath(repository / "package" / "untracked.py")): None,
+        Path(os.path.realpath(repository / "other.py")): [(3, 4)],
+    }
+
+
+def test_changed_lines_with_space(repository: Path) -> None:
+    """Test that files with a space in their name are found."""
+    (repository / "with space.py").write_text(SOURCE)
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@test", "commit", "-m", "Add")
+    (repository / "with space.py").write_text(SOURCE.replace("A docstring", "Other"))
+
+    assert get_changed_lines("HEAD") == {
+        Path(os.path.realpath(repository / "with space.py")): [(1, 1), (5, 5), (9, 9)],
+    }
+
+
+def test_format_changed_docstrings(
+    repository: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that only changed docstrings in the given directories are formatted."""
+    (repository / "package" / "committed.py").write_text(
+        SOURCE.replace('def func():\n    """A', 'def func():\n    """The')
+    )
+    (repository / "package" / "untracked.py").write_text(SOURCE)
+    (repository / "other.py").write_text(SOURCE.replace("func", "function"))
+
+    pydocstringformatter.run_docstring_formatter(
+        ["package", "--changed-since", "HEAD", "--no-cache"]
+    )
+
+    output = capsys.readouterr().out
+    committed_diff, untracked_diff = output.split("+++ ")[1:]
+    assert "committed.py" in committed_diff
+    assert committed_diff.count("\n+") == 1
+    assert '+    """The docstring."""' in committed_diff
+    assert "untracked.py" in untracked_diff
+    assert untracked_diff.count('."""') == 3
+    assert "other.py" not in output
+
+
+@pytest.mark.usefixtures("repository")
+def test_unchanged_files(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that nothing is formatted without changes."""
+    pydocstringformatter.run_docstring_formatter([".", "--changed-since", "HEAD"])
+
+    output = capsys.readouterr().out
+    assert output == "Nothing to do! All docstrings in 0 files are correct 🎉\n"
+
+
+@pytest.mark.usefixtures("repository")
+def test_invalid_revision() -> None:
+    """Test that an invalid revision raises an error."""
+    with pytest.raises(GitError, match="unknown-revision"):
+        pydocstringformatter.run_docstring_formatter(
+            [".", "--changed-since", "unknown-revision"]
+        )
+
+
+def test_format_changed_docstrings_on_stdin(
+    repository: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the changed lines of the stdin filename are used."""
+    changed_source = SOURCE.replace('def func():\n    """A', 'def func():\n    """The')
+    (repository / "package" / "committed.py").write_text(changed_source)
+
+    for filename, expected_changes in (("package/committed.py", 1), ("other.py", 0)):
+        monkeypatch.setattr(
+            "sys.stdin", io.TextIOWrapper(io.BytesIO(changed_source.encode()))
+        )
+        pydocstringformatter.run_docstring_formatter(
+            ["-", "--stdin-filename", filename, "--changed-since", "HEAD"]
+        )
+        assert capsys.readouterr().out.count("\n+ ") == expected_changes
+
+
+def test_git_discovery(
+    repository: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that git lists the files that aren't ignored, with a fallback."""
+    (repository / ".gitignore").write_text("build/\n")
+    (repository / "build").mkdir()
+    (repository / "build" / "ignored.py").write_text(SOURCE)
+    (repository / "package" / "untracked.py").write_text(SOURCE)
+    (repository / "other.py").unlink()
+
+    assert find_python_files(["."], ["**/untracked.py"], git=True) == [
+        repository / "package" / "committed.py"
+    ]
+    assert find_python_files(["."], [], git=True) == [
+        repository / "package" / "committed.py",
+        repository / "package" / "untracked.py",
+    ]
+    assert not find_python_files(["build"], [], git=True)
+    assert find_python_files(["build"], [], git=False) == [
+        repository / "build" / "ignored.py"
+    ]
+
+    # The files of nested repositories and submodules are listed by them
+    (repository / "nested" / "package").mkdir(parents=True)
+    (repository / "nested" / "package" / "nested.py").write_text(SOURCE)
+    (repository / "nested" / "package" / "ignored.py").write_text(SOURCE)
+    (repository / "nested" / ".gitignore").write_text("ignored.py\n")
+    monkeypatch.chdir(repository / "nested")
+    git("init", "--quiet")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@test", "commit", "-m", "Init")
+    monkeypatch.chdir(repository)
+    git("-c", "protocol.file.allow=always", "submodule", "add", "./nested", "sub")
+    assert find_python_files(["."], [], git=True) == [
+        repository / "nested" / "package" / "nested.py",
+        repository / "package" / "committed.py",
+        repository / "package" / "untracked.py",
+        repository / "sub" / "package" / "nested.py",
+    ]
+
+    (tmp_path / "no_repository").mkdir()
+    (tmp_path / "no_repository" / "file.py").write_text(SOURCE)
+    assert find_python_files([str(tmp_path / "no_repository")], [], git=True) == [
+        tmp_path / "no_repository" / "file.py"
+    ]
@@ -304,3 +304,58 @@ class TestStyleOption:
         """Test that we leave a projecttoml without a section for this tool alone."""
         monkeypatch.chdir(CONFIG_DATA / "valid_toml_without_section")
         _Run(["test_package"])
+
+
+class TestNestedConfig:
+    """Test the configuration files of packages in a repository."""
+
+    @staticmethod
+    @pytest.fixture
+    def repository(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """A repository with a package with and one without a configuration."""
+        (tmp_path / "pyproject.toml").write_text(
+            "[tool.pydocstringformatter]\n"
+            "capitalize-first-letter = false\n"
+            "final-period = false\n"
+        )
+        repository = tmp_path / "repository"
+        (repository / ".git").mkdir(parents=True)
+        for package, config in (
+            ("configured", "[tool.pydocstringformatter]\nfinal-period = false\n"),
+            ("unconfigured", "[tool.black]\nline-length = 100\n"),
+        ):
+            (repository / package).mkdir()
+            (repository / package / "pyproject.toml").write_text(config)
+            (repository / package / "file.py").write_text('"""a docstring"""\n')
+        monkeypatch.chdir(repository)
+        return repository
+
+    @staticmethod
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_nearest_config(repository: Path, jobs: str) -> None:
+        """Test that files are formatted with the nearest configuration file.
+
+        Configuration files outside of the repository don't apply.
+        """
+        pydocstringformatter.run_docstring_formatter([".", "--write", "--jobs", jobs])
+
+        assert (repository / "configured" / "file.py").read_text() == (
+            '"""A docstring"""\n'
+        )
+        assert (repository / "unconfigured" / "file.py").read_text() == (
+            '"""A docstring."""\n'
+        )
+
+    @staticmethod
+    def test_command_line_options(repository: Path) -> None:
+        """Test that command line options apply on top of every configuration."""
+        pydocstringformatter.run_docstring_formatter(
+            [".", "--write", "--no-capitalize-first-letter"]
+        )
+
+        assert (repository / "configured" / "file.py").read_text() == (
+            '"""a docstring"""\n'
+        )
+        assert (repository / "unconfigured" / "file.py").read_text() == (
+            '"""a docstring."""\n'
+        )
@@ -62,3 +62,41 @@ def test_conflicting_formatters(
 
     for expect_err in expected_errors:
         assert expect_err in str(err.value), str(err.value)
+
+
+def test_conflicting_formatters_parallel(tmp_path: Path) -> None:
+    """Tests that conflicting formatters raise an error in a parallel run."""
+    for index in range(4):
+        (tmp_path / f"test_{index}.py").write_text('"""AAA AA AAA"""')
+
+    with patched_run([test_utils.MakeAFormatter(), test_utils.MakeBFormatter()]) as run:
+        with pytest.raises(UnstableResultError) as err:
+            run([str(tmp_path), "--jobs", "2"])
+
+    assert "Conflicting formatters" in str(err.value)
+
+
+def test_conflicting_formatters_without_stability_check(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    """Test that conflicting formatters aren't detected without a stability check."""
+    test_file = tmp_path / "test.py"
+    test_file.write_text('"""AAA AA AAA"""')
+
+    with patched_run([test_utils.MakeAFormatter(), test_utils.MakeBFormatter()]) as run:
+        run([str(test_file), "--stability-check", "never"])
+
+    assert '+"""BBB BB BBB"""' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("stability_check", ["always", "changed"])
+def test_conflicting_formatters_not_deterministic(
+    tmp_path: Path, stability_check: str
+) -> None:
+    """Test that formatters that aren't known to be deterministic are always checked."""
+    test_file = tmp_path / "test.py"
+    test_file.write_text('"""AAA AA AAA"""')
+
+    with patched_run([test_utils.MakeAFormatter(), test_utils.MakeBFormatter()]) as run:
+        with pytest.raises(UnstableResultError):
+            run([str(test_file), "--stability-check", stability_check])
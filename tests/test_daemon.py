@@ -0,0 +1,196 @@
+# pylint: disable = redefined-outer-name
+from __future__ import annotations
+
+import io
+import socket
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+import pydocstringformatter
+from pydocstringformatter import PydocstringFormatterError
+from pydocstringformatter._daemon import (
+    DaemonClient,
+    FormatRequest,
+    format_with_daemon,
+    run_daemon,
+)
+from pydocstringformatter._daemon.protocol import Address
+from pydocstringformatter._daemon.server import DaemonServer, create_server
+
+SOURCE = '"""a docstring"""\n\n\ndef func():\n    """another docstring"""\n'
+FORMATTED = '"""A docstring."""\n\n\ndef func():\n    """Another docstring."""\n'
+
+
+def serve(address: Address) -> Iterator[DaemonServer]:
+    """Run a daemon in a background thread."""
+    server = create_server(address)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.fixture
+def daemon() -> Iterator[DaemonServer]:
+    """A daemon that listens on a free local port."""
+    yield from serve(("127.0.0.1", 0))
+
+
+@pytest.fixture
+def client(daemon: DaemonServer) -> DaemonClient:
+    """A client of the daemon."""
+    return DaemonClient(daemon.server_address[:2])  # type: ignore[arg-type]
+
+
+def free_port() -> int:
+    """Find a port that nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+class TestDaemon:
+    """Tests for formatting sources with the daemon."""
+
+    @staticmethod
+    def test_format(client: DaemonClient) -> None:
+        """Test that the daemon formats a source and creates a diff."""
+        result = client.format(FormatRequest(SOURCE, filename="test.py", diff=True))
+        assert result.source == FORMATTED
+        assert result.is_changed
+        assert '+"""A docstring."""' in result.diff
+        assert "test.py" in result.diff
+
+        result = client.format(FormatRequest(FORMATTED))
+        assert result.source == FORMATTED
+        assert not result.is_changed
+        assert not result.diff
+
+    @staticmethod
+    def test_newlines(client: DaemonClient) -> None:
+        """Test that the newlines of the source are kept."""
+        result = client.format(FormatRequest(SOURCE.replace("\n", "\r\n")))
+        assert result.source == FORMATTED.replace("\n", "\r\n")
+
+    @staticmethod
+    def test_options(client: DaemonClient) -> None:
+        """Test that the options of a request are used."""
+        result = client.format(FormatRequest(SOURCE, ["--no-final-period"]))
+        assert result.source == FORMATTED.replace(".", "")
+
+        result = client.format(FormatRequest(SOURCE))
+        assert result.source == FORMATTED
+
+    @staticmethod
+    def test_configured_runs_are_reused(
+        daemon: DaemonServer, client: DaemonClient, tmp_path: Path
+    ) -> None:
+        """Test that runs are reused until the pyproject.toml file changes."""
+        client.format(FormatRequest(SOURCE, directory=str(tmp_path)))
+        run = daemon.runs.get(str(tmp_path), [])
+        client.format(FormatRequest(SOURCE, directory=str(tmp_path)))
+        assert daemon.runs.get(str(tmp_path), []) is run
+
+        (tmp_path / "pyproject.toml").write_text(
+            "[tool.pydocstringformatter]\nfinal-period = false\n"
+        )
+        result = client.format(FormatRequest(SOURCE, directory=str(tmp_path)))
+        assert result.source == FORMATTED.replace(".", "")
+        assert daemon.runs.get(str(tmp_path), []) is not run
+
+    @staticmethod
+    def test_invalid_options(client: DaemonClient) -> None:
+        """Test that invalid options are reported to the client."""
+        with pytest.raises(PydocstringFormatterError, match="invalid choice"):
+            client.format(FormatRequest(SOURCE, ["--stability-check", "sometimes"]))
+
+    @staticmethod
+    def test_invalid_request(daemon: DaemonServer) -> None:
+        """Test that the daemon responds to invalid requests with an error."""
+        host, port = daemon.server_address[:2]
+        with socket.create_connection((str(host), port)) as sock:
+            sock.sendall(b"POST / HTTP/1.0\r\nContent-Length: 2\r\n\r\n[]")
+            response = sock.makefile("rb").read()
+        assert response.startswith(b"HTTP/1.0 400")
+        assert b"Invalid request" in response
+
+    @staticmethod
+    def test_unix_socket(tmp_path: Path) -> None:
+        """Test that the daemon can listen on a unix socket."""
+        path = str(tmp_path / "daemon.sock")
+        for _ in serve(path):
+            result = DaemonClient(path).format(FormatRequest(SOURCE))
+            assert result.source == FORMATTED
+        assert not Path(path).exists()
+
+
+def test_fallback_without_daemon() -> None:
+    """Test that sources are formatted in-process when the daemon isn't running."""
+    result = format_with_daemon(("127.0.0.1", free_port()), FormatRequest(SOURCE))
+    assert result.source == FORMATTED
+
+    with pytest.raises(PydocstringFormatterError, match="invalid choice"):
+        format_with_daemon(
+            ("127.0.0.1", free_port()),
+            FormatRequest(SOURCE, ["--stability-check", "sometimes"]),
+        )
+
+
+def test_format_command(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test that the format command formats stdin."""
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(SOURCE.encode())))
+    port = str(free_port())
+    assert run_daemon(["format", "--port", port, "--", "--no-final-period"]) == 0
+    assert capsys.readouterr().out == FORMATTED.replace(".", "")
+
+
+def test_format_command_encoding(
+    monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Test that the format command keeps the encoding of the source."""
+    source = "# -*- coding: latin-1 -*-\n'''café'''\n".encode("latin-1")
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(source)))
+    assert run_daemon(["format", "--port", str(free_port())]) == 0
+    assert capsysbinary.readouterr().out == (
+        '# -*- coding: latin-1 -*-\n"""Café."""\n'.encode("latin-1")
+    )
+
+
+def test_module_entry_point() -> None:
+    """Test that the daemon can be run as a module."""
+    process = subprocess.run(
+        [sys.executable, "-m", "pydocstringformatter._daemon", "format"]
+        + ["--port", str(free_port())],
+        input=SOURCE.encode(),
+        capture_output=True,
+        check=True,
+        cwd=Path(pydocstringformatter.__file__).parents[1],
+    )
+    assert process.stdout == FORMATTED.encode()
+
+
+def test_client_imports() -> None:
+    """Test that the client only imports the formatters when it needs them."""
+    code = (
+        "import sys, pydocstringformatter._daemon; "
+        "print('pydocstringformatter.run' in sys.modules)"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=Path(pydocstringformatter.__file__).parents[1],
+        text=True,
+    )
+    assert process.stdout == "False\n"
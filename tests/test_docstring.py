@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import tokenize
+from typing import Literal
+
+from pydocstringformatter._api import FormatConfig
+from pydocstringformatter._formatting import Docstring
+from pydocstringformatter._formatting.base import SummaryFormatter
+from pydocstringformatter._formatting.formatters_numpydoc import (
+    NumpydocSectionOrderingFormatter,
+)
+from pydocstringformatter._pipeline import FormattingPipeline
+from pydocstringformatter._testutils import MakeAFormatter
+
+
+def _docstring_token(string: str, indent: int = 4) -> tokenize.TokenInfo:
+    """Create the token of a docstring."""
+    return tokenize.TokenInfo(
+        tokenize.STRING, string, (2, indent), (2, indent + len(string)), ""
+    )
+
+
+class _UpperSummaryFormatter(SummaryFormatter):
+    """Make the summary uppercase."""
+
+    name = "upper-summary"
+
+    def treat_summary(
+        self,
+        summary: str,
+        indent_length: int,
+        quotes_length: Literal[1, 3],
+        description_exists: bool,
+    ) -> str:
+        return summary.upper()
+
+
+class _QuotedSummaryFormatter(_UpperSummaryFormatter):
+    """Overrides treat_string, like a formatter written before treat_docstring."""
+
+    name = "quoted-summary"
+
+    def treat_string(
+        self,
+        tokeninfo: tokenize.TokenInfo,
+        indent_length: int,
+        quotes: str,
+        quotes_length: Literal[1, 3],
+    ) -> str:
+        return tokeninfo.string.replace("summary", "'summary'")
+
+
+class TestDocstring:
+    """Test the docstring that is shared by the formatters."""
+
+    @staticmethod
+    def test_parts_are_shared() -> None:
+        """Test that the parts are parsed once until the docstring changes."""
+        docstring = Docstring(_docstring_token('"""A summary.\n\n    Body.\n    """'))
+        parts = docstring.summary_and_description
+        assert parts.prefix == ""
+        assert parts.summary == "A summary."
+        assert parts.description == "    Body."
+        assert parts.closing_quotes_on_new_line
+        assert parts.round_trips
+
+        _UpperSummaryFormatter().treat_docstring(docstring)
+        assert docstring.summary_and_description is not parts
+        assert docstring.string == '"""A SUMMARY.\n\n    Body.\n    """'
+        assert docstring.changes == 1
+
+        parts = docstring.summary_and_description
+        _UpperSummaryFormatter().treat_docstring(docstring)
+        assert docstring.summary_and_description is parts
+        assert docstring.changes == 1
+
+    @staticmethod
+    def test_unchanged_parts_that_dont_round_trip() -> None:
+        """Test that unchanged parts still change a docstring they don't round trip.
+
+        Splitting the summary removes the indentation before the closing quotes.
+        """
+        docstring = Docstring(_docstring_token('"""SUMMARY  """', indent=2))
+        assert not docstring.summary_and_description.round_trips
+
+        _UpperSummaryFormatter().treat_docstring(docstring)
+        assert docstring.string == '"""SUMMARY"""'
+        assert docstring.changes == 1
+
+    @staticmethod
+    def test_numpydoc_sections() -> None:
+        """Test that formatters get a copy of the sections."""
+        string = (
+            '"""Summary.\n\n    Returns\n    -------\n    int\n\n'
+            '    Parameters\n    ----------\n    a : int\n    """'
+        )
+        docstring = Docstring(_docstring_token(string))
+        sections = docstring.numpydoc_sections
+        assert list(sections.sections) == ["Summary", "Returns", "Parameters"]
+        assert sections.round_trips
+
+        NumpydocSectionOrderingFormatter().treat_docstring(docstring)
+        assert list(sections.sections) == ["Summary", "Returns", "Parameters"]
+        assert list(docstring.numpydoc_sections.sections) == [
+            "Summary",
+            "Parameters",
+            "Returns",
+        ]
+        assert docstring.changes == 1
+
+    @staticmethod
+    def test_string_formatters() -> None:
+        """Test that formatters that override the string methods are still used."""
+        string = '"""A summary."""'
+        docstring = Docstring(_docstring_token(string))
+        _QuotedSummaryFormatter().treat_docstring(docstring)
+        assert docstring.string == "\"\"\"A 'summary'.\"\"\""
+
+        docstring = Docstring(_docstring_token('"""B."""'))
+        MakeAFormatter().treat_docstring(docstring)
+        assert docstring.string == '"""A."""'
+
+    @staticmethod
+    def test_pipeline_changers() -> None:
+        """Test that only the formatters that change the docstring are reported."""
+        pipeline = FormattingPipeline(
+            FormatConfig(fused_pipeline=False).to_namespace()
+        )
+        token = _docstring_token('"""a summary"""')
+        # pylint: disable-next=protected-access
+        new_token, changers = pipeline._apply_formatters_once(token)
+        assert new_token.string == '"""A summary."""'
+        assert changers == {"capitalize-first-letter", "final-period"}
+
+        # pylint: disable-next=protected-access
+        assert pipeline._apply_formatters_once(new_token) == (new_token, set())
@@ -1,6 +1,20 @@
 from __future__ import annotations
 
+import argparse
+import copy
+import tokenize
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from pydocstringformatter import __version__
+from pydocstringformatter._configuration.arguments_manager import ArgumentsManager
 from pydocstringformatter._formatting import FORMATTERS
+from pydocstringformatter._pipeline import FormattingPipeline
+from pydocstringformatter._utils import DOCSTRING_LOCATORS
+
+FORMAT_DATA = Path(__file__).parent / "data" / "format"
 
 
 def test_formatter_names() -> None:
@@ -12,3 +26,94 @@ def test_formatter_names() -> None:
             formatter.name not in formatter_names
         ), "Each formatter should have an unique name."
         formatter_names.add(formatter.name)
+
+
+def _get_format_tests() -> Iterator[tuple[list[str], list[tokenize.TokenInfo]]]:
+    """Yield the options and docstrings of the files in tests/data/format."""
+    for path in sorted(FORMAT_DATA.glob("**/*.py*")):
+        if path.suffix not in {".py", ".out"}:
+            continue
+        args_file = path.parent / f"{path.name.split('.')[0]}.args"
+        args = (
+            args_file.read_text(encoding="utf-8").split() if args_file.exists() else []
+        )
+        with tokenize.open(path) as file:
+            yield args, DOCSTRING_LOCATORS["tokenize"](file.read())
+
+
+@pytest.mark.parametrize(
+    "name",
+    [formatter.name for formatter in FORMATTERS if formatter.deterministic],
+)
+def test_deterministic_formatters(name: str) -> None:
+    """Test that formatters that claim to be deterministic are deterministic.
+
+    For all docstrings in tests/data/format and their formatted versions, the
+    formatter should return the same token every time it is run on a token, also
+    after it has formatted other tokens.
+    """
+    # Copies, so the configuration of the global formatters isn't changed
+    formatters = [copy.copy(formatter) for formatter in FORMATTERS]
+    formatter = next(formatter for formatter in formatters if formatter.name == name)
+    arguments_manager = ArgumentsManager(__version__, formatters)
+    tokens: list[tuple[argparse.Namespace, tokenize.TokenInfo]] = []
+    for args, docstrings in _get_format_tests():
+        arguments_manager.parse_options(["test.py", *args])
+        namespace = copy.copy(arguments_manager.namespace)
+        formatter.set_config_namespace(namespace)
+        for docstring in docstrings:
+            tokens.append((namespace, docstring))
+            tokens.append((namespace, formatter.treat_token(docstring)))
+
+    formatted = []
+    for namespace, token in tokens:
+        formatter.set_config_namespace(namespace)
+        formatted.append(formatter.treat_token(token))
+    for (namespace, token), expected in zip(reversed(tokens), reversed(formatted)):
+        formatter.set_config_namespace(namespace)
+        assert formatter.treat_token(token) == expected
+
+
+def _parse_options(argv: list[str]) -> argparse.Namespace:
+    """Parse the options with a new ArgumentsManager, so no options are left over."""
+    arguments_manager = ArgumentsManager(__version__, FORMATTERS)
+    arguments_manager.parse_options(argv)
+    return arguments_manager.namespace
+
+
+def test_fused_default_formatters() -> None:
+    """Test that the fused default formatters give the same result as the formatters.
+
+    For all docstrings in tests/data/format and their formatted versions, the
+    fused formatters should return the same string as the formatters applied
+    one after the other.
+    """
+    fused_files = 0
+    for args, docstrings in _get_format_tests():
+        fused, in_turn = (
+            FormattingPipeline(_parse_options(["test.py", *args, *fused_args]))
+            for fused_args in ([], ["--no-fused-pipeline"])
+        )
+        assert not in_turn.fused
+        fused_files += bool(fused.fused)
+
+        for docstring in docstrings:
+            token, _, _ = in_turn.apply_formatters(docstring)
+            for original in (docstring, token):
+                assert (
+                    fused.apply_formatters(original)[0].string
+                    == in_turn.apply_formatters(original)[0].string
+                )
+    assert fused_files
+
+
+def test_fused_only_default_formatters() -> None:
+    """Test that the formatters are only fused if the default formatters are enabled."""
+    for args, is_fused in (
+        ([], True),
+        (["--style=numpydoc"], False),
+        (["--linewrap-full-docstring"], False),
+        (["--no-strip-whitespaces"], False),
+    ):
+        pipeline = FormattingPipeline(_parse_options(["test.py", *args]))
+        assert bool(pipeline.fused) is is_fused
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import pydocstringformatter
+from pydocstringformatter._utils import get_skip_reason
+
+INCORRECT_DOCSTRING = '"""A multi-line\ndocstring"""\n'
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        (b"VAR = 1\n", "no strings"),
+        (b"VAR = (1\n", None),
+        (b'"""A docstring."""\n', None),
+        (b"# @generated\nVAR = '1'\n", "generated"),
+        (b"# DO NOT EDIT!\nVAR = '1'\n", "generated"),
+        (b"\n" * 10 + b"# @generated\nVAR = '1'\n", None),
+        (b"VAR = '" + b"1" * 100 + b"'\n", "too large"),
+    ],
+)
+def test_get_skip_reason(data: bytes, expected: str | None) -> None:
+    """Test the reasons to skip a file."""
+    assert get_skip_reason(data, [b"@generated", b"DO NOT EDIT"], 100) == expected
+
+
+def test_invalid_file_without_strings(tmp_path: Path) -> None:
+    """Test that a file without quotes that isn't valid Python is still reported."""
+    (tmp_path / "invalid.py").write_text("VAR = (1\n")
+
+    with pytest.raises(pydocstringformatter.ParsingError):
+        pydocstringformatter.run_docstring_formatter([str(tmp_path)])
+
+
+def test_skip_generated_files(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    """Test that generated files are not formatted and that we count them."""
+    (tmp_path / "generated.py").write_text("# @generated\n" + INCORRECT_DOCSTRING)
+    (tmp_path / "large.py").write_text("# " + "a" * 100 + "\n" + INCORRECT_DOCSTRING)
+    (tmp_path / "no_strings.py").write_text("VAR = 1\n")
+    (tmp_path / "test.py").write_text(INCORRECT_DOCSTRING)
+
+    pydocstringformatter.run_docstring_formatter(
+        [
+            str(tmp_path),
+            "--generated-markers",
+            "@generated,DO NOT EDIT",
+            "--max-file-size",
+            "100",
+            "--statistics",
+            "--no-cache",
+        ]
+    )
+
+    output = capsys.readouterr()
+    assert output.out.count("+++") == 1
+    assert "test.py" in output.out
+    assert output.err.startswith("Statistics:\n")
+    assert "    files: 4\n" in output.err
+    assert "    skipped (generated): 1\n" in output.err
+    assert "    skipped (too large): 1\n" in output.err
+    assert "    skipped (no strings): 1\n" in output.err
+    assert "estimated time saved by skipping" in output.err
@@ -1,17 +1,23 @@
 # pylint: disable = redefined-outer-name
+import io
 import os
+import subprocess
 import sys
+import tokenize
 from pathlib import Path
 
 import pytest
 
 import pydocstringformatter
+from pydocstringformatter import ParsingError, PydocstringFormatterError
 from pydocstringformatter._formatting import FORMATTERS
 from pydocstringformatter._formatting.base import StringFormatter
 from pydocstringformatter._formatting.formatters_pep257 import (
     SplitSummaryAndDocstringFormatter,
 )
+from pydocstringformatter._pipeline import FormattingPipeline
 from pydocstringformatter._testutils import FormatterAsserter
+from pydocstringformatter._testutils.benchmarks.startup import LAZY_MODULES
 
 
 def test_no_arguments(capsys: pytest.CaptureFixture[str]) -> None:
@@ -173,6 +179,113 @@ def test_optional_formatters_argument(
         asserter.assert_no_change_when_deactivated()
 
 
+def test_write_keeps_encoding(tmp_path: Path) -> None:
+    """Test that files are written with their own encoding and newlines."""
+    test_file = tmp_path / "test.py"
+    test_file.write_bytes(b"# coding: latin-1\r\ndef func():\r\n    '\xe9t\xe9'\r\n")
+
+    pydocstringformatter.run_docstring_formatter([str(test_file), "--write"])
+
+    assert test_file.read_bytes() == (
+        b'# coding: latin-1\r\ndef func():\r\n    """\xc9t\xe9."""\r\n'
+    )
+
+
+def test_lazy_imports() -> None:
+    """Test that modules only some runs need aren't imported on startup."""
+    code = (
+        "import sys, pydocstringformatter.run; "
+        f"print(*[name for name in {LAZY_MODULES!r} if name in sys.modules])"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=Path(pydocstringformatter.__file__).parents[1],
+        text=True,
+    )
+    assert process.stdout == "\n"
+
+    # The library API is still available from the package
+    assert pydocstringformatter.FormatConfig().max_line_length == 88
+    assert "format_source" in dir(pydocstringformatter)
+    with pytest.raises(AttributeError):
+        getattr(pydocstringformatter, "unknown")
+
+
+class TestWrite:
+    """Tests for writing formatted files."""
+
+    @staticmethod
+    @pytest.mark.skipif(os.name == "nt", reason="Permissions and symlinks of POSIX")
+    def test_write_keeps_metadata(tmp_path: Path) -> None:
+        """Test that files are replaced with the same permissions, through symlinks."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text('"""docstring"""\n', encoding="utf-8")
+        test_file.chmod(0o640)
+        link = tmp_path / "link.py"
+        link.symlink_to(test_file)
+
+        pydocstringformatter.run_docstring_formatter([str(link), "--write"])
+
+        assert link.is_symlink()
+        assert test_file.read_text(encoding="utf-8") == '"""Docstring."""\n'
+        assert test_file.stat().st_mode & 0o777 == 0o640
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "link.py",
+            "test.py",
+        ]
+
+    @staticmethod
+    @pytest.mark.skipif(
+        os.name == "nt" or os.geteuid() == 0, reason="Permissions of other users"
+    )
+    def test_write_read_only_file(tmp_path: Path) -> None:
+        """Test that files without write permission aren't replaced."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text('"""docstring"""\n', encoding="utf-8")
+        test_file.chmod(0o444)
+
+        with pytest.raises(PermissionError):
+            pydocstringformatter.run_docstring_formatter([str(test_file), "--write"])
+
+        assert test_file.read_text(encoding="utf-8") == '"""docstring"""\n'
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    @staticmethod
+    def test_interrupted_write(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Test that a file is left untouched if it can't be replaced."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text('"""docstring"""\n', encoding="utf-8")
+
+        def replace(src: str, dst: str) -> None:
+            raise OSError("Interrupted")
+
+        monkeypatch.setattr(os, "replace", replace)
+        with pytest.raises(OSError, match="Interrupted"):
+            pydocstringformatter.run_docstring_formatter([str(test_file), "--write"])
+
+        assert test_file.read_text(encoding="utf-8") == '"""docstring"""\n'
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    @staticmethod
+    @pytest.mark.skipif(os.name == "nt", reason="Directories can't be flushed")
+    def test_fsync(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        """Test that --fsync flushes each file and their directory once."""
+        for index in range(3):
+            (tmp_path / f"test_{index}.py").write_text('"""docstring"""\n')
+        synced: list[int] = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+
+        pydocstringformatter.run_docstring_formatter(
+            [str(tmp_path), "--write", "--fsync"]
+        )
+
+        assert len(synced) == 4
+        for index in range(3):
+            assert (tmp_path / f"test_{index}.py").read_text() == '"""Docstring."""\n'
+
+
 class TestExitCodes:
     """Tests for the --exit-code option."""
 
@@ -211,3 +324,301 @@ class TestExitCodes:
             )
 
         assert exit_exec.value.code == 32
+
+
+class TestJobsOption:
+    """Tests for the --jobs option."""
+
+    @staticmethod
+    def test_parallel_output_is_ordered(
+        capsys: pytest.CaptureFixture[str], tmp_path: Path
+    ) -> None:
+        """Test that a parallel run prints the same output as a serial run."""
+        for index in range(10):
+            (tmp_path / f"test_{index}.py").write_text('"""A multi-line\ndocstring"""')
+
+        pydocstringformatter.run_docstring_formatter([str(tmp_path)])
+        serial_output = capsys.readouterr()
+
+        pydocstringformatter.run_docstring_formatter([str(tmp_path), "--jobs", "3"])
+        parallel_output = capsys.readouterr()
+
+        assert parallel_output.out == serial_output.out
+        assert parallel_output.out.count("+++") == 10
+        assert not parallel_output.err
+
+    @staticmethod
+    def test_parallel_error(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+        """Test that a parallel run prints the output of the files before an error.
+
+        The last files are sent to the processes in chunks of several files, the
+        output of the files before the invalid file in its chunk should be kept.
+        """
+        for index in range(39):
+            (tmp_path / f"test_{index:02}.py").write_text(
+                '"""A multi-line\ndocstring"""'
+            )
+        (tmp_path / "test_39.py").write_text('def func(:\n    """A docstring"""')
+
+        with pytest.raises(ParsingError):
+            pydocstringformatter.run_docstring_formatter([str(tmp_path)])
+        serial_output = capsys.readouterr()
+
+        with pytest.raises(ParsingError):
+            pydocstringformatter.run_docstring_formatter([str(tmp_path), "--jobs", "2"])
+        parallel_output = capsys.readouterr()
+
+        assert parallel_output.out == serial_output.out
+        assert parallel_output.out.count("+++") == 39
+
+    @staticmethod
+    def test_parallel_write(capsys: pytest.CaptureFixture[str], tmp_path: Path) -> None:
+        """Test that a parallel run writes files and reports them in order."""
+        filenames = [tmp_path / f"test_{index}.py" for index in range(4)]
+        for filename in filenames:
+            filename.write_text('"""A multi-line\ndocstring"""')
+
+        with pytest.raises(SystemExit) as exit_exec:
+            pydocstringformatter.run_docstring_formatter(
+                [str(tmp_path), "--write", "--exit-code", "--jobs", "auto"]
+            )
+        assert exit_exec.value.code == 32
+
+        output = capsys.readouterr()
+        assert output.out == "".join(
+            f"Formatted {os.path.relpath(filename)} 📖\n" for filename in filenames
+        )
+        for filename in filenames:
+            assert filename.read_text() == '"""A multi-line.\n\ndocstring\n"""'
+
+    @staticmethod
+    @pytest.mark.parametrize("value", ["0", "-1", "many"])
+    def test_invalid_jobs(capsys: pytest.CaptureFixture[str], value: str) -> None:
+        """Test that we reject values that aren't a positive integer or 'auto'."""
+        with pytest.raises(SystemExit) as exit_exec:
+            pydocstringformatter.run_docstring_formatter(["--jobs", value])
+        assert exit_exec.value.code == 2
+
+        output = capsys.readouterr()
+        assert f"'{value}' is not a positive integer or 'auto'" in output.err
+
+
+class TestDocstringMemo:
+    """Tests for the memo of formatted docstrings."""
+
+    @staticmethod
+    def test_identical_docstrings(
+        capsys: pytest.CaptureFixture[str], tmp_path: Path
+    ) -> None:
+        """Test that identical docstrings are formatted once with the same result."""
+        source = (
+            '"""A docstring"""\n\n\ndef func():\n    """A docstring"""\n\n\n'
+            'def other_func():\n    """A docstring"""\n'
+        )
+        for index in range(2):
+            (tmp_path / f"test_{index}.py").write_text(source)
+
+        pydocstringformatter.run_docstring_formatter([str(tmp_path), "--statistics"])
+        output = capsys.readouterr()
+        assert output.out.count('+    """A docstring."""') == 4
+        assert output.out.count('+"""A docstring."""') == 2
+        # Indented and module docstrings are remembered separately
+        assert "docstring memo hits: 4\n" in output.err
+        assert "docstring memo misses: 2\n" in output.err
+
+        pydocstringformatter.run_docstring_formatter(
+            [str(tmp_path), "--statistics", "--docstring-memo-size", "0"]
+        )
+        uncached_output = capsys.readouterr()
+        assert uncached_output.out == output.out
+        assert "docstring memo hits" not in uncached_output.err
+        assert "docstring memo misses: 6\n" in uncached_output.err
+
+
+class TestStabilityCheck:
+    """Tests for the --stability-check option."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "stability_check,docstring,expected_passes",
+        [
+            ("always", '"""A docstring."""', 2),
+            ("changed", '"""A docstring."""', 1),
+            ("never", '"""A docstring."""', 1),
+            ("always", '"""A docstring"""', 3),
+            ("changed", '"""A docstring"""', 2),
+        ],
+    )
+    def test_formatter_passes(
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        stability_check: str,
+        docstring: str,
+        expected_passes: int,
+    ) -> None:
+        """Test that the stability check is skipped if the last pass changed nothing."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text(docstring)
+        passes: list[tokenize.TokenInfo] = []
+        # pylint: disable-next=protected-access
+        apply_formatters_once = FormattingPipeline._apply_formatters_once
+
+        def counting_apply_formatters_once(
+            pipeline: FormattingPipeline, token: tokenize.TokenInfo
+        ) -> tuple[tokenize.TokenInfo, set[str]]:
+            passes.append(token)
+            return apply_formatters_once(pipeline, token)
+
+        monkeypatch.setattr(
+            FormattingPipeline,
+            "_apply_formatters_once",
+            counting_apply_formatters_once,
+        )
+        pydocstringformatter.run_docstring_formatter(
+            [str(test_file), "--stability-check", stability_check]
+        )
+
+        assert len(passes) == expected_passes
+
+
+class TestLineRanges:
+    """Tests for the --line-ranges option."""
+
+    source = (
+        '"""A docstring"""\n\n\ndef func():\n    """A docstring"""\n\n\n'
+        'def other_func():\n    """A multi-line\n    docstring"""\n'
+    )
+
+    def test_format_docstrings_in_ranges(
+        self, capsys: pytest.CaptureFixture[str], tmp_path: Path
+    ) -> None:
+        """Test that only docstrings that overlap with the ranges are formatted."""
+        test_file = tmp_path / "test.py"
+        test_file.write_text(self.source)
+
+        pydocstringformatter.run_docstring_formatter(
+            [str(test_file), "--line-ranges", "2-4", "--line-ranges", "10-12"]
+        )
+        diff = capsys.readouterr().out
+        assert diff.count("\n-") == 2
+        assert '-"""A docstring"""' not in diff
+        assert '-    """A docstring"""' not in diff
+        assert '+    """A multi-line.\n' in diff
+
+        pydocstringformatter.run_docstring_formatter(
+            [str(test_file), "--line-ranges", "1-1,5-5", "--write"]
+        )
+        assert test_file.read_text() == self.source.replace(
+            'docstring"""\n\n', 'docstring."""\n\n'
+        )
+
+    def test_single_file_only(self, tmp_path: Path) -> None:
+        """Test that line ranges can't be used to format multiple files."""
+        (tmp_path / "test_1.py").write_text(self.source)
+        (tmp_path / "test_2.py").write_text(self.source)
+
+        with pytest.raises(PydocstringFormatterError, match="single file"):
+            pydocstringformatter.run_docstring_formatter(
+                [str(tmp_path), "--line-ranges", "1-2"]
+            )
+
+    @staticmethod
+    @pytest.mark.parametrize("value", ["1", "a-2", "0-1", "3-2", "1-2,"])
+    def test_invalid_line_ranges(
+        capsys: pytest.CaptureFixture[str], value: str
+    ) -> None:
+        """Test that we reject values that aren't START-END line ranges."""
+        with pytest.raises(SystemExit) as exit_exec:
+            pydocstringformatter.run_docstring_formatter(["--line-ranges", value])
+        assert exit_exec.value.code == 2
+
+        output = capsys.readouterr()
+        assert "is not a valid START-END line range" in output.err
+
+
+class TestStdin:
+    """Tests for formatting the source on stdin."""
+
+    source = '"""A docstring"""\n\n\ndef func():\n    """A docstring"""\n'
+
+    @staticmethod
+    def set_stdin(monkeypatch: pytest.MonkeyPatch, data: bytes) -> None:
+        """Replace stdin with a stream of data."""
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(data)))
+
+    def test_diff(
+        self, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the diff is written to stdout."""
+        self.set_stdin(monkeypatch, self.source.encode())
+        pydocstringformatter.run_docstring_formatter(
+            ["-", "--stdin-filename", "test.py"]
+        )
+        output = capsys.readouterr().out
+        assert output.startswith("--- test.py\n+++ test.py\n")
+        assert '+"""A docstring."""' in output
+        assert "Nothing to do" not in output
+
+    def test_write(
+        self,
+        capsysbinary: pytest.CaptureFixture[bytes],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that the formatted source is written to stdout with its newlines."""
+        source = self.source.replace("\n", "\r\n").encode()
+        self.set_stdin(monkeypatch, source)
+        pydocstringformatter.run_docstring_formatter(["-", "--write"])
+        assert capsysbinary.readouterr().out == source.replace(
+            b'docstring"""', b'docstring."""'
+        )
+
+        # Correct sources are written unchanged
+        self.set_stdin(monkeypatch, b'"""A docstring."""\r\n')
+        pydocstringformatter.run_docstring_formatter(["-", "--write"])
+        assert capsysbinary.readouterr().out == b'"""A docstring."""\r\n'
+
+    @pytest.mark.usefixtures("capsys")
+    def test_no_files_are_touched(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test that formatting stdin doesn't search for files or use the cache."""
+        monkeypatch.chdir(tmp_path)
+        self.set_stdin(monkeypatch, self.source.encode())
+
+        def raise_error(*_: object) -> None:
+            raise AssertionError("Files were searched for.")  # pragma: no cover
+
+        monkeypatch.setattr(
+            "pydocstringformatter._utils.iter_python_files", raise_error
+        )
+        with pytest.raises(SystemExit) as exit_exec:
+            pydocstringformatter.run_docstring_formatter(["-", "--exit-code"])
+        assert exit_exec.value.code == 32
+        assert not list(tmp_path.iterdir())
+
+    def test_excluded(
+        self,
+        capsysbinary: pytest.CaptureFixture[bytes],
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Test that the stdin filename is used to exclude the source."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "generated").mkdir()
+        (tmp_path / "generated" / "test.py").touch()
+        self.set_stdin(monkeypatch, self.source.encode())
+        pydocstringformatter.run_docstring_formatter(
+            [
+                "-",
+                "--stdin-filename=generated/test.py",
+                "--exclude=generated/**",
+                "--write",
+            ]
+        )
+        assert capsysbinary.readouterr().out == self.source.encode()
+
+    def test_combined_with_files(self, tmp_path: Path) -> None:
+        """Test that stdin can't be formatted together with files."""
+        (tmp_path / "test.py").write_text(self.source)
+        with pytest.raises(PydocstringFormatterError, match="stdin"):
+            pydocstringformatter.run_docstring_formatter(["-", str(tmp_path)])
@@ -0,0 +1,113 @@
+"""Tests that formatters with different configurations can be used concurrently."""
+
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+
+from pydocstringformatter import FormatConfig, SourceFormatter
+from pydocstringformatter._pipeline import FormattingPipeline
+from pydocstringformatter.run import _Run
+
+HERE = Path(__file__).parent
+SOURCES = [
+    path.read_text(encoding="utf-8")
+    for path in sorted((HERE / "data" / "format").glob("**/*.py"))
+    if not path.with_suffix(".py.args").exists()
+]
+
+CONFIGS = [
+    FormatConfig(),
+    FormatConfig(disable=frozenset({"final-period", "capitalize-first-letter"})),
+    FormatConfig(summary_quotes_same_line=True),
+    FormatConfig(max_summary_lines=2),
+    FormatConfig(style=("numpydoc",)),
+]
+OPTIONS = [
+    [],
+    ["--no-final-period", "--no-capitalize-first-letter"],
+    ["--summary-quotes-same-line"],
+    ["--max-summary-lines=2"],
+    ["--style=numpydoc"],
+]
+
+
+@pytest.fixture
+def short_switch_interval() -> Iterator[None]:
+    """Make threads switch often, so they interleave as much as possible."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_in_threads(tasks: list[Callable[[], list[str]]]) -> list[list[str]]:
+    """Run every task in its own thread, starting them at the same time."""
+    barrier = threading.Barrier(len(tasks))
+    results: list[list[str]] = [[] for _ in tasks]
+    errors: list[BaseException] = []
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            for _ in range(3):
+                results[index] = tasks[index]()
+        except BaseException as exc:  # pylint: disable=broad-exception-caught
+            errors.append(exc)  # pragma: no cover
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(tasks))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+def format_with(formatter: SourceFormatter) -> list[str]:
+    """Format all sources with a source formatter."""
+    return [formatter.format_source(source).source for source in SOURCES]
+
+
+def format_with_run(options: list[str]) -> list[str]:
+    """Create a run and format all sources with it."""
+    run = _Run(options, format_files=False)
+    return [run.format_source(source, Path("test.py")) for source in SOURCES]
+
+
+@pytest.mark.usefixtures("short_switch_interval")
+def test_concurrent_source_formatters() -> None:
+    """Test that source formatters with different configurations don't interfere."""
+    expected = [format_with(SourceFormatter(config)) for config in CONFIGS]
+    assert len({tuple(result) for result in expected}) == len(CONFIGS)
+
+    # Share one formatter per configuration between two threads
+    formatters = [SourceFormatter(config) for config in CONFIGS]
+    results = run_in_threads(
+        [functools.partial(format_with, formatter) for formatter in formatters * 2]
+    )
+    assert results == expected * 2
+
+
+@pytest.mark.usefixtures("short_switch_interval")
+def test_concurrent_runs() -> None:
+    """Test that runs that are created at the same time don't interfere."""
+    expected = [format_with_run(options) for options in OPTIONS]
+    results = run_in_threads(
+        [functools.partial(format_with_run, options) for options in OPTIONS * 2]
+    )
+    assert results == expected * 2
+
+
+def test_pipeline_configuration_is_immutable() -> None:
+    """Test that the configuration of a pipeline can't be changed."""
+    pipeline = FormattingPipeline(FormatConfig().to_namespace())
+    with pytest.raises(AttributeError, match="immutable"):
+        pipeline.config.max_line_length = 10
+    for formatter in pipeline.formatters.values():
+        assert formatter.config is pipeline.config
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import codecs
+import io
 import sys
 import tokenize
+import types
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
@@ -9,9 +13,25 @@ import pytest
 import pydocstringformatter
 from pydocstringformatter._testutils import MakeAFormatter, MakeBFormatter
 from pydocstringformatter._utils import (
+    DOCSTRING_LOCATORS,
+    ExcludeMatcher,
+    LRUMemo,
+    OrderedOutput,
+    OutputSink,
+    UnsupportedSourceError,
     compare_formatters,
+    decode_source,
+    encode_source,
+    find_docstrings,
     find_python_files,
+    generate_diff,
+    generate_docstrings_diff,
     is_docstring,
+    iter_python_files,
+    make_lazy_getattr,
+    read_source,
+    source_files,
+    splice_docstrings,
 )
 
 HERE = Path(__file__)
@@ -88,6 +108,62 @@ class TestPythonFileFinder:
         )
         assert not pathnames
 
+    @staticmethod
+    def test_exclude_relative_and_absolute(
+        monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test that patterns match whether they or the paths are relative."""
+        (tmp_path / "pkg" / "build").mkdir(parents=True)
+        for name in ("a.py", "build/b.py", "build/.c.py"):
+            (tmp_path / "pkg" / name).touch()
+        monkeypatch.chdir(tmp_path)
+
+        for pattern in ("**/build/**", str(tmp_path / "pkg" / "build" / "**")):
+            for name in ("pkg", str(tmp_path / "pkg")):
+                pathnames = find_python_files([name], [pattern])
+                assert pathnames == [tmp_path / "pkg" / "a.py"]
+            assert not find_python_files(["pkg/build"], [pattern])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "pattern,filename,matches,excludes",
+        [
+            ("*.py", "a.py", True, True),
+            ("*.py", ".a.py", False, False),
+            (".*.py", ".a.py", True, True),
+            ("**/*.py", "a.py", True, True),
+            ("**/*.py", ".pkg/a.py", False, False),
+            ("**/build/**", "src/build/a.py", True, True),
+            ("**/build/**", "src/build/.a.py", False, True),
+            ("src/*", "src/pkg/a.py", False, False),
+            ("src/?.py", "src/ab.py", False, False),
+            ("src/[!b]*.py", "src/a.py", True, True),
+            ("src/[!b]*.py", "src/b.py", False, False),
+            ("src/[[]a].py", "src/[a].py", True, True),
+        ],
+    )
+    def test_exclude_matcher(
+        pattern: str, filename: str, matches: bool, excludes: bool
+    ) -> None:
+        """Test that patterns match like glob, and exclude directories with /**."""
+        matcher = ExcludeMatcher([pattern])
+        assert matcher.matches(filename) is matches
+        assert matcher.excludes(filename) is excludes
+
+    @staticmethod
+    def test_iter_python_files_is_sorted(tmp_path: Path) -> None:
+        """Test that files are yielded lazily in the order of a sorted walk."""
+        for name in ("a.py", "a/b.py", "a-b/c.py", "a_b.py", "b/a/d.py", "b/e.py"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).touch()
+        roots = [str(tmp_path / "b"), str(tmp_path), str(tmp_path / "a_b.py")]
+
+        pathnames = iter_python_files(roots, [])
+        assert next(pathnames) == tmp_path / "a" / "b.py"
+        expected_paths = [*tmp_path.glob("**/*.py"), *tmp_path.glob("b/**/*.py")]
+        expected_paths.append(tmp_path / "a_b.py")
+        assert [tmp_path / "a" / "b.py", *pathnames] == sorted(expected_paths)
+
 
 class TestDocstringFinder:
     """Test the docstring finder."""
@@ -187,3 +263,345 @@ def test_formatter_comparer() -> None:
 
     for section in expected_sections:
         assert section in diff
+
+
+def test_splice_docstrings() -> None:
+    """Test that only the docstrings are replaced in the source."""
+    source = (
+        '"""Module docstring"""\n'
+        "VAR = 1 + \\\n"
+        "    2  # ünicode\n"
+        "def func():\n"
+        "\t'''Function\n"
+        "\tdocstring'''\n"
+        '\tVAR = """Not a docstring"""\n'
+    )
+    tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    docstrings = find_docstrings(tokens)
+    assert [docstring.string for docstring in docstrings] == [
+        '"""Module docstring"""',
+        "'''Function\n\tdocstring'''",
+    ]
+
+    changes = [
+        (docstring, docstring._replace(string=f'"""{index}"""'))
+        for index, docstring in enumerate(docstrings)
+    ]
+    assert splice_docstrings(source, changes) == (
+        '"""0"""\n'
+        "VAR = 1 + \\\n"
+        "    2  # ünicode\n"
+        "def func():\n"
+        '\t"""1"""\n'
+        '\tVAR = """Not a docstring"""\n'
+    )
+    assert splice_docstrings(source, []) == source
+
+
+def test_preserve_source_outside_docstrings(tmp_path: Path) -> None:
+    """Test that formatting a file doesn't change code outside its docstrings."""
+    file = tmp_path / "test.py"
+    file.write_text('"""docstring"""\nVAR = 1 + \\\n    2\n', encoding="utf-8")
+
+    pydocstringformatter.run_docstring_formatter([str(file), "--write"])
+
+    assert file.read_text(encoding="utf-8") == (
+        '"""Docstring."""\nVAR = 1 + \\\n    2\n'
+    )
+
+
+def _replace_strings(
+    source: str, replace: Callable[[tokenize.TokenInfo], str]
+) -> list[tuple[tokenize.TokenInfo, tokenize.TokenInfo]]:
+    """Replace the strings in a source like the formatters replace docstrings."""
+    return [
+        (token, token._replace(string=new_string))
+        for token in tokenize.generate_tokens(io.StringIO(source).readline)
+        if token.type == tokenize.STRING
+        and (new_string := replace(token)) != token.string
+    ]
+
+
+_LARGE_SOURCE = "".join(
+    f'def func_{index}():\n    """Docstring {index}.\n\n    More.\n    """\n\n'
+    for index in range(100)
+)
+
+
+@pytest.mark.parametrize(
+    "source,replace",
+    [
+        pytest.param('"""a"""\n', lambda token: token.string, id="unchanged"),
+        pytest.param(
+            'def func():\n    """a\n\n    b\n    """\n    return 1\n',
+            lambda token: '"""A."""',
+            id="single line",
+        ),
+        pytest.param(
+            '"""a"""; """b"""\n"""c"""\n',
+            lambda token: token.string.upper().replace('"""', '"""\n'),
+            id="shared line",
+        ),
+        pytest.param(
+            'def a():\n    """"""\ndef b():\n    """"""\n    pass\ndef c():\n'
+            '    """Summary.\n\n\n    More."""\n    """Summary.\n    Other."""\n'
+            '    """More.\n    """\n    pass\n    x = 1\n',
+            lambda token: token.string.replace("\n\n\n", "\n\n\n\n"),
+            id="repeated lines",
+        ),
+        pytest.param(
+            'def func():\n    """"""\ndef func():\n    """"""\n',
+            lambda token: '"""c"""' if token.start[0] == 2 else token.string,
+            id="repeated code",
+        ),
+        pytest.param(
+            _LARGE_SOURCE,
+            lambda token: (
+                token.string.replace("\n\n    More.", "")
+                if "7" in token.string
+                else token.string
+            ),
+            id="popular lines",
+        ),
+    ],
+)
+def test_docstrings_diff(
+    source: str, replace: Callable[[tokenize.TokenInfo], str]
+) -> None:
+    """Test that the diff of the changed docstrings is the diff of the source."""
+    docstrings = _replace_strings(source, replace)
+    new_source = splice_docstrings(source, docstrings)
+
+    assert generate_docstrings_diff(source, docstrings, "file.py") == (
+        generate_diff(source, new_source, "file.py")
+    )
+
+
+class TestDocstringLocators:
+    """Test the engines that find docstrings in a source."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "filename",
+        [
+            pytest.param(path, id=str(path.relative_to(HERE.parent / "data")))
+            for path in sorted((HERE.parent / "data").glob("**/*.py*"))
+            if path.suffix in {".py", ".out"}
+            and path.name != "incorrect_python_file.py"
+        ],
+    )
+    def test_identical_docstrings(filename: Path) -> None:
+        """Test that the scanner finds the same docstrings as tokenize."""
+        with tokenize.open(filename) as file:
+            source = file.read()
+
+        expected = DOCSTRING_LOCATORS["tokenize"](source)
+        assert DOCSTRING_LOCATORS["scanner"](source) == expected
+
+    @staticmethod
+    def test_edge_cases() -> None:
+        """Test that the scanner handles the edge cases of is_docstring."""
+        with open(
+            UTILS_DATA / "find_docstrings" / "edge_cases.py", encoding="utf-8"
+        ) as file:
+            source = file.read()
+
+        docstrings = DOCSTRING_LOCATORS["scanner"](source)
+        assert docstrings == DOCSTRING_LOCATORS["tokenize"](source)
+        assert [tokeninfo.start for tokeninfo in docstrings] == [
+            (2, 0),
+            (6, 0),
+            (9, 0),
+            (12, 0),
+            (16, 0),
+            (20, 0),
+            (33, 4),
+            (36, 4),
+            (40, 8),
+            (69, 0),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "source",
+        [
+            pytest.param('def func():\n \t"""Docstring"""\n', id="mixed indentation"),
+            pytest.param('var = """Unclosed string', id="unclosed string"),
+            pytest.param("var = (1,\n", id="unclosed bracket"),
+            pytest.param("var = 1)\n", id="unmatched bracket"),
+            pytest.param("\\\n'''Docstring'''\n", id="leading backslash"),
+            pytest.param("var = 1\r\n", id="carriage return"),
+        ],
+    )
+    def test_unsupported_sources(source: str) -> None:
+        """Test that the scanner refuses sources it can't handle reliably."""
+        with pytest.raises(UnsupportedSourceError):
+            DOCSTRING_LOCATORS["scanner"](source)
+
+
+def test_docstring_locator_fallback(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    """Test that tokenize is used when the scanner can't handle a file."""
+    filename = tmp_path / "test.py"
+    filename.write_text('def func():\n \t"""A docstring"""\n', encoding="utf-8")
+
+    pydocstringformatter.run_docstring_formatter(
+        [str(filename), "--statistics", "--no-cache"]
+    )
+
+    output = capsys.readouterr()
+    assert '+ \t"""A docstring."""' in output.out
+    assert "docstring locator fallbacks: 1" in output.err
+
+
+def test_lazy_getattr(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that lazy attributes are imported once, when they are first used."""
+    module = types.ModuleType("lazy_module")
+    monkeypatch.setitem(sys.modules, "lazy_module", module)
+    module.__getattr__ = make_lazy_getattr(  # type: ignore[method-assign]
+        {"dedent": "textwrap"}, "lazy_module"
+    )
+
+    assert "dedent" not in vars(module)
+    assert getattr(module, "dedent")(" a") == "a"
+    assert "dedent" in vars(module)
+    with pytest.raises(AttributeError, match="'lazy_module' has no attribute 'indent'"):
+        getattr(module, "indent")
+
+
+def test_lru_memo() -> None:
+    """Test that the memo evicts the least recently used entries."""
+    memo: LRUMemo[str, int] = LRUMemo(2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1
+    memo.put("c", 3)
+    assert len(memo) == 2
+    assert memo.get("b") is None
+    assert memo.get("a") == 1
+    assert memo.get("c") == 3
+
+    disabled_memo: LRUMemo[str, int] = LRUMemo(0)
+    disabled_memo.put("a", 1)
+    assert disabled_memo.get("a") is None
+
+
+class TestSourceFiles:
+    """Test reading, decoding and encoding the content of files."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"x = 1",
+            b'"""A."""\nx = 1\n',
+            b'"""A."""\r\nx = 1\r\n',
+            b"a\rb\nc\r\nd",
+            b"a\r\nb\rc",
+            codecs.BOM_UTF8 + b"a = '\xc3\xa9'\r\n",
+            b"# coding: latin-1\na = '\xe9'\n",
+            b"#!/usr/bin/env python\n# -*- coding: cp1252 -*-\r\na = '\x80'\r",
+        ],
+    )
+    def test_decode_source(data: bytes) -> None:
+        """Test that sources are decoded in the same way as io.TextIOWrapper."""
+        buffer = io.BytesIO(data)
+        encoding, _ = tokenize.detect_encoding(buffer.readline)
+        buffer.seek(0)
+        with io.TextIOWrapper(buffer, encoding) as file:
+            expected = (file.read(), file.newlines, encoding)
+
+        assert decode_source(data) == expected
+
+    @staticmethod
+    def test_decode_invalid_source() -> None:
+        """Test that invalid sources raise the same errors as tokenize.open."""
+        with pytest.raises(SyntaxError, match="invalid or missing encoding"):
+            decode_source(b"a = '\xe9'\n")
+        with pytest.raises(UnicodeDecodeError):
+            decode_source(b"a = 1\nb = 2\nc = '\xe9'\n")
+
+    @staticmethod
+    def test_encode_source() -> None:
+        """Test that sources are encoded with their newline and encoding."""
+        assert encode_source("a\nb\n", "\r\n", "latin-1") == b"a\r\nb\r\n"
+        assert encode_source("é\n", None, "latin-1") == b"\xe9\n"
+
+    @staticmethod
+    @pytest.mark.parametrize("mmap_threshold", [0, 1 << 20])
+    def test_read_source(
+        tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mmap_threshold: int
+    ) -> None:
+        """Test that large files are mapped in memory and can be written afterwards."""
+        monkeypatch.setattr(source_files, "MMAP_THRESHOLD", mmap_threshold)
+        file = tmp_path / "test.py"
+        file.write_bytes(b'"""docstring"""\r\n')
+
+        with read_source(file) as data:
+            assert isinstance(data, bytes) == bool(mmap_threshold)
+            assert data[:] == b'"""docstring"""\r\n'
+
+        pydocstringformatter.run_docstring_formatter([str(file), "--write"])
+        assert file.read_bytes() == b'"""Docstring."""\r\n'
+
+
+class TestOutputSink:
+    """Test the buffered output of a run."""
+
+    @staticmethod
+    def _shared_streams(monkeypatch: pytest.MonkeyPatch) -> io.BytesIO:
+        """Let stdout and stderr write to the same buffer."""
+        shared = io.BytesIO()
+        for name in ("stdout", "stderr"):
+            monkeypatch.setattr(
+                sys, name, io.TextIOWrapper(shared, encoding="ascii", errors="replace")
+            )
+        return shared
+
+    def test_buffered_streams(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that output is buffered, but the order of the streams is kept."""
+        shared = self._shared_streams(monkeypatch)
+        sink = OutputSink(buffer_size=4)
+
+        sink.write("stdout", "ab")
+        sink.write("stdout", b"c")
+        assert shared.getvalue() == b""
+
+        sink.write("stderr", "d\N{BOOK}")
+        assert shared.getvalue() == b"abc"
+        sink.write("stdout", "efghi")
+        sink.write("stdout", "j")
+        assert shared.getvalue() == b"abcd?efghi"
+
+        sink.flush()
+        assert shared.getvalue() == b"abcd?efghij"
+
+    @staticmethod
+    def test_text_streams(monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that streams without a binary layer are written to as text."""
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        sink = OutputSink(buffer_size=4)
+
+        sink.write("stdout", "ab\N{BOOK}")
+        sink.write("stdout", b"c")
+        sink.flush()
+        assert stdout.getvalue() == "ab\N{BOOK}c"
+
+    def test_ordered_output(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that output is written in order and spilled if there is a lot."""
+        shared = self._shared_streams(monkeypatch)
+        with OrderedOutput(OutputSink(buffer_size=0), memory_budget=3) as output:
+            output.add(2, [("stdout", "2"), ("stderr", "e")])
+            output.add(3, [("stdout", "3333")])
+            output.add(1, [("stdout", "1")])
+            assert shared.getvalue() == b""
+
+            output.add(0, [("stdout", "0")])
+            assert shared.getvalue() == b"012e3333"
+            assert output.next_index == 4
+
+            output.add(5, [("stdout", "5555")])
+        assert shared.getvalue() == b"012e3333"